@@ -3,8 +3,11 @@ FreshService API Client
 Legacy adapter - use infrastructure.integrations.FreshServiceIntegration for new code
 """
 import logging
-from typing import Optional, List, Dict, Any
-from infrastructure.integrations import FreshServiceIntegration
+import threading
+from typing import Optional, List, Dict, Any, Tuple
+from config import config
+from infrastructure.integrations import FreshServiceIntegration, AsyncFreshServiceIntegration
+from infrastructure.shared import close_sessions, aclose_async_clients
 
 logger = logging.getLogger(__name__)
 
@@ -15,3 +18,71 @@ class FreshServiceClient(FreshServiceIntegration):
     Extends FreshServiceIntegration for backward compatibility
     """
     pass
+
+
+class AsyncFreshServiceClient(AsyncFreshServiceIntegration):
+    """
+    Async FreshService API Client - Legacy adapter
+    Extends AsyncFreshServiceIntegration for symmetry with FreshServiceClient
+    """
+    pass
+
+
+_clients: Dict[Tuple[str, str], FreshServiceClient] = {}
+_async_clients: Dict[Tuple[str, str], AsyncFreshServiceClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_freshservice_client(api_key: Optional[str] = None, domain: Optional[str] = None) -> FreshServiceClient:
+    """
+    Get the shared FreshService client for a set of credentials
+
+    Clients are cached per (api_key, domain) and all share the
+    keep-alive connection pool of their host.
+
+    Args:
+        api_key: FreshService API key (defaults to config)
+        domain: FreshService domain (defaults to config)
+    """
+    key = (api_key or config.FRESHSERVICE_API_KEY, domain or config.FRESHSERVICE_DOMAIN)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = FreshServiceClient(api_key=key[0], domain=key[1])
+                _clients[key] = client
+    return client
+
+
+def get_async_freshservice_client(api_key: Optional[str] = None, domain: Optional[str] = None) -> AsyncFreshServiceClient:
+    """
+    Get the shared async FreshService client for a set of credentials
+
+    Args:
+        api_key: FreshService API key (defaults to config)
+        domain: FreshService domain (defaults to config)
+    """
+    key = (api_key or config.FRESHSERVICE_API_KEY, domain or config.FRESHSERVICE_DOMAIN)
+    client = _async_clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _async_clients.get(key)
+            if client is None:
+                client = AsyncFreshServiceClient(api_key=key[0], domain=key[1])
+                _async_clients[key] = client
+    return client
+
+
+def close_freshservice_clients():
+    """Drop cached clients and close their connection pools"""
+    with _clients_lock:
+        _clients.clear()
+    close_sessions()
+
+
+async def aclose_freshservice_clients():
+    """Drop cached async clients and close their connection pools"""
+    with _clients_lock:
+        _async_clients.clear()
+    await aclose_async_clients()
@@ -2,11 +2,13 @@
 Ticket routes for FreshAI API
 """
 import logging
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Dict, Any, Optional
 from config import config
-from api.freshservice_client import FreshServiceClient
-from services.ai_analyzer import TicketAnalyzer
+from api.freshservice_client import AsyncFreshServiceClient, get_async_freshservice_client
+from infrastructure.integrations import RateLimitExceeded
+from services.analysis_idempotency import IdempotentAnalysisService, get_analysis_service, NOTIFY_SENT, NOTIFY_FAILED
+from features.ticket_management.application import GetTicketDetailsUseCase
 
 logger = logging.getLogger(__name__)
 
@@ -14,17 +16,14 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Initialize clients
-def get_fs_client() -> FreshServiceClient:
+def get_fs_client() -> AsyncFreshServiceClient:
     """Get FreshService client"""
     if not config.FRESHSERVICE_API_KEY or not config.FRESHSERVICE_DOMAIN:
         raise HTTPException(
             status_code=500,
             detail="FreshService credentials not configured"
         )
-    return FreshServiceClient(
-        api_key=config.FRESHSERVICE_API_KEY,
-        domain=config.FRESHSERVICE_DOMAIN
-    )
+    return get_async_freshservice_client()
 
 
 @router.get("/")
@@ -37,7 +36,7 @@ async def list_tickets(
     logger.info(f"📋 Fetching tickets: page={page}, per_page={per_page}, group_id={group_id}")
     try:
         client = get_fs_client()
-        result = client.get_tickets(page=page, per_page=per_page, group_id=group_id)
+        result = await client.get_tickets(page=page, per_page=per_page, group_id=group_id)
         return {
             "status": "success",
             "data": {
@@ -50,26 +49,27 @@ async def list_tickets(
                 }
             }
         }
+    except RateLimitExceeded:
+        # Answered with 503 + Retry-After by the app's exception handler
+        raise
     except Exception as e:
         logger.error(f"❌ Error fetching tickets: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching tickets: {str(e)}")
 
 
 @router.get("/{ticket_id}")
-async def get_ticket(ticket_id: str, include_conversations: bool = False):
+async def get_ticket(ticket_id: str, include_conversations: bool = False, include: Optional[str] = Query(None)):
     """Get single ticket by ID"""
     logger.info(f"🎫 Fetching ticket: {ticket_id}")
     try:
         client = get_fs_client()
-        ticket = client.get_ticket(ticket_id)
+        use_case = GetTicketDetailsUseCase(client)
+        include_list = [name.strip() for name in include.split(",")] if include else None
+        ticket = await use_case.execute(ticket_id, include_conversations, include_list)
 
         if not ticket:
             raise HTTPException(status_code=404, detail="Ticket not found")
 
-        if include_conversations:
-            conversations = client.get_ticket_conversations(ticket_id)
-            ticket['conversations'] = conversations
-
         return {
             "status": "success",
             "ticket": ticket
@@ -87,7 +87,7 @@ async def get_ticket_summary(ticket_id: str):
     logger.info(f"📄 Getting summary for ticket: {ticket_id}")
     try:
         client = get_fs_client()
-        ticket = client.get_ticket(ticket_id)
+        ticket = await client.get_ticket(ticket_id)
         
         if not ticket:
             raise HTTPException(status_code=404, detail="Ticket not found")
@@ -111,7 +111,7 @@ async def get_ticket_conversations_detail(ticket_id: str):
     logger.info(f"💬 Getting conversations for ticket: {ticket_id}")
     try:
         client = get_fs_client()
-        conversations = client.get_ticket_conversations(ticket_id)
+        conversations = await client.get_ticket_conversations(ticket_id)
         
         return {
             "status": "success",
@@ -130,7 +130,7 @@ async def search_tickets(query: str = Query(..., min_length=1)):
     logger.info(f"🔍 Searching tickets: {query}")
     try:
         client = get_fs_client()
-        results = client.search_tickets(query)
+        results = await client.search_tickets(query)
         return {
             "status": "success",
             "results": results,
@@ -141,12 +141,16 @@ async def search_tickets(query: str = Query(..., min_length=1)):
         raise HTTPException(status_code=500, detail=f"Error searching tickets: {str(e)}")
 
 @router.post("/{ticket_id}/analyze")
-async def analyze_ticket(ticket_id: str):
-    """Analyze a single ticket with AI"""
+async def analyze_ticket(
+    ticket_id: str,
+    force: bool = False,
+    analysis_service: IdempotentAnalysisService = Depends(get_analysis_service)
+):
+    """Analyze a single ticket with AI (force=true bypasses cached analyses)"""
     logger.info(f"🤖 Analyzing ticket: {ticket_id}")
     try:
         client = get_fs_client()
-        ticket = client.get_ticket(ticket_id)
+        ticket = await client.get_ticket(ticket_id)
 
         if not ticket:
             raise HTTPException(status_code=404, detail="Ticket not found")
@@ -155,28 +159,18 @@ async def analyze_ticket(ticket_id: str):
         logger.info(f"[ENDPOINT] Ticket retrieved: ID={ticket.get('id')}, Subject={ticket.get('subject', '')[:50]}...")
         logger.info(f"[ENDPOINT] Ticket keys: {list(ticket.keys())}")
 
-        # Initialize AI analyzer
-        analyzer = TicketAnalyzer()
-        analysis = analyzer.analyze_ticket(ticket)
+        # Shared analysis service: repeat requests reuse one analysis
+        analysis = await analysis_service.analyze(ticket, force=force)
         
-        # Send notification to Slack if configured
-        if config.SLACK_WEBHOOK_URL:
-            try:
-                from infrastructure.notifications import SlackNotificationService
-                slack_service = SlackNotificationService(config.SLACK_WEBHOOK_URL)
-                
-                if analysis.get("status") == "success" and analysis.get("analysis"):
-                    slack_service.send_ticket_analysis(
-                        ticket_id, 
-                        analysis["analysis"],
-                        domain=config.FRESHSERVICE_DOMAIN
-                    )
-                    logger.info(f"[ENDPOINT] 📨 Slack notification sent for ticket {ticket_id}")
-                else:
-                    logger.warning(f"[ENDPOINT] ⚠️ Skipping Slack notification - analysis failed")
-            except Exception as e:
-                logger.error(f"[ENDPOINT] ❌ Failed to send Slack notification: {str(e)}")
-                # Don't fail the request if Slack notification fails
+        # Send notification to Slack if configured (once per ticket content)
+        if analysis.get("status") == "success" and analysis.get("analysis"):
+            notified = await analysis_service.notify_slack(ticket, analysis)
+            if notified == NOTIFY_SENT:
+                logger.info(f"[ENDPOINT] 📨 Slack notification sent for ticket {ticket_id}")
+            elif notified == NOTIFY_FAILED:
+                logger.error(f"[ENDPOINT] ❌ Failed to send Slack notification for ticket {ticket_id}")
+        elif config.SLACK_WEBHOOK_URL:
+            logger.warning(f"[ENDPOINT] ⚠️ Skipping Slack notification - analysis failed")
 
         return {
             "status": "success",
@@ -3,79 +3,39 @@ Webhook Endpoints for FreshService
 Receives and processes webhook events from FreshService
 """
 import logging
-from fastapi import APIRouter, HTTPException, Request, BackgroundTasks
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Request
+from typing import Dict, Any, Optional
 from config import config
-from api.freshservice_client import FreshServiceClient
-from services.ai_analyzer import TicketAnalyzer
-from infrastructure.notifications import SlackNotificationService
+from api.freshservice_client import get_async_freshservice_client
+from services.analysis_jobs import analysis_job_pool, analyzable_ticket
+from services.admission_control import webhook_admission
+from features.ticket_management.application import invalidate_ticket_lists
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-
-async def analyze_ticket_background(ticket_id: str, group_id: int):
-    """
-    Background task to analyze ticket and send to Slack
-    
-    Args:
-        ticket_id: Ticket ID to analyze
-        group_id: Group ID that owns the ticket
-    """
-    try:
-        logger.info(f"[WEBHOOK] 🤖 Starting background analysis for ticket {ticket_id} (group {group_id})")
-        
-        # Get FreshService client
-        client = FreshServiceClient(
-            api_key=config.FRESHSERVICE_API_KEY,
-            domain=config.FRESHSERVICE_DOMAIN
-        )
-        
-        # Fetch ticket details
-        ticket = client.get_ticket(ticket_id)
-        
-        if not ticket:
-            logger.error(f"[WEBHOOK] ❌ Ticket {ticket_id} not found")
-            return
-        
-        # Analyze ticket
-        analyzer = TicketAnalyzer()
-        analysis = analyzer.analyze_ticket(ticket)
-        
-        if analysis.get("status") != "success":
-            logger.error(f"[WEBHOOK] ❌ Analysis failed for ticket {ticket_id}: {analysis.get('message')}")
-            return
-        
-        logger.info(f"[WEBHOOK] ✅ Analysis completed for ticket {ticket_id}")
-        
-        # Send to Slack if configured
-        if config.SLACK_WEBHOOK_URL:
-            slack_service = SlackNotificationService(config.SLACK_WEBHOOK_URL)
-            success = slack_service.send_ticket_analysis(
-                ticket_id, 
-                analysis["analysis"],
-                domain=config.FRESHSERVICE_DOMAIN
-            )
-            
-            if success:
-                logger.info(f"[WEBHOOK] 📨 Slack notification sent for ticket {ticket_id}")
-            else:
-                logger.error(f"[WEBHOOK] ❌ Failed to send Slack notification for ticket {ticket_id}")
-        else:
-            logger.warning(f"[WEBHOOK] ⚠️ Slack webhook not configured, skipping notification")
-            
-    except Exception as e:
-        logger.error(f"[WEBHOOK] ❌ Error in background analysis: {str(e)}")
+def too_many_requests(detail: str) -> HTTPException:
+    """429 telling the sender when to retry"""
+    return HTTPException(
+        status_code=429,
+        detail=detail,
+        headers={"Retry-After": str(webhook_admission.retry_after_seconds)}
+    )
 
 
 @router.post("/freshservice/ticket-created")
-async def ticket_created_webhook(request: Request, background_tasks: BackgroundTasks):
+async def ticket_created_webhook(request: Request):
     """
     Webhook endpoint for FreshService ticket created events
     
-    FreshService will POST to this endpoint when a ticket is created
+    FreshService will POST to this endpoint when a ticket is created.
+    Returns 429 with Retry-After when admission control sheds the event.
     """
+    if not webhook_admission.try_enter():
+        logger.warning(f"[WEBHOOK] 🚦 Too many webhook requests in flight, rejecting")
+        raise too_many_requests("Too many webhook requests in flight")
+    
     try:
         # Get webhook payload
         payload = await request.json()
@@ -94,6 +54,9 @@ async def ticket_created_webhook(request: Request, background_tasks: BackgroundT
         
         logger.info(f"[WEBHOOK] Ticket ID: {ticket_id}, Group ID: {group_id}")
         
+        # A new ticket changes page 1 of its group's list
+        invalidate_ticket_lists(group_id)
+        
         # Check if ticket belongs to configured groups
         if group_id and config.AUTO_ANALYZE_GROUP_IDS:
             group_id_str = str(group_id)
@@ -103,25 +66,41 @@ async def ticket_created_webhook(request: Request, background_tasks: BackgroundT
                 logger.info(f"[WEBHOOK] ⏭️ Group {group_id} not in configured list {configured_groups}, skipping")
                 return {"status": "ok", "message": f"Group {group_id} not configured for analysis"}
         
-        # Add analysis task to background
-        background_tasks.add_task(analyze_ticket_background, ticket_id, group_id)
+        # Shed load before the analysis backlog grows without bound
+        rejected = await webhook_admission.check_queue(group_id)
+        if rejected:
+            logger.warning(f"[WEBHOOK] 🚦 Rejecting ticket {ticket_id} (group {group_id}): {rejected} limit reached")
+            raise too_many_requests(f"Analysis queue full ({rejected})")
         
-        logger.info(f"[WEBHOOK] ✅ Analysis task queued for ticket {ticket_id}")
+        # Persist an analysis job; the job workers pick it up
+        # (FreshService automations can send subject and description with the event)
+        ticket = analyzable_ticket(ticket_data)
+        try:
+            job_id = await analysis_job_pool.enqueue(ticket_id, group_id, source="webhook", ticket=ticket)
+        finally:
+            webhook_admission.release_queue_slot(group_id)
+        
+        logger.info(f"[WEBHOOK] ✅ Analysis job {job_id} queued for ticket {ticket_id} ({'payload' if ticket else 'fetch'})")
         
         return {
             "status": "ok",
             "message": f"Analysis queued for ticket {ticket_id}",
             "ticket_id": ticket_id,
-            "group_id": group_id
+            "group_id": group_id,
+            "job_id": job_id
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[WEBHOOK] ❌ Error processing webhook: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        webhook_admission.leave()
 
 
 @router.post("/freshservice/ticket-updated")
-async def ticket_updated_webhook(request: Request, background_tasks: BackgroundTasks):
+async def ticket_updated_webhook(request: Request):
     """
     Webhook endpoint for FreshService ticket updated events
     
@@ -132,11 +111,14 @@ async def ticket_updated_webhook(request: Request, background_tasks: BackgroundT
         
         logger.info(f"[WEBHOOK] 📥 Received ticket updated event")
         
-        # For now, just log the update
         ticket_data = payload.get("ticket_changes", {})
         ticket_id = ticket_data.get("id")
+        group_id = ticket_data.get("group_id")
+        
+        # Drop cached ticket lists that may contain this ticket
+        dropped = invalidate_ticket_lists(group_id)
         
-        logger.info(f"[WEBHOOK] Ticket {ticket_id} updated (no action taken)")
+        logger.info(f"[WEBHOOK] Ticket {ticket_id} updated ({dropped} cached lists invalidated)")
         
         return {"status": "ok", "message": "Update acknowledged"}
         
@@ -159,18 +141,19 @@ async def test_webhook():
 
 
 @router.post("/webhooks/test-analysis/{ticket_id}")
-async def test_ticket_analysis(ticket_id: str, background_tasks: BackgroundTasks):
+async def test_ticket_analysis(ticket_id: str):
     """
     Manual test endpoint to trigger analysis for a specific ticket
     Useful for testing without setting up FreshService webhooks
     """
     logger.info(f"[WEBHOOK] 🧪 Manual test analysis triggered for ticket {ticket_id}")
     
-    background_tasks.add_task(analyze_ticket_background, ticket_id, None)
+    job_id = await analysis_job_pool.enqueue(ticket_id, None, source="manual")
     
     return {
         "status": "ok",
         "message": f"Test analysis queued for ticket {ticket_id}",
+        "job_id": job_id,
         "note": "Check backend logs and Slack for results"
     }
 
@@ -182,12 +165,9 @@ async def list_groups():
     Helps identify group IDs for auto-analysis configuration
     """
     try:
-        client = FreshServiceClient(
-            api_key=config.FRESHSERVICE_API_KEY,
-            domain=config.FRESHSERVICE_DOMAIN
-        )
+        client = get_async_freshservice_client()
         
-        groups = client.get_groups()
+        groups = await client.get_groups()
         
         return {
             "status": "ok",
@@ -13,10 +13,31 @@ class Config:
     FRESHSERVICE_DOMAIN = os.getenv("FRESHSERVICE_DOMAIN", "alliance")
     API_BASE_URL = os.getenv("API_BASE_URL", f"https://{FRESHSERVICE_DOMAIN}.freshservice.com/api/v2")
     
+    # Outbound HTTP
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 20))  # Keep-alive connections per host
+    HTTP_ASYNC_MAX_CONNECTIONS = int(os.getenv("HTTP_ASYNC_MAX_CONNECTIONS", 100))  # Concurrent async connections per host
+    FRESHSERVICE_PAGE_CONCURRENCY = int(os.getenv("FRESHSERVICE_PAGE_CONCURRENCY", 5))  # Pages in flight in get_all_tickets
+    FRESHSERVICE_PAGE_RETRIES = int(os.getenv("FRESHSERVICE_PAGE_RETRIES", 3))  # Retries for a failed page
+    
+    # FreshService rate limiting
+    FRESHSERVICE_RATE_LIMIT_PER_MINUTE = int(os.getenv("FRESHSERVICE_RATE_LIMIT_PER_MINUTE", 140))  # Plan limit until headers report it
+    FRESHSERVICE_RATE_LIMIT_HEADROOM = float(os.getenv("FRESHSERVICE_RATE_LIMIT_HEADROOM", 0.1))  # Fraction of the limit left unused
+    FRESHSERVICE_MAX_RETRIES = int(os.getenv("FRESHSERVICE_MAX_RETRIES", 4))  # Retries on 429/5xx
+    FRESHSERVICE_BACKOFF_BASE_SECONDS = float(os.getenv("FRESHSERVICE_BACKOFF_BASE_SECONDS", 0.5))
+    FRESHSERVICE_BACKOFF_MAX_SECONDS = float(os.getenv("FRESHSERVICE_BACKOFF_MAX_SECONDS", 30))
+    
     # AI Configuration
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     AWS_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+    BEDROCK_REGION = os.getenv("BEDROCK_REGION", "us-east-1")
+    BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "us.anthropic.claude-3-7-sonnet-20250219-v1:0")
+    BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", 20))  # Keep at least the number of concurrent analyses
+    BEDROCK_CONNECT_TIMEOUT_SECONDS = float(os.getenv("BEDROCK_CONNECT_TIMEOUT_SECONDS", 5))
+    BEDROCK_READ_TIMEOUT_SECONDS = float(os.getenv("BEDROCK_READ_TIMEOUT_SECONDS", 60))
+    BEDROCK_MAX_RETRIES = int(os.getenv("BEDROCK_MAX_RETRIES", 3))  # botocore adaptive retries on throttling
+    BEDROCK_MAX_CONCURRENCY = int(os.getenv("BEDROCK_MAX_CONCURRENCY", 8))  # Threads for non-blocking calls; at most BEDROCK_MAX_POOL_CONNECTIONS
+    BEDROCK_CALL_TIMEOUT_SECONDS = float(os.getenv("BEDROCK_CALL_TIMEOUT_SECONDS", 90))  # Async callers give up after this
     
     # Notifications
     SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL", "")
@@ -24,9 +45,63 @@ class Config:
     # Webhook Configuration
     AUTO_ANALYZE_GROUP_IDS = os.getenv("AUTO_ANALYZE_GROUP_IDS", "").split(",")  # Comma-separated group IDs
     
+    # Automatic polling of monitored groups
+    AUTO_ANALYZE_ENABLED = os.getenv("AUTO_ANALYZE_ENABLED", "False").lower() == "true"
+    POLLING_INTERVAL_SECONDS = int(os.getenv("POLLING_INTERVAL_SECONDS", 30))  # Starting interval; adapts between min and max
+    POLLING_MIN_INTERVAL_SECONDS = float(os.getenv("POLLING_MIN_INTERVAL_SECONDS", 10))
+    POLLING_MAX_INTERVAL_SECONDS = float(os.getenv("POLLING_MAX_INTERVAL_SECONDS", 300))
+    POLLING_TARGET_TICKETS_PER_POLL = float(os.getenv("POLLING_TARGET_TICKETS_PER_POLL", 1.0))  # Expected new tickets per poll
+    POLLING_RATE_SMOOTHING = float(os.getenv("POLLING_RATE_SMOOTHING", 0.3))  # EWMA weight of the latest arrival rate
+    POLLING_LOW_HEADROOM_RATIO = float(os.getenv("POLLING_LOW_HEADROOM_RATIO", 0.25))  # Slow down below this rate-limit headroom
+    POLLING_DEDUP_WINDOW_SECONDS = int(os.getenv("POLLING_DEDUP_WINDOW_SECONDS", 3600))  # Late tickets this far behind the watermark still count as new
+    POLLING_DEDUP_MAX_ENTRIES = int(os.getenv("POLLING_DEDUP_MAX_ENTRIES", 5000))  # Recent ticket IDs remembered per group (and persisted)
+    POLLING_LEASE_SECONDS = float(os.getenv("POLLING_LEASE_SECONDS", 60))  # A worker missing heartbeats this long loses its groups
+    POLLING_HEARTBEAT_SECONDS = float(os.getenv("POLLING_HEARTBEAT_SECONDS", 15))
+    
+    # Durable analysis job queue (analysis_jobs)
+    ANALYSIS_JOB_WORKERS = int(os.getenv("ANALYSIS_JOB_WORKERS", 4))  # Jobs analyzed in parallel per process
+    ANALYSIS_JOB_POLL_SECONDS = float(os.getenv("ANALYSIS_JOB_POLL_SECONDS", 2))  # Idle workers check the table this often
+    ANALYSIS_JOB_VISIBILITY_TIMEOUT_SECONDS = float(os.getenv("ANALYSIS_JOB_VISIBILITY_TIMEOUT_SECONDS", 300))  # Unfinished claims are retried after this
+    ANALYSIS_JOB_MAX_ATTEMPTS = int(os.getenv("ANALYSIS_JOB_MAX_ATTEMPTS", 5))  # Then the job is dead-lettered
+    ANALYSIS_JOB_RETRY_BASE_SECONDS = float(os.getenv("ANALYSIS_JOB_RETRY_BASE_SECONDS", 30))  # Doubles with every failed attempt
+    ANALYSIS_JOB_RETRY_MAX_SECONDS = float(os.getenv("ANALYSIS_JOB_RETRY_MAX_SECONDS", 1800))
+    ANALYSIS_JOB_RETENTION_HOURS = float(os.getenv("ANALYSIS_JOB_RETENTION_HOURS", 72))  # Done jobs are purged after this
+    
+    # Analysis result cache (keyed on ticket content, prompt version and model; persisted in analysis_logs)
+    ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", 1000))  # Kept in memory; all are in the database
+    
+    # Batch analysis (/api/analysis/batch)
+    ANALYSIS_BATCH_CONCURRENCY = int(os.getenv("ANALYSIS_BATCH_CONCURRENCY", 4))  # Tickets analyzed at once; at most BEDROCK_MAX_CONCURRENCY
+    ANALYSIS_BATCH_MAX_TICKETS = int(os.getenv("ANALYSIS_BATCH_MAX_TICKETS", 200))  # Largest batch one request may submit
+    
+    # Webhook admission control (429 + Retry-After when exceeded)
+    WEBHOOK_MAX_IN_FLIGHT = int(os.getenv("WEBHOOK_MAX_IN_FLIGHT", 50))  # Webhook requests handled at once per process
+    WEBHOOK_MAX_QUEUE_DEPTH = int(os.getenv("WEBHOOK_MAX_QUEUE_DEPTH", 1000))  # Pending + running analysis jobs
+    WEBHOOK_GROUP_QUEUE_SHARE = float(os.getenv("WEBHOOK_GROUP_QUEUE_SHARE", 0.5))  # Most of the queue depth one group may hold
+    WEBHOOK_RETRY_AFTER_SECONDS = int(os.getenv("WEBHOOK_RETRY_AFTER_SECONDS", 30))
+    
     # Database
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./freshai.db")
     
+    # Local ticket mirror (tickets_cache)
+    TICKET_SYNC_ENABLED = os.getenv("TICKET_SYNC_ENABLED", "False").lower() == "true"
+    TICKET_SYNC_INTERVAL_SECONDS = int(os.getenv("TICKET_SYNC_INTERVAL_SECONDS", 300))
+    TICKET_SYNC_BATCH_SIZE = int(os.getenv("TICKET_SYNC_BATCH_SIZE", 200))  # Tickets per upsert transaction
+    TICKET_SYNC_RECONCILE_EVERY = int(os.getenv("TICKET_SYNC_RECONCILE_EVERY", 24))  # Full rescan (deletions) every N cycles
+    TICKET_SYNC_INITIAL_SINCE = os.getenv("TICKET_SYNC_INITIAL_SINCE", "2015-01-01T00:00:00Z")
+    TICKET_SYNC_OVERLAP_SECONDS = int(os.getenv("TICKET_SYNC_OVERLAP_SECONDS", 300))  # Watermark stays this far before a run's start
+    TICKET_CACHE_READS_ENABLED = os.getenv("TICKET_CACHE_READS_ENABLED", "False").lower() == "true"  # Serve list/detail from the mirror
+    
+    # Ticket list cache (stale-while-revalidate)
+    TICKET_LIST_CACHE_TTL_SECONDS = float(os.getenv("TICKET_LIST_CACHE_TTL_SECONDS", 30))  # Served as fresh
+    TICKET_LIST_CACHE_STALE_SECONDS = float(os.getenv("TICKET_LIST_CACHE_STALE_SECONDS", 300))  # Served as stale while refreshing
+    TICKET_LIST_CACHE_MAX_ENTRIES = int(os.getenv("TICKET_LIST_CACHE_MAX_ENTRIES", 500))
+    
+    # Local ticket search (SQLite FTS5)
+    TICKET_SEARCH_INDEX_PATH = os.getenv("TICKET_SEARCH_INDEX_PATH", "./ticket_search.db")
+    TICKET_SEARCH_LOCAL_ENABLED = os.getenv("TICKET_SEARCH_LOCAL_ENABLED", "True").lower() == "true"  # Answer searches from the index once populated
+    TICKET_SEARCH_MAX_CANDIDATES = int(os.getenv("TICKET_SEARCH_MAX_CANDIDATES", 2000))  # Matches ranked per query (newest first)
+    
     # API Server
     API_HOST = os.getenv("API_HOST", "0.0.0.0")
     API_PORT = int(os.getenv("API_PORT", 8000))
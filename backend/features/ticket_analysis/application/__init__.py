@@ -3,5 +3,6 @@ Ticket Analysis Application Layer
 Use cases and application services
 """
 from .analyze_ticket import AnalyzeTicketUseCase
+from .analyze_batch import AnalyzeTicketBatchUseCase
 
-__all__ = ["AnalyzeTicketUseCase"]
+__all__ = ["AnalyzeTicketUseCase", "AnalyzeTicketBatchUseCase"]
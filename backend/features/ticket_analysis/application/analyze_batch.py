@@ -0,0 +1,67 @@
+"""
+Analyze Ticket Batch Use Case
+Fetches a list of tickets and analyzes them concurrently
+"""
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from config import config
+from services.ai_analyzer import TicketAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyzeTicketBatchUseCase:
+    """Use case for analyzing a batch of tickets by ID"""
+
+    def __init__(self, analysis_service, client):
+        self.analysis_service = analysis_service
+        self.client = client
+
+    async def iter_results(self, ticket_ids: List[str], force: bool = False) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Analyze the tickets, yielding each result as soon as it is ready
+
+        Tickets that cannot be fetched yield an error result up front;
+        the rest go through the analysis service (so earlier and in-flight
+        analyses are reused), ANALYSIS_BATCH_CONCURRENCY at a time.
+
+        Yields:
+            (index into ticket_ids, result), in completion order
+        """
+        logger.info(f"[USE_CASE] Analyzing batch of {len(ticket_ids)} tickets")
+        indexes = []
+        tickets = []
+        for index, (ticket_id, ticket) in enumerate(zip(ticket_ids, await self._fetch(ticket_ids))):
+            if ticket:
+                indexes.append(index)
+                tickets.append(ticket)
+            else:
+                yield index, {"status": "error", "message": "Ticket not found", "ticket_id": ticket_id}
+
+        async for position, result in self.analysis_service.iter_analyze_tickets(tickets, force=force):
+            yield indexes[position], result
+
+    async def execute(self, ticket_ids: List[str], force: bool = False) -> Dict[str, Any]:
+        """
+        Analyze the tickets and return the batch_analysis_complete summary
+
+        Results are in the order of ticket_ids.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(ticket_ids)
+        async for index, result in self.iter_results(ticket_ids, force):
+            results[index] = result
+        return TicketAnalyzer.batch_summary(results)
+
+    async def _fetch(self, ticket_ids: List[str]) -> List[Any]:
+        semaphore = asyncio.Semaphore(config.FRESHSERVICE_PAGE_CONCURRENCY)
+
+        async def fetch(ticket_id: str):
+            async with semaphore:
+                try:
+                    return await self.client.get_ticket(ticket_id)
+                except Exception as e:
+                    logger.warning(f"[USE_CASE] ⚠️  Could not fetch ticket {ticket_id}: {str(e)}")
+                    return None
+
+        return await asyncio.gather(*(fetch(ticket_id) for ticket_id in ticket_ids))
@@ -13,22 +13,23 @@ logger = logging.getLogger(__name__)
 class AnalyzeTicketUseCase:
     """Use case for analyzing a single ticket"""
     
-    def __init__(self, ai_analyzer):
-        self.ai_analyzer = ai_analyzer
+    def __init__(self, analysis_service):
+        self.analysis_service = analysis_service
     
-    def execute(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute(self, ticket_data: Dict[str, Any], force: bool = False) -> Dict[str, Any]:
         """
         Execute ticket analysis
         
         Args:
             ticket_data: Raw ticket data from external source
+            force: Re-run the model instead of reusing a previous analysis
             
         Returns:
             Analysis result dictionary
         """
         logger.info(f"[USE_CASE] Analyzing ticket {ticket_data.get('id')}")
         
-        # Delegate to AI analyzer service
-        result = self.ai_analyzer.analyze_ticket(ticket_data)
+        # Shared with webhooks and the poller, so repeat requests reuse one analysis
+        result = await self.analysis_service.analyze(ticket_data, force=force)
         
         return result
@@ -1,62 +1,59 @@
 """
 Ticket Analysis API Endpoints
 """
+import json
 import logging
-from fastapi import APIRouter, HTTPException
+from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Body
+from fastapi.responses import StreamingResponse
 from config import config
-from api.freshservice_client import FreshServiceClient
+from api.freshservice_client import AsyncFreshServiceClient, get_async_freshservice_client
 from ..application.analyze_ticket import AnalyzeTicketUseCase
+from ..application.analyze_batch import AnalyzeTicketBatchUseCase
 from services.ai_analyzer import TicketAnalyzer
+from services.analysis_idempotency import IdempotentAnalysisService, get_analysis_service, NOTIFY_SENT, NOTIFY_FAILED
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-def get_fs_client() -> FreshServiceClient:
+def get_fs_client() -> AsyncFreshServiceClient:
     """Get FreshService client"""
     if not config.FRESHSERVICE_API_KEY or not config.FRESHSERVICE_DOMAIN:
         raise HTTPException(
             status_code=500,
             detail="FreshService credentials not configured"
         )
-    return FreshServiceClient(
-        api_key=config.FRESHSERVICE_API_KEY,
-        domain=config.FRESHSERVICE_DOMAIN
-    )
+    return get_async_freshservice_client()
 
 
 @router.post("/{ticket_id}/analyze")
-async def analyze_ticket(ticket_id: str):
-    """Analyze a single ticket with AI"""
+async def analyze_ticket(
+    ticket_id: str,
+    force: bool = False,
+    analysis_service: IdempotentAnalysisService = Depends(get_analysis_service)
+):
+    """Analyze a single ticket with AI (force=true bypasses cached analyses)"""
     logger.info(f"🤖 Analyzing ticket: {ticket_id}")
     try:
         client = get_fs_client()
-        ticket = client.get_ticket(ticket_id)
+        ticket = await client.get_ticket(ticket_id)
 
         if not ticket:
             raise HTTPException(status_code=404, detail="Ticket not found")
 
-        analyzer = TicketAnalyzer()
-        use_case = AnalyzeTicketUseCase(analyzer)
+        use_case = AnalyzeTicketUseCase(analysis_service)
         
-        result = use_case.execute(ticket)
+        result = await use_case.execute(ticket, force=force)
         
-        # Send notification to Slack if configured
-        if config.SLACK_WEBHOOK_URL:
-            try:
-                from infrastructure.notifications import SlackNotificationService
-                slack_service = SlackNotificationService(config.SLACK_WEBHOOK_URL)
-                
-                if result.get("status") == "success" and result.get("analysis"):
-                    slack_service.send_ticket_analysis(
-                        ticket_id, 
-                        result["analysis"],
-                        domain=config.FRESHSERVICE_DOMAIN
-                    )
-                    logger.info(f"[ENDPOINT] 📨 Slack notification sent for ticket {ticket_id}")
-            except Exception as e:
-                logger.error(f"[ENDPOINT] ❌ Failed to send Slack notification: {str(e)}")
+        # Send notification to Slack if configured (once per ticket content)
+        if result.get("status") == "success" and result.get("analysis"):
+            notified = await analysis_service.notify_slack(ticket, result)
+            if notified == NOTIFY_SENT:
+                logger.info(f"[ENDPOINT] 📨 Slack notification sent for ticket {ticket_id}")
+            elif notified == NOTIFY_FAILED:
+                logger.error(f"[ENDPOINT] ❌ Failed to send Slack notification for ticket {ticket_id}")
         
         return {
             "status": "success",
@@ -68,3 +65,111 @@ async def analyze_ticket(ticket_id: str):
     except Exception as e:
         logger.error(f"❌ Error analyzing ticket: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error analyzing ticket: {str(e)}")
+
+
+def sse_event(event: str, data) -> str:
+    """Format one server-sent event frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/{ticket_id}/analyze/stream")
+async def stream_ticket_analysis(
+    ticket_id: str,
+    force: bool = False,
+    analysis_service: IdempotentAnalysisService = Depends(get_analysis_service)
+):
+    """
+    Analyze a single ticket with AI, streaming fields as server-sent events
+
+    Emits a "field" event per analysis field as soon as the model has
+    written it, then "complete" with the full result, or "error".
+    force=true bypasses cached analyses.
+    """
+    logger.info(f"🤖 Streaming analysis for ticket: {ticket_id}")
+    client = get_fs_client()
+    ticket = await client.get_ticket(ticket_id)
+
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+
+    async def events():
+        try:
+            async for event in analysis_service.stream(ticket, force=force):
+                if event["event"] == "field":
+                    yield sse_event("field", {"field": event["field"], "value": event["value"]})
+                    continue
+
+                result = event["result"]
+                if result.get("status") != "success":
+                    yield sse_event("error", {"message": result.get("message")})
+                    return
+                yield sse_event("complete", result)
+
+                # Send notification to Slack if configured (once per ticket content)
+                notified = await analysis_service.notify_slack(ticket, result)
+                if notified == NOTIFY_SENT:
+                    logger.info(f"[ENDPOINT] 📨 Slack notification sent for ticket {ticket_id}")
+                elif notified == NOTIFY_FAILED:
+                    logger.error(f"[ENDPOINT] ❌ Failed to send Slack notification for ticket {ticket_id}")
+        except Exception as e:
+            logger.error(f"❌ Error streaming ticket analysis: {str(e)}")
+            yield sse_event("error", {"message": f"Error analyzing ticket: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/batch")
+async def analyze_ticket_batch(
+    ticket_ids: List[str] = Body(..., embed=True),
+    force: bool = False,
+    stream: bool = False,
+    analysis_service: IdempotentAnalysisService = Depends(get_analysis_service)
+):
+    """
+    Analyze a batch of tickets concurrently
+
+    Returns the batch_analysis_complete summary, with results in the
+    order of ticket_ids. With stream=true, each ticket's result (plus its
+    "index" in ticket_ids) is sent as a "result" server-sent event as soon
+    as it finishes, followed by "complete" with the summary. Batches don't
+    notify Slack. force=true bypasses cached analyses.
+    """
+    if not ticket_ids:
+        raise HTTPException(status_code=400, detail="No ticket IDs provided")
+    if len(ticket_ids) > config.ANALYSIS_BATCH_MAX_TICKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {config.ANALYSIS_BATCH_MAX_TICKETS} tickets per batch"
+        )
+
+    logger.info(f"🤖 Analyzing batch of {len(ticket_ids)} tickets")
+    use_case = AnalyzeTicketBatchUseCase(analysis_service, get_fs_client())
+
+    if not stream:
+        try:
+            return await use_case.execute(ticket_ids, force=force)
+        except Exception as e:
+            logger.error(f"❌ Error analyzing ticket batch: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error analyzing ticket batch: {str(e)}")
+
+    async def events():
+        results = []
+        try:
+            async for index, result in use_case.iter_results(ticket_ids, force=force):
+                results.append((index, result))
+                yield sse_event("result", {**result, "index": index})
+            # The summary lists results in request order, like the non-streaming response
+            yield sse_event("complete", TicketAnalyzer.batch_summary([result for _, result in sorted(results, key=lambda item: item[0])]))
+        except Exception as e:
+            logger.error(f"❌ Error streaming ticket batch: {str(e)}")
+            yield sse_event("error", {"message": f"Error analyzing ticket batch: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
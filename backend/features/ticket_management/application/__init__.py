@@ -1,8 +1,14 @@
 """
 Ticket Management Application Layer
 """
-from .list_tickets import ListTicketsUseCase
+from .list_tickets import ListTicketsUseCase, ticket_list_cache, invalidate_ticket_lists
 from .get_ticket_details import GetTicketDetailsUseCase
 from .search_tickets import SearchTicketsUseCase
 
-__all__ = ["ListTicketsUseCase", "GetTicketDetailsUseCase", "SearchTicketsUseCase"]
+__all__ = [
+    "ListTicketsUseCase",
+    "GetTicketDetailsUseCase",
+    "SearchTicketsUseCase",
+    "ticket_list_cache",
+    "invalidate_ticket_lists"
+]
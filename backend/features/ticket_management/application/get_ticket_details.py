@@ -1,8 +1,9 @@
 """
 Get Ticket Details Use Case
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -10,29 +11,67 @@ logger = logging.getLogger(__name__)
 class GetTicketDetailsUseCase:
     """Use case for getting ticket details"""
     
-    def __init__(self, freshservice_client):
+    def __init__(self, freshservice_client, ticket_cache=None, search_index=None):
         self.client = freshservice_client
+        self.ticket_cache = ticket_cache
+        self.search_index = search_index
     
-    def execute(self, ticket_id: str, include_conversations: bool = False) -> Optional[Dict[str, Any]]:
+    async def execute(self, ticket_id: str, include_conversations: bool = False, include: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
         Execute get ticket details
         
+        The ticket and its full conversation thread are fetched
+        concurrently; other related objects (requester, stats, ...) are
+        embedded in the ticket request itself.
+        
         Args:
             ticket_id: Ticket ID
             include_conversations: Whether to include conversations
+            include: Related objects to embed, e.g. ["conversations", "requester", "stats"]
             
         Returns:
             Ticket details or None if not found
         """
         logger.info(f"[USE_CASE] Getting ticket details: {ticket_id}")
         
-        ticket = self.client.get_ticket(ticket_id)
+        include = list(include or [])
+        if "conversations" in include:
+            include_conversations = True
+        embeds = [name for name in include if name != "conversations"]
+        
+        ticket = None
+        fetched = False
+        # The mirror holds plain tickets, so embeds always go upstream
+        if self.ticket_cache and not embeds:
+            ticket = await asyncio.to_thread(self.ticket_cache.get_ticket, ticket_id)
+            # Tickets mirrored from list pages may lack the description
+            if ticket and "description" not in ticket:
+                ticket = None
+        
+        conversations = None
+        if not ticket:
+            fetched = True
+            if include_conversations:
+                ticket, conversations = await asyncio.gather(
+                    self.client.get_ticket(ticket_id, include=embeds or None),
+                    self.client.get_ticket_conversations(ticket_id)
+                )
+            else:
+                ticket = await self.client.get_ticket(ticket_id, include=embeds or None)
+        elif include_conversations:
+            conversations = await self.client.get_ticket_conversations(ticket_id)
         
         if not ticket:
             return None
         
         if include_conversations:
-            conversations = self.client.get_ticket_conversations(ticket_id)
             ticket['conversations'] = conversations
         
+        # Full details carry text the sync can't see (description, conversation bodies)
+        if self.search_index and (fetched or include_conversations):
+            try:
+                await asyncio.to_thread(self.search_index.index_ticket, ticket, ticket.get('conversations'))
+            except Exception as e:
+                logger.warning(f"[USE_CASE] Could not index ticket {ticket_id}: {str(e)}")
+        
         return ticket
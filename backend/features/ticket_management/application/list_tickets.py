@@ -1,33 +1,87 @@
 """
 List Tickets Use Case
 """
+import asyncio
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from config import config
+from infrastructure.shared import StaleWhileRevalidateCache
 
 logger = logging.getLogger(__name__)
 
+# Shared by all requests; key is (page, per_page, group_id, status, priority)
+ticket_list_cache = StaleWhileRevalidateCache(
+    "ticket_list",
+    ttl_seconds=config.TICKET_LIST_CACHE_TTL_SECONDS,
+    stale_ttl_seconds=config.TICKET_LIST_CACHE_STALE_SECONDS,
+    max_entries=config.TICKET_LIST_CACHE_MAX_ENTRIES
+)
+
+
+def invalidate_ticket_lists(group_id: Optional[int] = None) -> int:
+    """
+    Drop cached ticket lists affected by a change
+
+    Args:
+        group_id: Group of the changed ticket; all lists when unknown
+
+    Returns:
+        Number of cached lists dropped
+    """
+    if group_id is None:
+        return ticket_list_cache.invalidate()
+    return ticket_list_cache.invalidate(lambda key: key[2] is None or str(key[2]) == str(group_id))
+
 
 class ListTicketsUseCase:
     """Use case for listing tickets with pagination"""
     
-    def __init__(self, freshservice_client):
+    def __init__(self, freshservice_client, ticket_cache=None, list_cache: Optional[StaleWhileRevalidateCache] = ticket_list_cache):
         self.client = freshservice_client
+        self.ticket_cache = ticket_cache
+        self.list_cache = list_cache
+        self.cache_state: Optional[str] = None
+        self.cache_age: float = 0.0
     
-    def execute(self, page: int = 1, per_page: int = 30, group_id: int = None) -> Dict[str, Any]:
+    async def execute(self, page: int = 1, per_page: int = 30, group_id: int = None, status: Optional[str] = None, priority: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute ticket listing
         
+        Results are served through the read-through list cache; after the
+        call, cache_state says whether they were fresh, stale or a miss.
+        A failed FreshService fetch is never cached: a stale entry keeps
+        being served, and a miss raises.
+        
         Args:
             page: Page number
             per_page: Items per page
             group_id: Optional group filter
+            status: Optional status filter
+            priority: Optional priority filter
             
         Returns:
             Paginated ticket list
+            
+        Raises:
+            Exception: If the tickets cannot be fetched and nothing is cached
         """
-        logger.info(f"[USE_CASE] Listing tickets: page={page}, per_page={per_page}, group_id={group_id}")
+        logger.info(f"[USE_CASE] Listing tickets: page={page}, per_page={per_page}, group_id={group_id}, status={status}, priority={priority}")
+        
+        async def load() -> Dict[str, Any]:
+            if self.ticket_cache:
+                return await asyncio.to_thread(
+                    self.ticket_cache.get_tickets,
+                    status=status, priority=priority, group_id=group_id, page=page, per_page=per_page
+                )
+            # get_tickets turns failures into an empty page, which the cache would keep
+            # (or put over a good stale entry); get_tickets_page raises instead
+            return await self.client.get_tickets_page(status=status, priority=priority, group_id=group_id, page=page, per_page=per_page)
         
-        result = self.client.get_tickets(page=page, per_page=per_page, group_id=group_id)
+        if self.list_cache:
+            key = (page, per_page, group_id, status, priority)
+            result, self.cache_state, self.cache_age = await self.list_cache.get(key, load)
+        else:
+            result = await load()
         
         return {
             "tickets": result.get("tickets", []),
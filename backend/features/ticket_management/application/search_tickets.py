@@ -1,8 +1,9 @@
 """
 Search Tickets Use Case
 """
+import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -10,21 +11,38 @@ logger = logging.getLogger(__name__)
 class SearchTicketsUseCase:
     """Use case for searching tickets"""
     
-    def __init__(self, freshservice_client):
+    def __init__(self, freshservice_client, search_index=None):
         self.client = freshservice_client
+        self.search_index = search_index
     
-    def execute(self, query: str) -> List[Dict[str, Any]]:
+    async def execute(self, query: str, page: int = 1, per_page: int = 30) -> Dict[str, Any]:
         """
         Execute ticket search
         
+        Answers from the local search index when it is populated and
+        falls back to the FreshService search API otherwise.
+        
         Args:
             query: Search query
+            page: Page number
+            per_page: Results per page
             
         Returns:
-            List of matching tickets
+            Page of matching tickets with pagination fields and source
         """
         logger.info(f"[USE_CASE] Searching tickets: {query}")
         
-        results = self.client.search_tickets(query)
+        if self.search_index and await asyncio.to_thread(self.search_index.count):
+            result = await asyncio.to_thread(self.search_index.search, query, page, per_page)
+            return {**result, "source": "index"}
         
-        return results
+        results = await self.client.search_tickets(query)
+        start = (page - 1) * per_page
+        return {
+            "results": results[start:start + per_page],
+            "page": page,
+            "per_page": per_page,
+            "total": len(results),
+            "has_more": (page * per_page) < len(results),
+            "source": "freshservice"
+        }
@@ -1,63 +1,125 @@
 """
 Ticket Management API Endpoints
 """
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Response
+from typing import Optional, List
 from config import config
-from api.freshservice_client import FreshServiceClient
+from api.freshservice_client import AsyncFreshServiceClient, get_async_freshservice_client
+from infrastructure.integrations import RateLimitExceeded
 from ..application.list_tickets import ListTicketsUseCase
 from ..application.get_ticket_details import GetTicketDetailsUseCase
 from ..application.search_tickets import SearchTicketsUseCase
+from services.ticket_sync import ticket_sync_service
+from infrastructure.search import ticket_search_index
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-def get_fs_client() -> FreshServiceClient:
+def get_fs_client() -> AsyncFreshServiceClient:
     """Get FreshService client"""
     if not config.FRESHSERVICE_API_KEY or not config.FRESHSERVICE_DOMAIN:
         raise HTTPException(
             status_code=500,
             detail="FreshService credentials not configured"
         )
-    return FreshServiceClient(
-        api_key=config.FRESHSERVICE_API_KEY,
-        domain=config.FRESHSERVICE_DOMAIN
-    )
+    return get_async_freshservice_client()
+
+
+def get_ticket_cache():
+    """Get the local ticket mirror when reads are served from it"""
+    if config.TICKET_CACHE_READS_ENABLED and ticket_sync_service.is_ready():
+        return ticket_sync_service.repository
+    return None
+
+
+def get_search_index():
+    """Get the local search index when searches are served from it"""
+    if config.TICKET_SEARCH_LOCAL_ENABLED and ticket_sync_service.is_ready():
+        return ticket_search_index
+    return None
 
 
 @router.get("/")
 async def list_tickets(
+    response: Response,
     page: int = Query(1, ge=1),
     per_page: int = Query(30, ge=1, le=100),
-    group_id: Optional[int] = Query(None)
+    group_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None),
+    priority: Optional[str] = Query(None)
 ):
     """Get list of tickets with pagination and optional group filtering"""
     logger.info(f"📋 Fetching tickets: page={page}, per_page={per_page}, group_id={group_id}")
     try:
         client = get_fs_client()
-        use_case = ListTicketsUseCase(client)
-        result = use_case.execute(page=page, per_page=per_page, group_id=group_id)
+        use_case = ListTicketsUseCase(client, get_ticket_cache())
+        result = await use_case.execute(page=page, per_page=per_page, group_id=group_id, status=status, priority=priority)
+        
+        if use_case.cache_state:
+            response.headers["X-Cache"] = use_case.cache_state
+            response.headers["Age"] = str(int(use_case.cache_age))
         
         return {
             "status": "success",
             "data": result
         }
+    except RateLimitExceeded:
+        # Answered with 503 + Retry-After by the app's exception handler
+        raise
     except Exception as e:
         logger.error(f"❌ Error fetching tickets: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching tickets: {str(e)}")
 
 
+@router.post("/sync")
+async def trigger_ticket_sync(background_tasks: BackgroundTasks, full: bool = False):
+    """Trigger a sync of the local ticket mirror (full=true also reconciles deletions)"""
+    logger.info(f"🔄 Ticket sync requested: full={full}")
+    if ticket_sync_service.is_syncing():
+        # sync_once would skip it anyway; say so instead of accepting it
+        return {
+            "status": "already_running",
+            "mode": "full" if full else "incremental"
+        }
+    background_tasks.add_task(ticket_sync_service.sync_once, full)
+    return {
+        "status": "accepted",
+        "mode": "full" if full else "incremental"
+    }
+
+
+@router.get("/sync/status")
+async def get_ticket_sync_status():
+    """Get the state of the local ticket mirror"""
+    status = await asyncio.to_thread(ticket_sync_service.get_status)
+    return {
+        "status": "success",
+        "sync": status,
+        "reads_from_cache": get_ticket_cache() is not None
+    }
+
+
+def parse_include(include: Optional[str]) -> List[str]:
+    """Split a comma-separated include parameter"""
+    return [name.strip() for name in (include or "").split(",") if name.strip()]
+
+
 @router.get("/{ticket_id}")
-async def get_ticket(ticket_id: str, include_conversations: bool = False):
+async def get_ticket(
+    ticket_id: str,
+    include_conversations: bool = False,
+    include: Optional[str] = Query(None, description="Comma-separated: conversations,requester,stats")
+):
     """Get single ticket by ID"""
     logger.info(f"🎫 Fetching ticket: {ticket_id}")
     try:
         client = get_fs_client()
-        use_case = GetTicketDetailsUseCase(client)
-        ticket = use_case.execute(ticket_id, include_conversations)
+        use_case = GetTicketDetailsUseCase(client, get_ticket_cache(), get_search_index())
+        ticket = await use_case.execute(ticket_id, include_conversations, parse_include(include))
 
         if not ticket:
             raise HTTPException(status_code=404, detail="Ticket not found")
@@ -79,8 +141,8 @@ async def get_ticket_summary(ticket_id: str):
     logger.info(f"📄 Getting summary for ticket: {ticket_id}")
     try:
         client = get_fs_client()
-        use_case = GetTicketDetailsUseCase(client)
-        ticket = use_case.execute(ticket_id)
+        use_case = GetTicketDetailsUseCase(client, get_ticket_cache())
+        ticket = await use_case.execute(ticket_id)
         
         if not ticket:
             raise HTTPException(status_code=404, detail="Ticket not found")
@@ -104,7 +166,7 @@ async def get_ticket_conversations_detail(ticket_id: str):
     logger.info(f"💬 Getting conversations for ticket: {ticket_id}")
     try:
         client = get_fs_client()
-        conversations = client.get_ticket_conversations(ticket_id)
+        conversations = await client.get_ticket_conversations(ticket_id)
         
         return {
             "status": "success",
@@ -118,18 +180,21 @@ async def get_ticket_conversations_detail(ticket_id: str):
 
 
 @router.get("/search/tickets")
-async def search_tickets(query: str = Query(..., min_length=1)):
+async def search_tickets(
+    query: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(30, ge=1, le=100)
+):
     """Search tickets"""
     logger.info(f"🔍 Searching tickets: {query}")
     try:
         client = get_fs_client()
-        use_case = SearchTicketsUseCase(client)
-        results = use_case.execute(query)
+        use_case = SearchTicketsUseCase(client, get_search_index())
+        result = await use_case.execute(query, page=page, per_page=per_page)
         
         return {
             "status": "success",
-            "results": results,
-            "total": len(results)
+            **result
         }
     except Exception as e:
         logger.error(f"❌ Error searching tickets: {str(e)}")
@@ -4,14 +4,17 @@ Technical implementation details
 """
 
 from .ai_providers import BedrockAIProvider
-from .integrations import FreshServiceIntegration
+from .integrations import FreshServiceIntegration, AsyncFreshServiceIntegration
 from .notifications import SlackNotificationService
+from .search import TicketSearchIndex
 from .shared import get_db, init_db, TicketCache, AnalysisLog
 
 __all__ = [
     "BedrockAIProvider",
     "FreshServiceIntegration",
+    "AsyncFreshServiceIntegration",
     "SlackNotificationService",
+    "TicketSearchIndex",
     "get_db",
     "init_db",
     "TicketCache",
@@ -2,5 +2,6 @@
 AI Providers Infrastructure
 """
 from .bedrock_provider import BedrockAIProvider
+from .provider_registry import get_bedrock_provider, close_bedrock_provider, bedrock_client_config
 
-__all__ = ["BedrockAIProvider"]
+__all__ = ["BedrockAIProvider", "get_bedrock_provider", "close_bedrock_provider", "bedrock_client_config"]
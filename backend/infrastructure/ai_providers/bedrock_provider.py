@@ -2,27 +2,54 @@
 AWS Bedrock AI Provider
 Implements AI analysis using AWS Bedrock Claude models
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, AsyncIterator, Iterator
 import json
 import boto3
+from botocore.config import Config as BotoConfig
 import os
 import re
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
 
 class BedrockAIProvider:
     """AWS Bedrock AI provider for ticket analysis"""
 
-    def __init__(self, aws_access_key: Optional[str] = None, aws_secret_key: Optional[str] = None):
+    def __init__(
+        self,
+        aws_access_key: Optional[str] = None,
+        aws_secret_key: Optional[str] = None,
+        region_name: str = 'us-east-1',
+        client_config: Optional[BotoConfig] = None,
+        max_concurrency: int = 8,
+        model_id: str = DEFAULT_MODEL_ID
+    ):
         """
         Initialize AWS Bedrock client
 
+        Prefer get_bedrock_provider(), which shares one client (and its
+        connection pool) per process.
+
         Args:
             aws_access_key: AWS Access Key (defaults to AWS_ACCESS_KEY env var)
             aws_secret_key: AWS Secret Key (defaults to AWS_SECRET_ACCESS_KEY env var)
+            region_name: Bedrock region
+            client_config: botocore client config (pool size, timeouts, retries)
+            max_concurrency: Threads running blocking calls for analyze_async
+            model_id: Bedrock model to invoke
         """
+        self.model_id = model_id
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.in_flight = 0
+        self.timeouts = 0
         self.aws_access_key = aws_access_key or os.getenv("AWS_ACCESS_KEY")
         self.aws_secret_key = aws_secret_key or os.getenv("AWS_SECRET_ACCESS_KEY")
 
@@ -33,15 +60,96 @@ class BedrockAIProvider:
             try:
                 self.client = boto3.client(
                     'bedrock-runtime',
-                    region_name='us-east-1',
+                    region_name=region_name,
                     aws_access_key_id=self.aws_access_key,
-                    aws_secret_access_key=self.aws_secret_key
+                    aws_secret_access_key=self.aws_secret_key,
+                    config=client_config
                 )
                 logger.info("[AI] AWS Bedrock client initialized")
             except Exception as e:
                 logger.error(f"[AI] Failed to initialize AWS Bedrock: {str(e)}")
                 self.client = None
 
+    def close(self):
+        """Close the client's connection pool and the analyze_async threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self.client is not None and hasattr(self.client, "close"):
+            self.client.close()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Dedicated threads for Bedrock calls, sized apart from the default executor"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        thread_name_prefix="bedrock"
+                    )
+        return self._executor
+
+    async def analyze_async(self, system_prompt: str, user_prompt: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Non-blocking analyze() for async callers
+
+        The blocking invoke_model runs on this provider's executor, so the
+        event loop keeps serving other requests. At most max_concurrency
+        calls run at once; further calls wait for a thread.
+
+        Args:
+            system_prompt: System instructions
+            user_prompt: User content to analyze
+            timeout: Seconds to wait, including time queued for a thread
+
+        Raises:
+            asyncio.TimeoutError: If the call took longer than timeout. The
+                caller stops waiting at once; a call already sent finishes
+                in the background, bounded by the client's read timeout.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self.analyze, system_prompt, user_prompt)
+        self.in_flight += 1
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.error(f"[AI] Bedrock call timed out after {timeout}s")
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Concurrency counters for diagnostics"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "timeouts": self.timeouts
+        }
+
+    def _request_body(self, system_prompt: str, user_prompt: str) -> str:
+        return json.dumps({
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 1000,
+            "system": system_prompt,
+            "messages": [
+                {"role": "user", "content": user_prompt}
+            ]
+        })
+
+    @staticmethod
+    def parse_response_text(response_text: str) -> Dict[str, Any]:
+        """Parse the model's JSON answer, with or without a markdown code block"""
+        # Extract JSON from markdown code blocks if present
+        json_match = re.search(r'```(?:json)?\s*(.*?)\s*```', response_text, re.DOTALL)
+        if json_match:
+            json_str = json_match.group(1)
+        else:
+            json_str = response_text
+        
+        return json.loads(json_str)
+
     def analyze(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         """
         Analyze content using Bedrock Claude
@@ -57,18 +165,9 @@ class BedrockAIProvider:
             raise ValueError("AWS Bedrock client not initialized")
 
         try:
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 1000,
-                "system": system_prompt,
-                "messages": [
-                    {"role": "user", "content": user_prompt}
-                ]
-            }
-
             response = self.client.invoke_model(
-                modelId="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
-                body=json.dumps(body)
+                modelId=self.model_id,
+                body=self._request_body(system_prompt, user_prompt)
             )
 
             response_body = json.loads(response['body'].read())
@@ -80,14 +179,7 @@ class BedrockAIProvider:
 
             logger.info(f"[AI] Response text: {response_text[:200]}")
             
-            # Extract JSON from markdown code blocks if present
-            json_match = re.search(r'```(?:json)?\s*(.*?)\s*```', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                json_str = response_text
-            
-            return json.loads(json_str)
+            return self.parse_response_text(response_text)
 
         except json.JSONDecodeError as e:
             logger.error(f"[AI] JSON parsing error: {str(e)}")
@@ -95,3 +187,89 @@ class BedrockAIProvider:
         except Exception as e:
             logger.error(f"[AI] Error calling Bedrock: {str(e)}")
             raise
+
+    def stream_text(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """
+        Stream the model's answer as text deltas (invoke_model_with_response_stream)
+
+        Blocking generator; async callers should use analyze_stream_async.
+        """
+        if not self.client:
+            raise ValueError("AWS Bedrock client not initialized")
+
+        response = self.client.invoke_model_with_response_stream(
+            modelId=self.model_id,
+            body=self._request_body(system_prompt, user_prompt)
+        )
+        for event in response['body']:
+            chunk = event.get('chunk')
+            if not chunk:
+                continue
+            payload = json.loads(chunk['bytes'])
+            if payload.get('type') == 'content_block_delta':
+                text = payload.get('delta', {}).get('text')
+                if text:
+                    yield text
+
+    async def analyze_stream_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream text deltas without blocking the event loop
+
+        The blocking stream is read on this provider's executor and handed
+        over through a queue. Closing the iterator early stops the reader.
+
+        Args:
+            system_prompt: System instructions
+            user_prompt: User content to analyze
+            timeout: Seconds for the whole stream
+
+        Raises:
+            asyncio.TimeoutError: If the stream did not finish within timeout
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def hand_over(kind: str, value: Any):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (kind, value))
+            except RuntimeError:
+                stop.set()  # Event loop closed; nobody is listening
+
+        def read_stream():
+            try:
+                for text in self.stream_text(system_prompt, user_prompt):
+                    if stop.is_set():
+                        break
+                    hand_over("text", text)
+            except Exception as e:
+                hand_over("error", e)
+            finally:
+                hand_over("end", None)
+
+        loop.run_in_executor(self.executor, read_stream)
+        deadline = loop.time() + timeout if timeout else None
+        self.in_flight += 1
+        try:
+            while True:
+                remaining = deadline - loop.time() if deadline else None
+                try:
+                    kind, value = await asyncio.wait_for(queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    logger.error(f"[AI] Bedrock stream timed out after {timeout}s")
+                    raise
+                if kind == "text":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    break
+        finally:
+            stop.set()
+            self.in_flight -= 1
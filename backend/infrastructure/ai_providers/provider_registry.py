@@ -0,0 +1,65 @@
+"""
+AI Provider Registry
+Process-wide Bedrock provider sharing one client and connection pool
+"""
+import logging
+import threading
+from typing import Optional
+from botocore.config import Config as BotoConfig
+from config import config
+from .bedrock_provider import BedrockAIProvider
+
+logger = logging.getLogger(__name__)
+
+_provider: Optional[BedrockAIProvider] = None
+_lock = threading.Lock()
+
+
+def bedrock_client_config() -> BotoConfig:
+    """botocore config for the shared bedrock-runtime client"""
+    return BotoConfig(
+        max_pool_connections=config.BEDROCK_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        connect_timeout=config.BEDROCK_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=config.BEDROCK_READ_TIMEOUT_SECONDS,
+        retries={"max_attempts": config.BEDROCK_MAX_RETRIES, "mode": "adaptive"}
+    )
+
+
+def get_bedrock_provider() -> BedrockAIProvider:
+    """
+    Get the shared Bedrock provider, creating it on first use
+
+    boto3 clients are thread-safe, so one client (credential resolution,
+    endpoint data and keep-alive connection pool) serves every analysis
+    in the process. Also usable as a FastAPI dependency.
+
+    Returns:
+        Shared BedrockAIProvider
+    """
+    global _provider
+    provider = _provider
+    if provider is not None:
+        return provider
+
+    with _lock:
+        if _provider is None:
+            _provider = BedrockAIProvider(
+                config.AWS_ACCESS_KEY,
+                config.AWS_SECRET_ACCESS_KEY,
+                region_name=config.BEDROCK_REGION,
+                client_config=bedrock_client_config(),
+                max_concurrency=config.BEDROCK_MAX_CONCURRENCY,
+                model_id=config.BEDROCK_MODEL_ID
+            )
+            logger.info(f"[AI] Shared Bedrock provider created (max_pool_connections={config.BEDROCK_MAX_POOL_CONNECTIONS}, max_concurrency={config.BEDROCK_MAX_CONCURRENCY})")
+        return _provider
+
+
+def close_bedrock_provider():
+    """Close the shared provider's connections (shutdown)"""
+    global _provider
+    with _lock:
+        provider, _provider = _provider, None
+    if provider is not None:
+        provider.close()
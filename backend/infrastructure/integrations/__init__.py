@@ -2,5 +2,14 @@
 External Integrations Infrastructure
 """
 from .freshservice_integration import FreshServiceIntegration
+from .async_freshservice_integration import AsyncFreshServiceIntegration
+from .rate_limiter import RateLimitExceeded, freshservice_rate_limiter
+from .single_flight import freshservice_single_flight
 
-__all__ = ["FreshServiceIntegration"]
+__all__ = [
+    "FreshServiceIntegration",
+    "AsyncFreshServiceIntegration",
+    "RateLimitExceeded",
+    "freshservice_rate_limiter",
+    "freshservice_single_flight"
+]
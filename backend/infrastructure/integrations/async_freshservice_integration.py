@@ -0,0 +1,359 @@
+"""
+Async FreshService Integration Client
+Non-blocking counterpart of FreshServiceIntegration for async callers
+"""
+import asyncio
+import logging
+import httpx
+from typing import Optional, List, Dict, Any, AsyncIterator
+from config import config
+from ..shared.http_pool import get_async_client
+from ..shared.json_stream import JSONArrayStreamParser
+from .freshservice_integration import (
+    STREAM_CHUNK_SIZE,
+    FILTER_PAGE_SIZE,
+    CONVERSATIONS_PER_PAGE,
+    build_ticket_params,
+    conversations_truncated,
+    build_auth_headers,
+    build_tickets_query,
+    build_tickets_page,
+    empty_tickets_page,
+    remaining_pages,
+    page_retry_delay,
+    should_retry,
+    coalescing_key
+)
+from .rate_limiter import freshservice_rate_limiter, backoff_delay, RateLimitExceeded
+from .single_flight import freshservice_single_flight
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFreshServiceIntegration:
+    """FreshService API Integration using asyncio
+
+    Exposes the same methods and return shapes as FreshServiceIntegration,
+    as coroutines, so route handlers never block the event loop.
+    """
+
+    def __init__(self, api_key: str, domain: str):
+        """
+        Initialize async FreshService client
+
+        Args:
+            api_key: FreshService API key
+            domain: FreshService domain (e.g., 'alliance')
+        """
+        self.api_key = api_key
+        self.domain = domain
+        self.base_url = f"https://{domain}.freshservice.com/api/v2"
+        self.headers = build_auth_headers(api_key)
+
+        logger.info(f"[CLIENT] Async FreshService client initialized for domain: {domain}")
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared keep-alive client for this host"""
+        return get_async_client(self.base_url)
+
+    async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Make API request, coalescing concurrent identical GETs"""
+        key = coalescing_key(self.api_key, self.base_url, method, endpoint, kwargs)
+        if key is None:
+            return await self._send(method, endpoint, **kwargs)
+        return await freshservice_single_flight.do_async(key, lambda: self._send(method, endpoint, **kwargs))
+
+    async def _send(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Send API request and decode the JSON body"""
+        response = await self._send_response(method, endpoint, **kwargs)
+        return response.json()
+
+    async def _send_response(self, method: str, endpoint: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        Send API request with logging
+
+        Paced and retried exactly like FreshServiceIntegration._send_response.
+        With stream=True the body is left unread for the caller to consume
+        (and aclose).
+        """
+        url = f"{self.base_url}{endpoint}"
+        attempts = config.FRESHSERVICE_MAX_RETRIES + 1
+
+        for attempt in range(1, attempts + 1):
+            await freshservice_rate_limiter.acquire_async()
+            logger.info(f"[API] {method} {url}")
+
+            try:
+                request = self.http.build_request(
+                    method=method,
+                    url=url,
+                    headers=self.headers,
+                    **kwargs
+                )
+                response = await self.http.send(request, stream=stream)
+
+                logger.info(f"[API] Response: {response.status_code}")
+                if stream and response.is_error:
+                    # Error bodies are small; read them so they can be logged
+                    await response.aread()
+                if not stream:
+                    logger.debug(f"[API] Response body: {response.text[:500]}")
+
+                retry_after = freshservice_rate_limiter.update(response.status_code, response.headers)
+                if should_retry(method, response.status_code) and attempt < attempts:
+                    await response.aclose()
+                    delay = backoff_delay(attempt)
+                    logger.warning(f"[API] {response.status_code} from FreshService, retry {attempt}/{attempts - 1} in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                if response.status_code == 429:
+                    raise RateLimitExceeded(f"FreshService rate limit exceeded for {method} {endpoint}", retry_after)
+
+                response.raise_for_status()
+                return response
+            except httpx.ConnectError as e:
+                logger.error(f"[API] Connection error: {str(e)}")
+                raise
+            except httpx.TimeoutException as e:
+                logger.error(f"[API] Timeout error: {str(e)}")
+                raise
+            except httpx.HTTPStatusError as e:
+                logger.error(f"[API] HTTP error {e.response.status_code}: {e.response.text}")
+                raise
+            except RateLimitExceeded as e:
+                logger.error(f"[API] {str(e)}")
+                raise
+            except Exception as e:
+                logger.error(f"[API] Error: {str(e)}")
+                raise
+
+    async def _fetch_tickets_page(self, status: Optional[str], priority: Optional[str], group_id: Optional[int], page: int, per_page: int) -> Dict[str, Any]:
+        """Fetch one page of tickets, raising on failure"""
+        endpoint, params = build_tickets_query(status, priority, group_id, page, per_page)
+        response = await self._request("GET", endpoint, params=params)
+        return build_tickets_page(response, page, per_page)
+
+    async def _fetch_tickets_page_with_retry(self, status: Optional[str], priority: Optional[str], group_id: Optional[int], page: int, per_page: int) -> Dict[str, Any]:
+        """Fetch one page of tickets, retrying before giving up"""
+        attempts = config.FRESHSERVICE_PAGE_RETRIES + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                return await self._fetch_tickets_page(status, priority, group_id, page, per_page)
+            except Exception as e:
+                if attempt == attempts:
+                    logger.error(f"[TICKETS] Page {page} failed after {attempts} attempts: {str(e)}")
+                    raise
+                logger.warning(f"[TICKETS] Page {page} failed (attempt {attempt}/{attempts}), retrying: {str(e)}")
+                await asyncio.sleep(page_retry_delay(attempt))
+
+    async def get_tickets_page(self, status: Optional[str] = None, priority: Optional[str] = None, group_id: Optional[int] = None, page: int = 1, per_page: int = 100) -> Dict[str, Any]:
+        """
+        Get one page of tickets, raising on failure
+
+        See FreshServiceIntegration.get_tickets_page.
+
+        Raises:
+            RateLimitExceeded: If FreshService is still rate limiting after retries
+            Exception: If the request fails
+        """
+        logger.info(f"[TICKETS] Fetching tickets: status={status}, priority={priority}, group_id={group_id}, page={page}, per_page={per_page}")
+        return await self._fetch_tickets_page(status, priority, group_id, page, per_page)
+
+    async def get_tickets(self, status: Optional[str] = None, priority: Optional[str] = None, group_id: Optional[int] = None, page: int = 1, per_page: int = 100) -> Dict[str, Any]:
+        """Get tickets with pagination support (an empty page on errors other than rate limiting)"""
+        try:
+            return await self.get_tickets_page(status, priority, group_id, page, per_page)
+        except RateLimitExceeded:
+            # An empty page would look like "no tickets" to the dashboard
+            raise
+        except Exception as e:
+            logger.error(f"[TICKETS] Error getting tickets: {str(e)}")
+            return empty_tickets_page(page, per_page)
+
+    async def get_all_tickets(self, status: Optional[str] = None, priority: Optional[str] = None, per_page: int = 100) -> List[Dict]:
+        """
+        Get all tickets by fetching all pages
+
+        See FreshServiceIntegration.get_all_tickets; pages after the first
+        are gathered with at most FRESHSERVICE_PAGE_CONCURRENCY in flight.
+
+        Raises:
+            Exception: If a page still fails after FRESHSERVICE_PAGE_RETRIES retries
+        """
+        logger.info(f"[TICKETS] Fetching ALL tickets: status={status}, priority={priority}")
+        first = await self._fetch_tickets_page_with_retry(status, priority, None, 1, per_page)
+        all_tickets = list(first["tickets"])
+
+        remaining = remaining_pages(first, per_page)
+        if remaining is None:
+            page = 1
+            result = first
+            while result["tickets"] and result["has_more"]:
+                page += 1
+                result = await self._fetch_tickets_page_with_retry(status, priority, None, page, per_page)
+                all_tickets.extend(result["tickets"])
+                logger.info(f"[TICKETS] Fetched {len(all_tickets)} tickets total so far...")
+        elif remaining:
+            logger.info(f"[TICKETS] Fetching {len(remaining)} more pages concurrently")
+            semaphore = asyncio.Semaphore(config.FRESHSERVICE_PAGE_CONCURRENCY)
+
+            async def fetch(page: int) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._fetch_tickets_page_with_retry(status, priority, None, page, per_page)
+
+            for result in await asyncio.gather(*(fetch(page) for page in remaining)):
+                all_tickets.extend(result["tickets"])
+
+        logger.info(f"[TICKETS] Total tickets fetched: {len(all_tickets)}")
+        return all_tickets
+
+    async def iter_tickets(self, status: Optional[str] = None, priority: Optional[str] = None, group_id: Optional[int] = None, updated_since: Optional[str] = None, order_by: Optional[str] = None, order_type: Optional[str] = None, per_page: int = 100) -> AsyncIterator[Dict]:
+        """
+        Stream tickets one at a time across all pages
+
+        Async generator counterpart of FreshServiceIntegration.iter_tickets.
+
+        Raises:
+            ValueError: If group_id is given (/tickets/filter pages differently; use filter_tickets)
+            Exception: If a page cannot be fetched or is cut off mid-stream
+        """
+        if group_id is not None:
+            raise ValueError("iter_tickets cannot filter by group; use filter_tickets")
+        logger.info(f"[TICKETS] Streaming tickets: status={status}, priority={priority}, updated_since={updated_since}")
+        page = 1
+        streamed = 0
+
+        while True:
+            endpoint, params = build_tickets_query(status, priority, None, page, per_page)
+            if updated_since:
+                params["updated_since"] = updated_since
+            if order_by:
+                params["order_by"] = order_by
+            if order_type:
+                params["order_type"] = order_type
+
+            parser = JSONArrayStreamParser("tickets")
+            count = 0
+            response = await self._send_response("GET", endpoint, stream=True, params=params)
+            try:
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    for ticket in parser.feed(chunk):
+                        count += 1
+                        yield ticket
+                for ticket in parser.close():
+                    count += 1
+                    yield ticket
+            finally:
+                await response.aclose()
+
+            streamed += count
+            total = parser.fields.get("total")
+            if count < per_page or (total is not None and page * per_page >= total):
+                break
+            page += 1
+
+        logger.info(f"[TICKETS] Streamed {streamed} tickets over {page} pages")
+
+    async def get_ticket(self, ticket_id: str, include: Optional[List[str]] = None) -> Optional[Dict]:
+        """Get single ticket, optionally embedding related objects (see FreshServiceIntegration.get_ticket)"""
+        try:
+            logger.info(f"[TICKET] Fetching ticket: {ticket_id}")
+            response = await self._request("GET", f"/tickets/{ticket_id}", params=build_ticket_params(include))
+            ticket = response.get("ticket")
+
+            if ticket:
+                logger.info(f"[TICKET] Ticket {ticket_id} fetched successfully")
+                logger.info(f"[TICKET] Subject: {ticket.get('subject', 'NO SUBJECT')[:100]}")
+                if conversations_truncated(ticket, include):
+                    ticket["conversations"] = await self.get_ticket_conversations(ticket_id)
+            else:
+                logger.warning(f"[TICKET] Ticket {ticket_id} not found in response")
+            return ticket
+        except httpx.HTTPStatusError as e:
+            logger.error(f"[TICKET] HTTP error fetching ticket {ticket_id}: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"[TICKET] Error fetching ticket {ticket_id}: {str(e)}")
+            return None
+
+    async def search_tickets(self, query: str) -> List[Dict]:
+        """Search tickets"""
+        try:
+            logger.info(f"[SEARCH] Searching tickets: {query}")
+            params = {"query": f'"{query}"'}
+            response = await self._request("GET", "/search/tickets", params=params)
+            results = response.get("results", [])
+            logger.info(f"[SEARCH] Found {len(results)} results")
+            return results
+        except Exception as e:
+            logger.error(f"[SEARCH] Error searching tickets: {str(e)}")
+            return []
+
+    async def filter_tickets(self, query: str, page: int = 1) -> Dict[str, Any]:
+        """Get one page of /tickets/filter results (see FreshServiceIntegration.filter_tickets)"""
+        logger.info(f"[FILTER] Filtering tickets: {query} (page {page})")
+        response = await self._request("GET", "/tickets/filter", params={"query": f'"{query}"', "page": page})
+        return build_tickets_page(response, page, FILTER_PAGE_SIZE)
+
+    async def get_ticket_conversations(self, ticket_id: str, per_page: int = CONVERSATIONS_PER_PAGE) -> List[Dict]:
+        """Get all ticket conversations, following pagination until a short page"""
+        try:
+            logger.info(f"[CONVERSATIONS] Fetching conversations for ticket: {ticket_id}")
+            conversations = []
+            page = 1
+            while True:
+                response = await self._request("GET", f"/tickets/{ticket_id}/conversations", params={"page": page, "per_page": per_page})
+                batch = response.get("conversations", [])
+                conversations.extend(batch)
+                if len(batch) < per_page:
+                    break
+                page += 1
+            logger.info(f"[CONVERSATIONS] Found {len(conversations)} conversations")
+            return conversations
+        except Exception as e:
+            logger.error(f"[CONVERSATIONS] Error fetching conversations: {str(e)}")
+            return []
+
+    async def create_ticket(self, subject: str, description: str, **kwargs) -> Optional[Dict]:
+        """Create new ticket"""
+        try:
+            logger.info(f"[CREATE] Creating ticket: {subject}")
+            data = {
+                "subject": subject,
+                "description": description,
+                **kwargs
+            }
+            response = await self._request("POST", "/tickets", json=data)
+            ticket = response.get("ticket")
+            if ticket:
+                logger.info(f"[CREATE] Ticket created with ID: {ticket.get('id')}")
+            return ticket
+        except Exception as e:
+            logger.error(f"[CREATE] Error creating ticket: {str(e)}")
+            return None
+
+    async def update_ticket(self, ticket_id: str, **kwargs) -> Optional[Dict]:
+        """Update ticket"""
+        try:
+            logger.info(f"[UPDATE] Updating ticket: {ticket_id}")
+            response = await self._request("PUT", f"/tickets/{ticket_id}", json=kwargs)
+            ticket = response.get("ticket")
+            if ticket:
+                logger.info(f"[UPDATE] Ticket {ticket_id} updated")
+            return ticket
+        except Exception as e:
+            logger.error(f"[UPDATE] Error updating ticket {ticket_id}: {str(e)}")
+            return None
+
+    async def get_groups(self) -> List[Dict]:
+        """Get all agent groups"""
+        try:
+            logger.info(f"[GROUPS] Fetching groups")
+            response = await self._request("GET", "/groups")
+            groups = response.get("groups", [])
+            logger.info(f"[GROUPS] Found {len(groups)} groups")
+            return groups
+        except Exception as e:
+            logger.error(f"[GROUPS] Error fetching groups: {str(e)}")
+            return []
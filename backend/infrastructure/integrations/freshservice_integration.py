@@ -3,12 +3,182 @@ FreshService Integration Client
 Handles all communication with FreshService API
 """
 import logging
+import math
+import time
 import requests
-from typing import Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 import base64
+from config import config
+from ..shared.http_pool import get_session
+from ..shared.json_stream import iter_array_items
+from .rate_limiter import freshservice_rate_limiter, backoff_delay, RateLimitExceeded, RETRYABLE_STATUS_CODES
+from .single_flight import freshservice_single_flight
 
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# FreshService embeds at most this many conversations with include=conversations
+EMBEDDED_CONVERSATIONS_LIMIT = 10
+CONVERSATIONS_PER_PAGE = 100
+
+# /tickets/filter returns fixed 30-ticket pages (10 at most) and caps the quoted query at 512 characters
+FILTER_PAGE_SIZE = 30
+FILTER_MAX_PAGES = 10
+FILTER_QUERY_MAX_LENGTH = 512
+
+
+def build_auth_headers(api_key: str) -> Dict[str, str]:
+    """Build FreshService basic-auth headers for an API key"""
+    auth_string = f"{api_key}:X"
+    auth_bytes = auth_string.encode('ascii')
+    auth_b64 = base64.b64encode(auth_bytes).decode('ascii')
+    
+    return {
+        "Authorization": f"Basic {auth_b64}",
+        "Content-Type": "application/json"
+    }
+
+
+def build_tickets_query(status: Optional[str], priority: Optional[str], group_id: Optional[int], page: int, per_page: int) -> Tuple[str, Dict[str, Any]]:
+    """Build endpoint and query params for a page of tickets"""
+    params = {
+        "page": page,
+        "per_page": per_page
+    }
+    
+    endpoint = "/tickets"
+    if group_id:
+        params['query'] = f'"group_id:{group_id}"'
+        endpoint = "/tickets/filter"
+    
+    if status:
+        params['status'] = status
+    if priority:
+        params['priority'] = priority
+    
+    return endpoint, params
+
+
+def build_group_filter_queries(group_ids: List[str], created_after: Optional[str] = None, max_length: int = FILTER_QUERY_MAX_LENGTH) -> List[Tuple[str, List[str]]]:
+    """
+    Pack groups into as few OR'd /tickets/filter queries as the length limit allows
+    
+    Args:
+        group_ids: Groups to cover
+        created_after: Optional 'YYYY-MM-DD' lower bound on created_at
+        max_length: Limit for the quoted query string
+        
+    Returns:
+        (query, group_ids) pairs; every group appears in exactly one query
+    """
+    suffix = f" AND created_at:>'{created_after}'" if created_after else ""
+    
+    def render(groups: List[str]) -> str:
+        clause = " OR ".join(f"group_id:{g}" for g in groups)
+        if suffix and len(groups) > 1:
+            clause = f"({clause})"
+        return clause + suffix
+    
+    queries = []
+    current: List[str] = []
+    for group_id in group_ids:
+        candidate = current + [group_id]
+        # +2 for the double quotes the API requires around the query
+        if current and len(render(candidate)) + 2 > max_length:
+            queries.append((render(current), current))
+            candidate = [group_id]
+        current = candidate
+    if current:
+        queries.append((render(current), current))
+    return queries
+
+
+def build_tickets_page(response: Dict[str, Any], page: int, per_page: int) -> Dict[str, Any]:
+    """Shape a tickets API response into a pagination result"""
+    tickets = response.get("tickets", [])
+    total_count = response.get("total", None)
+    
+    logger.info(f"[TICKETS] Found {len(tickets)} tickets on page {page}, total: {total_count}")
+
+    if total_count is not None:
+        has_more = (page * per_page) < total_count
+    else:
+        has_more = len(tickets) >= per_page
+    
+    return {
+        "tickets": tickets,
+        "page": page,
+        "per_page": per_page,
+        "total": total_count or len(tickets),
+        "has_more": has_more
+    }
+
+
+def remaining_pages(first_page: Dict[str, Any], per_page: int) -> Optional[List[int]]:
+    """
+    Page numbers still to fetch after page 1
+    
+    Returns None when the API did not report a total, in which case
+    pages have to be walked one after another.
+    """
+    if not first_page["tickets"]:
+        return []
+    if not first_page["has_more"]:
+        return []
+    total = first_page["total"]
+    if total <= len(first_page["tickets"]):
+        return None
+    last_page = math.ceil(total / per_page)
+    return list(range(2, last_page + 1))
+
+
+def page_retry_delay(attempt: int) -> float:
+    """Delay before retrying a failed page (exponential, capped)"""
+    return min(0.5 * (2 ** (attempt - 1)), 8.0)
+
+
+def coalescing_key(api_key: str, base_url: str, method: str, endpoint: str, kwargs: Dict[str, Any]) -> Optional[Tuple]:
+    """
+    Identity of a request for single-flight coalescing
+    
+    Returns None for requests that must never be shared (writes, bodies).
+    """
+    if method.upper() != "GET" or set(kwargs) - {"params"}:
+        return None
+    params = tuple(sorted((kwargs.get("params") or {}).items()))
+    return (api_key, base_url, endpoint, params)
+
+
+def should_retry(method: str, status_code: int) -> bool:
+    """Whether a response status is worth retrying for this method"""
+    if status_code == 429:
+        return True
+    return status_code in RETRYABLE_STATUS_CODES and method.upper() in ("GET", "PUT", "DELETE")
+
+
+def build_ticket_params(include: Optional[List[str]]) -> Optional[Dict[str, str]]:
+    """Query params embedding related objects (e.g. conversations, requester, stats) in a ticket"""
+    include = [name.strip() for name in (include or []) if name and name.strip()]
+    return {"include": ",".join(sorted(set(include)))} if include else None
+
+
+def conversations_truncated(ticket: Dict[str, Any], include: Optional[List[str]]) -> bool:
+    """Whether embedded conversations may be cut off at FreshService's embed limit"""
+    return "conversations" in (include or []) and len(ticket.get("conversations") or []) >= EMBEDDED_CONVERSATIONS_LIMIT
+
+
+def empty_tickets_page(page: int, per_page: int) -> Dict[str, Any]:
+    """Pagination result returned when a page cannot be fetched"""
+    return {
+        "tickets": [],
+        "page": page,
+        "per_page": per_page,
+        "total": 0,
+        "has_more": False
+    }
+
 
 class FreshServiceIntegration:
     """FreshService API Integration"""
@@ -24,132 +194,238 @@ class FreshServiceIntegration:
         self.api_key = api_key
         self.domain = domain
         self.base_url = f"https://{domain}.freshservice.com/api/v2"
+        self.headers = build_auth_headers(api_key)
         
-        auth_string = f"{api_key}:X"
-        auth_bytes = auth_string.encode('ascii')
-        auth_b64 = base64.b64encode(auth_bytes).decode('ascii')
-        
-        self.headers = {
-            "Authorization": f"Basic {auth_b64}",
-            "Content-Type": "application/json"
-        }
+        # Keep-alive pool shared by every client for this host
+        self.session = get_session(self.base_url)
         
         logger.info(f"[CLIENT] FreshService client initialized for domain: {domain}")
     
     def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make API request with logging"""
-        url = f"{self.base_url}{endpoint}"
+        """
+        Make API request, coalescing concurrent identical GETs
         
-        logger.info(f"[API] {method} {url}")
+        Callers issuing the same GET while one is in flight share its
+        response instead of each hitting FreshService.
+        """
+        key = coalescing_key(self.api_key, self.base_url, method, endpoint, kwargs)
+        if key is None:
+            return self._send(method, endpoint, **kwargs)
+        return freshservice_single_flight.do(key, lambda: self._send(method, endpoint, **kwargs))
+    
+    def _send(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Send API request and decode the JSON body"""
+        return self._send_response(method, endpoint, **kwargs).json()
+    
+    def _send_response(self, method: str, endpoint: str, stream: bool = False, **kwargs) -> requests.Response:
+        """
+        Send API request with logging
         
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=self.headers,
-                timeout=10,
-                **kwargs
-            )
-            
-            logger.info(f"[API] Response: {response.status_code}")
-            logger.debug(f"[API] Response body: {response.text[:500]}")
+        Requests are paced by the shared rate limiter and retried with
+        jittered backoff on 429 (any method) and 5xx (idempotent methods).
+        With stream=True the body is left unread for the caller to consume
+        (and close).
+        """
+        url = f"{self.base_url}{endpoint}"
+        attempts = config.FRESHSERVICE_MAX_RETRIES + 1
+        
+        for attempt in range(1, attempts + 1):
+            freshservice_rate_limiter.acquire()
+            logger.info(f"[API] {method} {url}")
             
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.ConnectionError as e:
-            logger.error(f"[API] Connection error: {str(e)}")
-            raise
-        except requests.exceptions.Timeout as e:
-            logger.error(f"[API] Timeout error: {str(e)}")
-            raise
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"[API] HTTP error {response.status_code}: {response.text}")
-            raise
-        except Exception as e:
-            logger.error(f"[API] Error: {str(e)}")
-            raise
+            try:
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    headers=self.headers,
+                    timeout=10,
+                    stream=stream,
+                    **kwargs
+                )
+                
+                logger.info(f"[API] Response: {response.status_code}")
+                if not stream:
+                    logger.debug(f"[API] Response body: {response.text[:500]}")
+                
+                retry_after = freshservice_rate_limiter.update(response.status_code, response.headers)
+                if should_retry(method, response.status_code) and attempt < attempts:
+                    response.close()
+                    delay = backoff_delay(attempt)
+                    logger.warning(f"[API] {response.status_code} from FreshService, retry {attempt}/{attempts - 1} in {delay:.2f}s")
+                    time.sleep(delay)
+                    continue
+                if response.status_code == 429:
+                    raise RateLimitExceeded(f"FreshService rate limit exceeded for {method} {endpoint}", retry_after)
+                
+                response.raise_for_status()
+                return response
+            except requests.exceptions.ConnectionError as e:
+                logger.error(f"[API] Connection error: {str(e)}")
+                raise
+            except requests.exceptions.Timeout as e:
+                logger.error(f"[API] Timeout error: {str(e)}")
+                raise
+            except requests.exceptions.HTTPError as e:
+                logger.error(f"[API] HTTP error {response.status_code}: {response.text}")
+                raise
+            except RateLimitExceeded as e:
+                logger.error(f"[API] {str(e)}")
+                raise
+            except Exception as e:
+                logger.error(f"[API] Error: {str(e)}")
+                raise
+    
+    def _fetch_tickets_page(self, status: Optional[str], priority: Optional[str], group_id: Optional[int], page: int, per_page: int) -> Dict[str, Any]:
+        """Fetch one page of tickets, raising on failure"""
+        endpoint, params = build_tickets_query(status, priority, group_id, page, per_page)
+        response = self._request("GET", endpoint, params=params)
+        return build_tickets_page(response, page, per_page)
+    
+    def _fetch_tickets_page_with_retry(self, status: Optional[str], priority: Optional[str], group_id: Optional[int], page: int, per_page: int) -> Dict[str, Any]:
+        """Fetch one page of tickets, retrying before giving up"""
+        attempts = config.FRESHSERVICE_PAGE_RETRIES + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                return self._fetch_tickets_page(status, priority, group_id, page, per_page)
+            except Exception as e:
+                if attempt == attempts:
+                    logger.error(f"[TICKETS] Page {page} failed after {attempts} attempts: {str(e)}")
+                    raise
+                logger.warning(f"[TICKETS] Page {page} failed (attempt {attempt}/{attempts}), retrying: {str(e)}")
+                time.sleep(page_retry_delay(attempt))
+    
+    def get_tickets_page(self, status: Optional[str] = None, priority: Optional[str] = None, group_id: Optional[int] = None, page: int = 1, per_page: int = 100) -> Dict[str, Any]:
+        """
+        Get one page of tickets, raising on failure
+        
+        Unlike get_tickets, a failed request is never turned into an empty
+        page, so callers that cache pages can tell errors from no tickets.
+        
+        Raises:
+            RateLimitExceeded: If FreshService is still rate limiting after retries
+            Exception: If the request fails
+        """
+        logger.info(f"[TICKETS] Fetching tickets: status={status}, priority={priority}, group_id={group_id}, page={page}, per_page={per_page}")
+        return self._fetch_tickets_page(status, priority, group_id, page, per_page)
     
     def get_tickets(self, status: Optional[str] = None, priority: Optional[str] = None, group_id: Optional[int] = None, page: int = 1, per_page: int = 100) -> Dict[str, Any]:
-        """Get tickets with pagination support"""
+        """Get tickets with pagination support (an empty page on errors other than rate limiting)"""
         try:
-            logger.info(f"[TICKETS] Fetching tickets: status={status}, priority={priority}, group_id={group_id}, page={page}, per_page={per_page}")
-            params = {
-                "page": page,
-                "per_page": per_page
-            }
-            
-            endpoint = "/tickets"
-            if group_id:
-                params['query'] = f'"group_id:{group_id}"'
-                endpoint = "/tickets/filter"
-            
-            if status:
-                params['status'] = status
-            if priority:
-                params['priority'] = priority
-
-            response = self._request("GET", endpoint, params=params)
-            tickets = response.get("tickets", [])
-
-            total_count = response.get("total", None)
-            
-            logger.info(f"[TICKETS] Found {len(tickets)} tickets on page {page}, total: {total_count}")
-
-            if total_count is not None:
-                has_more = (page * per_page) < total_count
-            else:
-                has_more = len(tickets) >= per_page
-            
-            return {
-                "tickets": tickets,
-                "page": page,
-                "per_page": per_page,
-                "total": total_count or len(tickets),
-                "has_more": has_more
-            }
+            return self.get_tickets_page(status, priority, group_id, page, per_page)
+        except RateLimitExceeded:
+            # An empty page would look like "no tickets" to the dashboard
+            raise
         except Exception as e:
             logger.error(f"[TICKETS] Error getting tickets: {str(e)}")
-            return {
-                "tickets": [],
-                "page": page,
-                "per_page": per_page,
-                "total": 0,
-                "has_more": False
-            }
+            return empty_tickets_page(page, per_page)
 
     def get_all_tickets(self, status: Optional[str] = None, priority: Optional[str] = None, per_page: int = 100) -> List[Dict]:
-        """Get all tickets by fetching all pages"""
-        try:
-            logger.info(f"[TICKETS] Fetching ALL tickets: status={status}, priority={priority}")
-            all_tickets = []
+        """
+        Get all tickets by fetching all pages
+        
+        Once page 1 reports the total, the remaining pages are fetched
+        concurrently (FRESHSERVICE_PAGE_CONCURRENCY in flight) and
+        reassembled in page order. Without a total, pages are walked
+        one after another.
+        
+        Raises:
+            Exception: If a page still fails after FRESHSERVICE_PAGE_RETRIES retries
+        """
+        logger.info(f"[TICKETS] Fetching ALL tickets: status={status}, priority={priority}")
+        first = self._fetch_tickets_page_with_retry(status, priority, None, 1, per_page)
+        all_tickets = list(first["tickets"])
+        
+        remaining = remaining_pages(first, per_page)
+        if remaining is None:
             page = 1
-            
-            while True:
-                result = self.get_tickets(status=status, priority=priority, page=page, per_page=per_page)
-                tickets = result.get("tickets", [])
-                
-                if not tickets:
-                    break
-                
-                all_tickets.extend(tickets)
-                logger.info(f"[TICKETS] Fetched {len(all_tickets)} tickets total so far...")
-                
-                if not result.get("has_more", False):
-                    break
-                    
+            result = first
+            while result["tickets"] and result["has_more"]:
                 page += 1
+                result = self._fetch_tickets_page_with_retry(status, priority, None, page, per_page)
+                all_tickets.extend(result["tickets"])
+                logger.info(f"[TICKETS] Fetched {len(all_tickets)} tickets total so far...")
+        elif remaining:
+            logger.info(f"[TICKETS] Fetching {len(remaining)} more pages concurrently")
+            with ThreadPoolExecutor(max_workers=config.FRESHSERVICE_PAGE_CONCURRENCY) as executor:
+                pages = executor.map(
+                    lambda page: self._fetch_tickets_page_with_retry(status, priority, None, page, per_page),
+                    remaining
+                )
+                for result in pages:
+                    all_tickets.extend(result["tickets"])
+        
+        logger.info(f"[TICKETS] Total tickets fetched: {len(all_tickets)}")
+        return all_tickets
+
+    def iter_tickets(self, status: Optional[str] = None, priority: Optional[str] = None, group_id: Optional[int] = None, updated_since: Optional[str] = None, order_by: Optional[str] = None, order_type: Optional[str] = None, per_page: int = 100) -> Iterator[Dict]:
+        """
+        Stream tickets one at a time across all pages
+        
+        Each page body is decoded incrementally, so memory stays flat no
+        matter how many tickets the tenant has. Intended for bulk jobs
+        (exports, backfills, sync).
+        
+        Args:
+            status: Optional status filter
+            priority: Optional priority filter
+            group_id: Not supported; must be None (see Raises)
+            updated_since: Optional ISO timestamp; only tickets updated after it
+            order_by: Optional sort field (e.g. 'updated_at')
+            order_type: Optional sort direction ('asc' or 'desc')
+            per_page: Page size requested from FreshService
+        
+        Raises:
+            ValueError: If group_id is given. Group filtering goes through
+                /tickets/filter, which ignores per_page, updated_since and
+                ordering and stops after FILTER_MAX_PAGES pages; use
+                filter_tickets for it
+            Exception: If a page cannot be fetched or is cut off mid-stream
+        """
+        if group_id is not None:
+            raise ValueError("iter_tickets cannot filter by group; use filter_tickets")
+        logger.info(f"[TICKETS] Streaming tickets: status={status}, priority={priority}, updated_since={updated_since}")
+        page = 1
+        streamed = 0
+        
+        while True:
+            endpoint, params = build_tickets_query(status, priority, None, page, per_page)
+            if updated_since:
+                params["updated_since"] = updated_since
+            if order_by:
+                params["order_by"] = order_by
+            if order_type:
+                params["order_type"] = order_type
             
-            logger.info(f"[TICKETS] Total tickets fetched: {len(all_tickets)}")
-            return all_tickets
-        except Exception as e:
-            logger.error(f"[TICKETS] Error fetching all tickets: {str(e)}")
-            return []
+            fields: Dict[str, Any] = {}
+            count = 0
+            response = self._send_response("GET", endpoint, stream=True, params=params)
+            try:
+                for ticket in iter_array_items(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), "tickets", fields):
+                    count += 1
+                    yield ticket
+            finally:
+                response.close()
+            
+            streamed += count
+            total = fields.get("total")
+            if count < per_page or (total is not None and page * per_page >= total):
+                break
+            page += 1
+        
+        logger.info(f"[TICKETS] Streamed {streamed} tickets over {page} pages")
 
-    def get_ticket(self, ticket_id: str) -> Optional[Dict]:
-        """Get single ticket"""
+    def get_ticket(self, ticket_id: str, include: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        Get single ticket
+        
+        Args:
+            ticket_id: Ticket ID
+            include: Related objects to embed (conversations, requester, stats, ...);
+                embedded conversations are completed by paging when truncated
+        """
         try:
             logger.info(f"[TICKET] Fetching ticket: {ticket_id}")
-            response = self._request("GET", f"/tickets/{ticket_id}")
+            response = self._request("GET", f"/tickets/{ticket_id}", params=build_ticket_params(include))
             ticket = response.get("ticket")
             
             if ticket:
@@ -159,6 +435,8 @@ class FreshServiceIntegration:
                 logger.info(f"[TICKET] Subject: {ticket.get('subject', 'NO SUBJECT')[:100]}")
                 logger.info(f"[TICKET] Description present: {bool(ticket.get('description'))}")
                 logger.info(f"[TICKET] Description_text present: {bool(ticket.get('description_text'))}")
+                if conversations_truncated(ticket, include):
+                    ticket["conversations"] = self.get_ticket_conversations(ticket_id)
             else:
                 logger.warning(f"[TICKET] Ticket {ticket_id} not found in response")
             return ticket
@@ -182,12 +460,34 @@ class FreshServiceIntegration:
             logger.error(f"[SEARCH] Error searching tickets: {str(e)}")
             return []
     
-    def get_ticket_conversations(self, ticket_id: str) -> List[Dict]:
-        """Get ticket conversations"""
+    def filter_tickets(self, query: str, page: int = 1) -> Dict[str, Any]:
+        """
+        Get one page of /tickets/filter results
+        
+        Args:
+            query: Filter expression without the surrounding quotes
+            page: Page number (FILTER_PAGE_SIZE tickets per page)
+            
+        Raises:
+            Exception: If the request fails, so callers can tell errors from no results
+        """
+        logger.info(f"[FILTER] Filtering tickets: {query} (page {page})")
+        response = self._request("GET", "/tickets/filter", params={"query": f'"{query}"', "page": page})
+        return build_tickets_page(response, page, FILTER_PAGE_SIZE)
+    
+    def get_ticket_conversations(self, ticket_id: str, per_page: int = CONVERSATIONS_PER_PAGE) -> List[Dict]:
+        """Get all ticket conversations, following pagination until a short page"""
         try:
             logger.info(f"[CONVERSATIONS] Fetching conversations for ticket: {ticket_id}")
-            response = self._request("GET", f"/tickets/{ticket_id}/conversations")
-            conversations = response.get("conversations", [])
+            conversations = []
+            page = 1
+            while True:
+                response = self._request("GET", f"/tickets/{ticket_id}/conversations", params={"page": page, "per_page": per_page})
+                batch = response.get("conversations", [])
+                conversations.extend(batch)
+                if len(batch) < per_page:
+                    break
+                page += 1
             logger.info(f"[CONVERSATIONS] Found {len(conversations)} conversations")
             return conversations
         except Exception as e:
@@ -0,0 +1,171 @@
+"""
+FreshService Rate Limiter
+Process-wide token bucket paced by FreshService rate-limit headers
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Mapping, Dict, Any
+from config import config
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RateLimitExceeded(Exception):
+    """Raised when FreshService keeps answering 429 after all retries"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for a retry attempt (1-based)"""
+    ceiling = min(config.FRESHSERVICE_BACKOFF_BASE_SECONDS * (2 ** (attempt - 1)), config.FRESHSERVICE_BACKOFF_MAX_SECONDS)
+    return random.uniform(0, ceiling)
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket shared by every FreshService caller in the process
+
+    The bucket refills at the plan limit minus a headroom fraction.
+    Each response's X-RateLimit-Total / X-RateLimit-Remaining headers
+    resize and drain the bucket, so usage by other consumers of the
+    same account is accounted for. A 429 Retry-After pauses everyone.
+    """
+
+    def __init__(self, requests_per_minute: int, headroom: float):
+        """
+        Initialize rate limiter
+
+        Args:
+            requests_per_minute: Plan limit assumed until headers say otherwise
+            headroom: Fraction of the limit kept in reserve (0.0 - 1.0)
+        """
+        self.headroom = headroom
+        self.capacity = 0.0
+        self.refill_per_second = 0.0
+        self._set_limit(requests_per_minute)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+
+    def _set_limit(self, requests_per_minute: int):
+        """Apply a per-minute plan limit, keeping headroom in reserve"""
+        self.limit = requests_per_minute
+        self.capacity = max(requests_per_minute * (1 - self.headroom), 1.0)
+        self.refill_per_second = self.capacity / 60.0
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(self.blocked_until - now, 0.0)
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.refill_per_second)
+            if wait > 0:
+                self.throttled += 1
+            return wait
+
+    def acquire(self):
+        """Block the current thread until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug(f"[RATE_LIMIT] Throttling request for {wait:.2f}s")
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug(f"[RATE_LIMIT] Throttling request for {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+    def update(self, status_code: int, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Adjust the bucket from a FreshService response
+
+        Args:
+            status_code: HTTP status of the response
+            headers: Response headers
+
+        Returns:
+            Retry-After in seconds for a 429, otherwise None
+        """
+        total = headers.get("X-RateLimit-Total")
+        remaining = headers.get("X-RateLimit-Remaining")
+        retry_after = None
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if total and total.isdigit() and int(total) != self.limit:
+                logger.info(f"[RATE_LIMIT] Plan limit is {total}/min")
+                self._set_limit(int(total))
+                self.tokens = min(self.tokens, self.capacity)
+
+            if remaining and remaining.lstrip("-").isdigit():
+                reserve = self.limit * self.headroom
+                self.tokens = min(self.tokens, int(remaining) - reserve)
+
+            if status_code == 429:
+                self.rate_limited += 1
+                retry_after = parse_retry_after(headers.get("Retry-After"))
+                pause = retry_after if retry_after is not None else 60.0 / self.limit
+                self.blocked_until = max(self.blocked_until, now + pause)
+                self.tokens = min(self.tokens, 0.0)
+                logger.warning(f"[RATE_LIMIT] 429 received, pausing all FreshService calls for {pause:.1f}s")
+
+        return retry_after
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of limiter state for diagnostics"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "limit_per_minute": self.limit,
+                "effective_per_minute": round(self.capacity, 1),
+                "tokens": round(self.tokens, 2),
+                "headroom_ratio": round(max(self.tokens, 0.0) / self.capacity, 3),
+                "blocked_for_seconds": round(max(self.blocked_until - time.monotonic(), 0.0), 2),
+                "throttled_requests": self.throttled,
+                "rate_limited_responses": self.rate_limited
+            }
+
+
+# Global limiter shared by routes, polling and webhooks
+freshservice_rate_limiter = TokenBucketRateLimiter(
+    requests_per_minute=config.FRESHSERVICE_RATE_LIMIT_PER_MINUTE,
+    headroom=config.FRESHSERVICE_RATE_LIMIT_HEADROOM
+)
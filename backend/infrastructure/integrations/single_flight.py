@@ -0,0 +1,157 @@
+"""
+Single-Flight Request Coalescing
+Concurrent identical calls share one upstream call and its result
+"""
+import asyncio
+import copy
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight call that followers wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class _AsyncCall:
+    """An in-flight coroutine call that follower tasks wait on"""
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.followers = 0
+
+
+class _LeaderCancelled(Exception):
+    """Set on the shared future when the leading task was cancelled"""
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into a single execution
+
+    The first caller for a key (the leader) runs the call; callers that
+    arrive while it is in flight wait and receive a deep copy of the
+    leader's result, or its exception. When there were followers the
+    leader gets a copy too, so no caller can mutate what the others are
+    copying. Nothing is cached once the call completes. Works for
+    threads (do) and asyncio tasks (do_async).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], _AsyncCall] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.collapsed = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument callable performing the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                call.followers += 1
+                self.collapsed += 1
+
+        if not leader:
+            logger.debug(f"[SINGLE_FLIGHT] Joined in-flight {self.name} call: {key}")
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        # Nobody can join once the call is removed, so followers is final here
+        return copy.deepcopy(call.result) if call.followers else call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn once for all concurrent tasks with the same key
+
+        If the leading task is cancelled, its followers are not: they
+        start over and one of them becomes the new leader.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument coroutine function performing the call
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+
+        with self._lock:
+            call = self._async_calls.get(loop_key)
+            leader = call is None
+            if leader:
+                call = _AsyncCall(loop.create_future())
+                self._async_calls[loop_key] = call
+                self.executed += 1
+            else:
+                call.followers += 1
+                self.collapsed += 1
+
+        if not leader:
+            logger.debug(f"[SINGLE_FLIGHT] Joined in-flight {self.name} call: {key}")
+            try:
+                result = await asyncio.shield(call.future)
+            except _LeaderCancelled:
+                logger.debug(f"[SINGLE_FLIGHT] Leader of {self.name} call was cancelled, retrying: {key}")
+                return await self.do_async(key, fn)
+            return copy.deepcopy(result)
+
+        try:
+            result = await fn()
+            call.future.set_result(result)
+            # Followers only resume after this task yields, so followers is final here
+            return copy.deepcopy(result) if call.followers else result
+        except BaseException as e:
+            call.future.set_exception(_LeaderCancelled() if isinstance(e, asyncio.CancelledError) else e)
+            # Followers still see the exception; this only silences the
+            # "exception was never retrieved" warning when there are none
+            call.future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async_calls[loop_key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for executed and collapsed calls"""
+        with self._lock:
+            in_flight = len(self._calls) + len(self._async_calls)
+        total = self.executed + self.collapsed
+        return {
+            "executed": self.executed,
+            "collapsed": self.collapsed,
+            "in_flight": in_flight,
+            "collapse_ratio": round(self.collapsed / total, 3) if total else 0.0
+        }
+
+
+# Global coalescer shared by sync and async FreshService clients
+freshservice_single_flight = SingleFlight("freshservice")
@@ -0,0 +1,6 @@
+"""
+Search Infrastructure
+"""
+from .ticket_search_index import TicketSearchIndex, build_match_query, ticket_search_index
+
+__all__ = ["TicketSearchIndex", "build_match_query", "ticket_search_index"]
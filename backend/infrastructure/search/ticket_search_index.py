@@ -0,0 +1,276 @@
+"""
+Ticket Search Index
+Local SQLite FTS5 index over ticket subjects, descriptions and conversations
+"""
+import logging
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from config import config
+from ..shared.text import clean_html
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticket_docs (
+    ticket_id INTEGER PRIMARY KEY,
+    subject TEXT,
+    description TEXT,
+    conversations TEXT,
+    status INTEGER,
+    priority INTEGER,
+    group_id INTEGER,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS ticket_fts USING fts5(
+    subject, description, conversations,
+    content='ticket_docs', content_rowid='ticket_id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS ticket_docs_ai AFTER INSERT ON ticket_docs BEGIN
+    INSERT INTO ticket_fts(rowid, subject, description, conversations)
+    VALUES (new.ticket_id, new.subject, new.description, new.conversations);
+END;
+CREATE TRIGGER IF NOT EXISTS ticket_docs_ad AFTER DELETE ON ticket_docs BEGIN
+    INSERT INTO ticket_fts(ticket_fts, rowid, subject, description, conversations)
+    VALUES ('delete', old.ticket_id, old.subject, old.description, old.conversations);
+END;
+CREATE TRIGGER IF NOT EXISTS ticket_docs_au AFTER UPDATE ON ticket_docs
+WHEN old.subject IS NOT new.subject
+  OR old.description IS NOT new.description
+  OR old.conversations IS NOT new.conversations
+BEGIN
+    INSERT INTO ticket_fts(ticket_fts, rowid, subject, description, conversations)
+    VALUES ('delete', old.ticket_id, old.subject, old.description, old.conversations);
+    INSERT INTO ticket_fts(rowid, subject, description, conversations)
+    VALUES (new.ticket_id, new.subject, new.description, new.conversations);
+END;
+"""
+
+# Column weights for bm25: subject, description, conversations
+RANK_FUNCTION = "bm25(10.0, 3.0, 1.0)"
+
+UPSERT_SQL = """
+INSERT INTO ticket_docs (ticket_id, subject, description, conversations, status, priority, group_id, created_at, updated_at)
+VALUES (:ticket_id, :subject, :description, :conversations, :status, :priority, :group_id, :created_at, :updated_at)
+ON CONFLICT(ticket_id) DO UPDATE SET
+    subject = excluded.subject,
+    description = COALESCE(excluded.description, ticket_docs.description),
+    conversations = COALESCE(excluded.conversations, ticket_docs.conversations),
+    status = excluded.status,
+    priority = excluded.priority,
+    group_id = excluded.group_id,
+    created_at = COALESCE(excluded.created_at, ticket_docs.created_at),
+    updated_at = COALESCE(excluded.updated_at, ticket_docs.updated_at)
+"""
+
+# Rank at most `limit` matches, newest tickets first, then take a page
+RANKED_IDS_SQL = """
+SELECT id FROM (
+    SELECT rowid AS id, rank FROM ticket_fts
+    WHERE ticket_fts MATCH ?
+    ORDER BY rowid DESC
+    LIMIT ?
+)
+ORDER BY rank
+LIMIT ? OFFSET ?
+"""
+
+COUNT_SQL = "SELECT count(*) FROM (SELECT rowid FROM ticket_fts WHERE ticket_fts MATCH ? LIMIT ?)"
+
+PAGE_SQL = """
+SELECT d.ticket_id, d.subject, d.status, d.priority, d.group_id, d.created_at, d.updated_at,
+       snippet(ticket_fts, -1, '<mark>', '</mark>', '…', 12) AS snippet
+FROM ticket_fts
+JOIN ticket_docs d ON d.ticket_id = ticket_fts.rowid
+WHERE ticket_fts MATCH ? AND ticket_fts.rowid IN ({placeholders})
+"""
+
+# Shorter trailing words are matched whole; one-letter prefixes hit most of the index
+MIN_PREFIX_LENGTH = 2
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression
+
+    Every word must match, the last one as a prefix so results follow
+    the user as they type. Words are quoted, so FTS5 operators in the
+    input are treated as plain text.
+
+    Returns:
+        MATCH expression, or None when the query has no searchable words
+    """
+    tokens = _TOKEN.findall(query.lower())
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    if len(tokens[-1]) >= MIN_PREFIX_LENGTH:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+class TicketSearchIndex:
+    """
+    Full-text index of tickets in a local SQLite database
+
+    Writes are serialised with a lock; each thread reads through its own
+    connection, so searches run in parallel with indexing (WAL mode).
+    """
+
+    def __init__(self, path: str, max_candidates: int = 2000):
+        self.path = path
+        self.max_candidates = max_candidates
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            if not self._schema_ready:
+                with self._write_lock:
+                    conn.executescript(SCHEMA)
+                    conn.execute("INSERT INTO ticket_fts(ticket_fts, rank) VALUES ('rank', ?)", (RANK_FUNCTION,))
+                    conn.commit()
+                    self._schema_ready = True
+        return conn
+
+    @staticmethod
+    def _to_doc(ticket: Dict[str, Any], conversations: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        description = None
+        if ticket.get("description") is not None:
+            description = clean_html(ticket["description"])
+        elif ticket.get("description_text") is not None:
+            description = ticket["description_text"]
+
+        conversation_text = None
+        if conversations is not None:
+            conversation_text = "\n".join(
+                clean_html(c.get("body") or "") or (c.get("body_text") or "") for c in conversations
+            )
+
+        return {
+            "ticket_id": ticket.get("id"),
+            "subject": ticket.get("subject") or "",
+            "description": description,
+            "conversations": conversation_text,
+            "status": ticket.get("status"),
+            "priority": ticket.get("priority"),
+            "group_id": ticket.get("group_id"),
+            "created_at": ticket.get("created_at"),
+            "updated_at": ticket.get("updated_at")
+        }
+
+    def index_tickets(self, tickets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add or refresh tickets in one transaction
+
+        Fields a ticket dict lacks (e.g. the description on list pages)
+        keep their indexed value.
+
+        Returns:
+            Number of tickets indexed
+        """
+        docs = [doc for doc in (self._to_doc(t) for t in tickets) if doc["ticket_id"]]
+        if not docs:
+            return 0
+        conn = self._connection()
+        with self._write_lock, conn:
+            conn.executemany(UPSERT_SQL, docs)
+        logger.debug(f"[SEARCH] Indexed {len(docs)} tickets")
+        return len(docs)
+
+    def index_ticket(self, ticket: Dict[str, Any], conversations: Optional[List[Dict[str, Any]]] = None):
+        """Add or refresh one ticket, optionally with its conversation bodies"""
+        doc = self._to_doc(ticket, conversations)
+        if not doc["ticket_id"]:
+            return
+        conn = self._connection()
+        with self._write_lock, conn:
+            conn.execute(UPSERT_SQL, doc)
+
+    def delete_tickets(self, ticket_ids: Iterable[int]) -> int:
+        """Remove tickets from the index"""
+        ids = [(int(ticket_id),) for ticket_id in ticket_ids]
+        if not ids:
+            return 0
+        conn = self._connection()
+        with self._write_lock, conn:
+            conn.executemany("DELETE FROM ticket_docs WHERE ticket_id = ?", ids)
+        return len(ids)
+
+    def count(self) -> int:
+        """Number of indexed tickets"""
+        return self._connection().execute("SELECT count(*) FROM ticket_docs").fetchone()[0]
+
+    def search(self, query: str, page: int = 1, per_page: int = 30) -> Dict[str, Any]:
+        """
+        Ranked search with prefix matching
+
+        Subject matches weigh most, then description, then conversations.
+        Very broad queries rank only the newest max_candidates matches,
+        which keeps latency flat as the index grows; total is capped the
+        same way.
+
+        Args:
+            query: Free-text query
+            page: Page number
+            per_page: Results per page
+
+        Returns:
+            Page of results with pagination fields
+        """
+        match = build_match_query(query)
+        if not match:
+            return {"results": [], "page": page, "per_page": per_page, "total": 0, "has_more": False}
+
+        conn = self._connection()
+        offset = (page - 1) * per_page
+        ids = [
+            row[0] for row in
+            conn.execute(RANKED_IDS_SQL, (match, self.max_candidates, per_page, offset)).fetchall()
+        ]
+        if page == 1 and len(ids) < per_page:
+            total = len(ids)
+        else:
+            total = conn.execute(COUNT_SQL, (match, self.max_candidates)).fetchone()[0]
+
+        rows = {}
+        if ids:
+            sql = PAGE_SQL.format(placeholders=",".join("?" * len(ids)))
+            rows = {row["ticket_id"]: row for row in conn.execute(sql, (match, *ids)).fetchall()}
+
+        results = [
+            {
+                "id": row["ticket_id"],
+                "subject": row["subject"],
+                "status": row["status"],
+                "priority": row["priority"],
+                "group_id": row["group_id"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+                "snippet": row["snippet"]
+            }
+            for row in (rows.get(ticket_id) for ticket_id in ids) if row is not None
+        ]
+        return {
+            "results": results,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "has_more": (page * per_page) < total
+        }
+
+
+# Global index shared by sync, routes and use cases
+ticket_search_index = TicketSearchIndex(config.TICKET_SEARCH_INDEX_PATH, config.TICKET_SEARCH_MAX_CANDIDATES)
@@ -1,7 +1,54 @@
 """
 Shared Infrastructure Components
 """
-from .database_config import get_db, init_db
-from .database_models import TicketCache, AnalysisLog
+from .database_config import get_db, init_db, migrate_db
+from .database_models import TicketCache, AnalysisLog, SyncState, WorkerLease, AnalysisJob, TicketAnalysisRecord
+from .ticket_cache_repository import TicketCacheRepository, get_sync_state, set_sync_state
+from .http_pool import get_session, get_async_client, close_sessions, aclose_async_clients, get_pool_stats
+from .json_stream import JSONArrayStreamParser, JSONObjectFieldParser, iter_array_items
+from .analysis_job_repository import AnalysisJobRepository, JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_DEAD
+from .ticket_analysis_repository import TicketAnalysisRepository
+from .analysis_cache import AnalysisResultCache, analysis_result_cache
+from .rolling_dedup import RollingWindowDedup
+from .worker_registry import WorkerRegistry, new_worker_id
+from .consistent_hash import ConsistentHashRing
+from .swr_cache import StaleWhileRevalidateCache, CACHE_FRESH, CACHE_STALE, CACHE_MISS
 
-__all__ = ["get_db", "init_db", "TicketCache", "AnalysisLog"]
+__all__ = [
+    "get_db",
+    "init_db",
+    "migrate_db",
+    "TicketCache",
+    "AnalysisLog",
+    "SyncState",
+    "WorkerLease",
+    "AnalysisJob",
+    "TicketAnalysisRecord",
+    "TicketCacheRepository",
+    "get_sync_state",
+    "set_sync_state",
+    "get_session",
+    "get_async_client",
+    "close_sessions",
+    "aclose_async_clients",
+    "get_pool_stats",
+    "JSONArrayStreamParser",
+    "JSONObjectFieldParser",
+    "iter_array_items",
+    "AnalysisJobRepository",
+    "JOB_PENDING",
+    "JOB_RUNNING",
+    "JOB_DONE",
+    "JOB_DEAD",
+    "TicketAnalysisRepository",
+    "AnalysisResultCache",
+    "analysis_result_cache",
+    "RollingWindowDedup",
+    "WorkerRegistry",
+    "new_worker_id",
+    "ConsistentHashRing",
+    "StaleWhileRevalidateCache",
+    "CACHE_FRESH",
+    "CACHE_STALE",
+    "CACHE_MISS"
+]
@@ -0,0 +1,118 @@
+"""
+Analysis Result Cache
+Content-addressed cache of model analyses, in memory and in analysis_logs
+"""
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy.exc import IntegrityError
+from config import config
+from .database_config import SessionLocal
+from .database_models import AnalysisLog
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisResultCache:
+    """
+    Analyses keyed by analysis_cache_key (content, prompt version, model)
+
+    Recently used results are kept in an in-memory LRU of max_entries;
+    misses fall through to analysis_logs, which holds every result and
+    is shared by all processes and restarts. Without a session_factory
+    the cache is memory only. Database errors are logged and treated as
+    misses, since the cache must never fail an analysis.
+    """
+
+    def __init__(self, max_entries: int = 1000, session_factory=SessionLocal):
+        self.max_entries = max_entries
+        self.session_factory = session_factory
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = {"memory": 0, "database": 0}
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached analysis for a key, if any"""
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+                self.hits["memory"] += 1
+                return analysis
+
+        analysis = self._load(key)
+        if analysis is None:
+            self.misses += 1
+            return None
+        self.hits["database"] += 1
+        self._remember(key, analysis)
+        return analysis
+
+    def put(self, key: str, analysis: Dict[str, Any], ticket_id: Any = None, prompt_version: str = None, model_id: str = None):
+        """Cache an analysis, replacing any previous result for the key"""
+        self._remember(key, analysis)
+        if self.session_factory is None:
+            return
+        try:
+            self._save(key, analysis, ticket_id, prompt_version, model_id)
+        except Exception as e:
+            logger.warning(f"[CACHE] ⚠️  Could not persist analysis for ticket {ticket_id}: {str(e)}")
+
+    def _remember(self, key: str, analysis: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = analysis
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.session_factory is None:
+            return None
+        try:
+            with self.session_factory() as db:
+                record = db.query(AnalysisLog).filter(AnalysisLog.content_hash == key).first()
+                return json.loads(record.result) if record and record.result else None
+        except Exception as e:
+            logger.warning(f"[CACHE] ⚠️  Could not read cached analysis: {str(e)}")
+            return None
+
+    def _save(self, key: str, analysis: Dict[str, Any], ticket_id: Any, prompt_version: str, model_id: str):
+        categories = analysis.get("possible_categories") or []
+        values = {
+            "ticket_id": int(ticket_id) if str(ticket_id).isdigit() else None,
+            "summary": analysis.get("summary"),
+            "classification": (categories[0].get("category") if categories and isinstance(categories[0], dict) else None),
+            "automation_opportunities": json.dumps(analysis.get("possible_automations") or []),
+            "prompt_version": prompt_version,
+            "model_id": model_id,
+            "result": json.dumps(analysis),
+            "updated_at": datetime.utcnow()
+        }
+        with self.session_factory() as db:
+            updated = db.query(AnalysisLog).filter(AnalysisLog.content_hash == key).update(
+                values, synchronize_session=False
+            )
+            if not updated:
+                db.add(AnalysisLog(content_hash=key, created_at=values["updated_at"], **values))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another process stored the same key first; both results are equivalent
+                db.rollback()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count and hit/miss counters"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": dict(self.hits),
+            "misses": self.misses
+        }
+
+
+# Global analysis cache shared by every TicketAnalyzer in the process
+analysis_result_cache = AnalysisResultCache(config.ANALYSIS_CACHE_MAX_ENTRIES)
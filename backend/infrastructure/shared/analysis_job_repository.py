@@ -0,0 +1,285 @@
+"""
+Analysis Job Repository
+Durable queue of ticket analyses stored in analysis_jobs
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any
+from sqlalchemy import func
+from .database_config import SessionLocal
+from .database_models import AnalysisJob
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_DEAD = "dead"
+
+CLAIM_ATTEMPTS = 5
+
+
+class AnalysisJobRepository:
+    """
+    Job queue with visibility timeouts on top of the analysis_jobs table
+
+    A claimed job is hidden for visibility_timeout seconds. If the worker
+    neither completes nor fails it in that time (e.g. the process died),
+    another worker claims it again. Failures are retried with exponential
+    backoff; a job out of attempts is moved to the dead-letter state.
+    """
+
+    def __init__(
+        self,
+        visibility_timeout: float,
+        max_attempts: int,
+        retry_base_seconds: float,
+        retry_max_seconds: float,
+        session_factory=SessionLocal
+    ):
+        self.visibility_timeout = timedelta(seconds=visibility_timeout)
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _to_dict(job: AnalysisJob) -> Dict[str, Any]:
+        return {
+            "id": job.id,
+            "ticket_id": job.ticket_id,
+            "group_id": job.group_id,
+            "source": job.source,
+            "ticket": json.loads(job.ticket) if job.ticket else None,
+            "status": job.status,
+            "attempts": job.attempts,
+            "last_error": job.last_error,
+            "created_at": job.created_at.isoformat() if job.created_at else None
+        }
+
+    def enqueue(
+        self,
+        ticket_id: str,
+        group_id: Optional[str] = None,
+        source: str = "webhook",
+        ticket: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Add a job that is claimable immediately
+
+        Args:
+            ticket_id: FreshService ticket ID
+            group_id: Group that owns the ticket
+            source: What triggered the analysis
+            ticket: Ticket data to analyze instead of fetching it
+
+        Returns:
+            ID of the new job
+        """
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            job = AnalysisJob(
+                ticket_id=str(ticket_id),
+                group_id=str(group_id) if group_id is not None else None,
+                source=source,
+                ticket=json.dumps(ticket) if ticket else None,
+                status=JOB_PENDING,
+                attempts=0,
+                available_at=now,
+                created_at=now
+            )
+            db.add(job)
+            db.commit()
+            return job.id
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next available job for a worker
+
+        Groups take turns: the job comes from the group with the fewest
+        jobs running right now, oldest first within the group, so a
+        backlog in one group does not hold up the others. Jobs whose
+        visibility timeout ran out while running are claimable again, or
+        dead-lettered if they have no attempts left. The claim is a
+        conditional update, so two workers never get the same job.
+
+        Returns:
+            The claimed job, or None if nothing is available
+        """
+        for _ in range(CLAIM_ATTEMPTS):
+            now = datetime.utcnow()
+            with self.session_factory() as db:
+                abandoned = db.query(AnalysisJob).filter(
+                    AnalysisJob.status == JOB_RUNNING,
+                    AnalysisJob.available_at <= now,
+                    AnalysisJob.attempts >= self.max_attempts
+                ).update({
+                    AnalysisJob.status: JOB_DEAD,
+                    AnalysisJob.last_error: "Visibility timeout expired on the last attempt",
+                    AnalysisJob.locked_by: None,
+                    AnalysisJob.finished_at: now
+                }, synchronize_session=False)
+                if abandoned:
+                    logger.warning(f"[JOBS] ⚠️  Dead-lettered {abandoned} jobs abandoned on their last attempt")
+
+                ready = (
+                    AnalysisJob.status.in_([JOB_PENDING, JOB_RUNNING]),
+                    AnalysisJob.available_at <= now
+                )
+                heads = db.query(AnalysisJob.group_id, func.min(AnalysisJob.available_at)).filter(
+                    *ready
+                ).group_by(AnalysisJob.group_id).all()
+                if not heads:
+                    db.commit()
+                    return None
+
+                running = dict(db.query(AnalysisJob.group_id, func.count(AnalysisJob.id)).filter(
+                    AnalysisJob.status == JOB_RUNNING,
+                    AnalysisJob.available_at > now
+                ).group_by(AnalysisJob.group_id).all())
+                group_id, _ = min(heads, key=lambda head: (running.get(head[0], 0), head[1]))
+
+                candidate = db.query(AnalysisJob.id).filter(
+                    *ready,
+                    AnalysisJob.group_id.is_(None) if group_id is None else AnalysisJob.group_id == group_id
+                ).order_by(AnalysisJob.available_at, AnalysisJob.id).first()
+                if candidate is None:
+                    db.commit()
+                    continue
+
+                claimed = db.query(AnalysisJob).filter(
+                    AnalysisJob.id == candidate.id,
+                    AnalysisJob.status.in_([JOB_PENDING, JOB_RUNNING]),
+                    AnalysisJob.available_at <= now
+                ).update({
+                    AnalysisJob.status: JOB_RUNNING,
+                    AnalysisJob.locked_by: worker_id,
+                    AnalysisJob.attempts: AnalysisJob.attempts + 1,
+                    AnalysisJob.available_at: now + self.visibility_timeout
+                }, synchronize_session=False)
+                db.commit()
+
+                if claimed:
+                    return self._to_dict(db.get(AnalysisJob, candidate.id))
+            # Another worker won the race for this job; try the next one
+        return None
+
+    def complete(self, job_id: int, worker_id: str) -> bool:
+        """Mark a claimed job done (False if the claim was lost to a timeout)"""
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            updated = db.query(AnalysisJob).filter(
+                AnalysisJob.id == job_id,
+                AnalysisJob.status == JOB_RUNNING,
+                AnalysisJob.locked_by == worker_id
+            ).update({
+                AnalysisJob.status: JOB_DONE,
+                AnalysisJob.locked_by: None,
+                AnalysisJob.last_error: None,
+                AnalysisJob.finished_at: now
+            }, synchronize_session=False)
+            db.commit()
+        return bool(updated)
+
+    def retry_delay(self, attempts: int) -> float:
+        """Backoff before the next attempt after `attempts` failures"""
+        return min(self.retry_base_seconds * (2 ** (attempts - 1)), self.retry_max_seconds)
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> Optional[str]:
+        """
+        Record a failed attempt of a claimed job
+
+        Returns:
+            The job's new status (pending for a retry, dead when out of
+            attempts), or None if the claim was lost to a timeout
+        """
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            job = db.query(AnalysisJob).filter(
+                AnalysisJob.id == job_id,
+                AnalysisJob.status == JOB_RUNNING,
+                AnalysisJob.locked_by == worker_id
+            ).first()
+            if job is None:
+                return None
+
+            job.last_error = error[:2000]
+            job.locked_by = None
+            if job.attempts >= self.max_attempts:
+                job.status = JOB_DEAD
+                job.finished_at = now
+            else:
+                job.status = JOB_PENDING
+                job.available_at = now + timedelta(seconds=self.retry_delay(job.attempts))
+            status = job.status
+            db.commit()
+        return status
+
+    def release(self, job_id: int, worker_id: str):
+        """Return a claimed job to the queue without using up an attempt (shutdown)"""
+        with self.session_factory() as db:
+            db.query(AnalysisJob).filter(
+                AnalysisJob.id == job_id,
+                AnalysisJob.status == JOB_RUNNING,
+                AnalysisJob.locked_by == worker_id
+            ).update({
+                AnalysisJob.status: JOB_PENDING,
+                AnalysisJob.locked_by: None,
+                AnalysisJob.attempts: AnalysisJob.attempts - 1,
+                AnalysisJob.available_at: datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+
+    def purge_finished(self, older_than: timedelta) -> int:
+        """Delete done jobs finished before the retention window"""
+        cutoff = datetime.utcnow() - older_than
+        with self.session_factory() as db:
+            deleted = db.query(AnalysisJob).filter(
+                AnalysisJob.status == JOB_DONE,
+                AnalysisJob.finished_at < cutoff
+            ).delete(synchronize_session=False)
+            db.commit()
+        if deleted:
+            logger.info(f"[JOBS] Purged {deleted} finished jobs")
+        return deleted
+
+    def outstanding_by_group(self) -> Dict[Optional[str], int]:
+        """Pending and running jobs per group (retries waiting out a backoff included)"""
+        with self.session_factory() as db:
+            return dict(db.query(AnalysisJob.group_id, func.count(AnalysisJob.id)).filter(
+                AnalysisJob.status.in_([JOB_PENDING, JOB_RUNNING])
+            ).group_by(AnalysisJob.group_id).all())
+
+    def get_dead_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recently dead-lettered jobs"""
+        with self.session_factory() as db:
+            jobs = (
+                db.query(AnalysisJob)
+                .filter(AnalysisJob.status == JOB_DEAD)
+                .order_by(AnalysisJob.finished_at.desc())
+                .limit(limit)
+                .all()
+            )
+            return [self._to_dict(job) for job in jobs]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth per status and age of the oldest waiting job"""
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            counts = dict(
+                db.query(AnalysisJob.status, func.count(AnalysisJob.id)).group_by(AnalysisJob.status).all()
+            )
+            ready = db.query(func.count(AnalysisJob.id), func.min(AnalysisJob.created_at)).filter(
+                AnalysisJob.status == JOB_PENDING,
+                AnalysisJob.available_at <= now
+            ).one()
+
+        return {
+            "ready": ready[0],
+            "delayed": counts.get(JOB_PENDING, 0) - ready[0],  # Waiting out a retry backoff
+            "running": counts.get(JOB_RUNNING, 0),
+            "done": counts.get(JOB_DONE, 0),
+            "dead": counts.get(JOB_DEAD, 0),
+            "oldest_ready_age_seconds": round((now - ready[1]).total_seconds(), 1) if ready[1] else 0.0
+        }
@@ -0,0 +1,39 @@
+"""
+Consistent Hashing
+Stable assignment of keys to a changing set of nodes
+"""
+import bisect
+import hashlib
+from typing import Dict, Hashable, Iterable, List, Optional
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class ConsistentHashRing:
+    """
+    Hash ring with virtual nodes
+
+    Each node owns the arcs before its `replicas` points on the ring.
+    When a node joins or leaves, only the keys on its arcs move, so
+    work is rebalanced with minimal churn. Every process building a ring
+    from the same nodes gets the same assignment.
+    """
+
+    def __init__(self, nodes: Iterable[str], replicas: int = 100):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        for node in nodes:
+            for replica in range(replicas):
+                point = _hash(f"{node}#{replica}")
+                self._owners[point] = node
+                bisect.insort(self._points, point)
+
+    def get_node(self, key: Hashable) -> Optional[str]:
+        """Node owning a key, or None for an empty ring"""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(str(key))) % len(self._points)
+        return self._owners[self._points[index]]
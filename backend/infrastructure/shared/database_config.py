@@ -2,7 +2,7 @@
 Database Configuration
 """
 import logging
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from config import config
 
@@ -26,11 +26,51 @@ def get_db():
         db.close()
 
 
+def migrate_db(bind, metadata):
+    """
+    Add columns and indexes that create_all skips on existing tables
+
+    create_all only creates missing tables, so columns added to a model
+    later (e.g. analysis_logs.content_hash) would never reach an existing
+    database. New columns are added as nullable, which every model column
+    added since the first release is.
+
+    Args:
+        bind: Engine to migrate
+        metadata: MetaData of the models
+
+    Returns:
+        List of "table.column" names that were added
+    """
+    inspector = inspect(bind)
+    preparer = bind.dialect.identifier_preparer
+    added = []
+    with bind.begin() as connection:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                connection.execute(text(
+                    f"ALTER TABLE {preparer.quote(table.name)} ADD COLUMN {preparer.quote(column.name)} {column_type}"
+                ))
+                added.append(f"{table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+    for name in added:
+        logger.info(f"[DB] ➕ Added column {name}")
+    return added
+
+
 def init_db():
     """Initialize database"""
     try:
         from .database_models import Base as ModelsBase
         ModelsBase.metadata.create_all(bind=engine)
+        migrate_db(engine, ModelsBase.metadata)
         logger.info("✅ Database initialized successfully")
     except Exception as e:
         logger.error(f"❌ Database initialization error: {str(e)}")
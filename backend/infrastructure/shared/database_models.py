@@ -1,7 +1,7 @@
 """
 Database Models and Repository
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -18,8 +18,10 @@ class TicketCache(Base):
     status = Column(String(50))
     priority = Column(String(50))
     requester_id = Column(Integer)
+    group_id = Column(Integer, index=True)
     description = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    payload = Column(Text)  # Full ticket JSON as returned by FreshService
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     cached_at = Column(DateTime, default=datetime.utcnow)
 
@@ -33,5 +35,62 @@ class AnalysisLog(Base):
     summary = Column(Text)
     classification = Column(String(100))
     automation_opportunities = Column(Text)
+    content_hash = Column(String(64), unique=True, index=True)  # analysis_cache_key
+    prompt_version = Column(String(20))
+    model_id = Column(String(200))
+    result = Column(Text)  # Full analysis JSON as returned by the model
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SyncState(Base):
+    """Persisted key/value state for background jobs (e.g. sync watermarks)"""
+    __tablename__ = "sync_state"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(100), unique=True, index=True)
+    value = Column(Text)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class WorkerLease(Base):
+    """Liveness lease of a background worker process, renewed by heartbeats"""
+    __tablename__ = "worker_leases"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    worker_id = Column(String(100), unique=True, index=True)
+    hostname = Column(String(255))
+    started_at = Column(DateTime, default=datetime.utcnow)
+    heartbeat_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, index=True)
+
+
+class AnalysisJob(Base):
+    """Queued ticket analysis, claimed by workers with a visibility timeout"""
+    __tablename__ = "analysis_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    ticket_id = Column(String(50), index=True)
+    group_id = Column(String(50))
+    source = Column(String(50))  # webhook, manual, ...
+    ticket = Column(Text)  # Ticket JSON sent with the event, when it has the analyzed fields
+    status = Column(String(20), index=True)  # pending, running, done, dead
+    attempts = Column(Integer, default=0)
+    available_at = Column(DateTime, index=True)  # Claimable from (retry delay or visibility timeout)
+    locked_by = Column(String(100))
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime)
+
+
+class TicketAnalysisRecord(Base):
+    """Slack notification claim for one version of a ticket's content, shared by every trigger"""
+    __tablename__ = "ticket_analyses"
+    __table_args__ = (UniqueConstraint("ticket_id", "content_hash", name="uq_ticket_analyses_ticket_content"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    ticket_id = Column(String(50), index=True)
+    content_hash = Column(String(64))  # sha256 of the analyzed subject and description
+    notified_at = Column(DateTime)  # Slack notification claimed
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,108 @@
+"""
+Shared HTTP Connection Pools
+Process-wide keep-alive sessions and async clients, one per upstream host
+"""
+import logging
+import threading
+from typing import Dict, Any
+from urllib.parse import urlsplit
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from config import config
+
+logger = logging.getLogger(__name__)
+
+_sessions: Dict[str, requests.Session] = {}
+_async_clients: Dict[str, httpx.AsyncClient] = {}
+_lock = threading.Lock()
+
+
+def get_session(base_url: str) -> requests.Session:
+    """
+    Get the pooled session for the host of a URL
+
+    Sessions are created on first use and reused by every client
+    talking to the same host, so TCP+TLS connections are kept alive.
+
+    Args:
+        base_url: Any URL on the target host
+
+    Returns:
+        Shared requests session for that host
+    """
+    host = urlsplit(base_url).netloc
+    session = _sessions.get(host)
+    if session is not None:
+        return session
+
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            pool_size = config.HTTP_POOL_MAXSIZE
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+            logger.info(f"[HTTP] Connection pool created for {host} (maxsize={pool_size})")
+    return session
+
+
+def get_async_client(base_url: str) -> httpx.AsyncClient:
+    """
+    Get the pooled async client for the host of a URL
+
+    Args:
+        base_url: Any URL on the target host
+
+    Returns:
+        Shared httpx async client for that host
+    """
+    host = urlsplit(base_url).netloc
+    client = _async_clients.get(host)
+    if client is not None and not client.is_closed:
+        return client
+
+    with _lock:
+        client = _async_clients.get(host)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(
+                max_connections=config.HTTP_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=config.HTTP_POOL_MAXSIZE
+            )
+            # Requests beyond max_connections queue for a free connection
+            timeout = httpx.Timeout(10.0, pool=60.0)
+            client = httpx.AsyncClient(limits=limits, timeout=timeout)
+            _async_clients[host] = client
+            logger.info(f"[HTTP] Async connection pool created for {host} (max_connections={config.HTTP_ASYNC_MAX_CONNECTIONS})")
+    return client
+
+
+def close_sessions():
+    """Close every pooled session (called on application shutdown)"""
+    with _lock:
+        for host, session in _sessions.items():
+            session.close()
+            logger.info(f"[HTTP] Connection pool closed for {host}")
+        _sessions.clear()
+
+
+async def aclose_async_clients():
+    """Close every pooled async client (called on application shutdown)"""
+    with _lock:
+        clients = list(_async_clients.items())
+        _async_clients.clear()
+    for host, client in clients:
+        await client.aclose()
+        logger.info(f"[HTTP] Async connection pool closed for {host}")
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get the hosts that currently have a pooled session or async client"""
+    return {
+        "hosts": sorted(_sessions.keys()),
+        "async_hosts": sorted(_async_clients.keys()),
+        "pool_maxsize": config.HTTP_POOL_MAXSIZE,
+        "async_max_connections": config.HTTP_ASYNC_MAX_CONNECTIONS
+    }
@@ -0,0 +1,243 @@
+"""
+Incremental JSON Decoding
+Decode large JSON responses chunk by chunk without holding the whole body
+"""
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayStreamParser:
+    """
+    Push parser for a top-level JSON object holding one large array
+
+    Feed raw chunks as they arrive; every element of the array under
+    `key` is returned as soon as it is complete and then dropped from
+    the buffer. Other top-level fields (e.g. "total") are collected in
+    `fields`. Memory is bounded by the largest single element.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.fields: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = "start"
+        self._current_key = None
+        self._eof = False
+
+    def feed(self, chunk: Union[bytes, str]) -> List[Any]:
+        """Add a chunk and return the array elements completed by it"""
+        if isinstance(chunk, bytes):
+            chunk = self._utf8.decode(chunk)
+        self._buffer += chunk
+        return self._parse()
+
+    def close(self) -> List[Any]:
+        """Signal end of input and return any remaining elements"""
+        self._buffer += self._utf8.decode(b"", final=True)
+        self._eof = True
+        items = self._parse()
+        if self._state != "done":
+            raise ValueError(f"Truncated JSON stream (state: {self._state})")
+        return items
+
+    def _skip_whitespace(self):
+        stripped = self._buffer.lstrip(_WHITESPACE)
+        self._buffer = stripped
+
+    def _expect(self, char: str) -> bool:
+        """Consume a structural character; False if more input is needed"""
+        self._skip_whitespace()
+        if not self._buffer:
+            return False
+        if self._buffer[0] != char:
+            raise ValueError(f"Expected '{char}' in JSON stream, got '{self._buffer[0]}'")
+        self._buffer = self._buffer[1:]
+        return True
+
+    def _decode_value(self):
+        """Decode one complete value from the buffer, or return (False, None)"""
+        self._skip_whitespace()
+        if not self._buffer:
+            return False, None
+        try:
+            value, end = self._decoder.raw_decode(self._buffer)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            return False, None
+        # A number or literal ending exactly at the buffer edge may continue
+        if end == len(self._buffer) and not self._eof:
+            return False, None
+        self._buffer = self._buffer[end:]
+        return True, value
+
+    def _parse(self) -> List[Any]:
+        items = []
+        while True:
+            self._skip_whitespace()
+            if self._state == "done" or not self._buffer:
+                return items
+
+            head = self._buffer[0]
+            if self._state == "start":
+                if not self._expect("{"):
+                    return items
+                self._state = "key"
+            elif self._state == "key":
+                if head == "}":
+                    self._buffer = self._buffer[1:]
+                    self._state = "done"
+                    continue
+                complete, key = self._decode_value()
+                if not complete:
+                    return items
+                self._current_key = key
+                self._state = "colon"
+            elif self._state == "colon":
+                self._expect(":")
+                self._state = "value"
+            elif self._state == "value":
+                if self._current_key == self.key and head == "[":
+                    self._buffer = self._buffer[1:]
+                    self._state = "array_first"
+                    continue
+                complete, value = self._decode_value()
+                if not complete:
+                    return items
+                self.fields[self._current_key] = value
+                self._state = "after_value"
+            elif self._state in ("array_first", "array_item"):
+                if head == "]":
+                    self._buffer = self._buffer[1:]
+                    self._state = "after_value"
+                    continue
+                if self._state == "array_item":
+                    self._expect(",")
+                    self._state = "array_element"
+                    continue
+                self._state = "array_element"
+            elif self._state == "array_element":
+                complete, value = self._decode_value()
+                if not complete:
+                    return items
+                items.append(value)
+                self._state = "array_item"
+            elif self._state == "after_value":
+                if head == "}":
+                    self._buffer = self._buffer[1:]
+                    self._state = "done"
+                    continue
+                self._expect(",")
+                self._state = "key"
+
+
+def iter_array_items(chunks: Iterable[Union[bytes, str]], key: str, fields: Dict[str, Any] = None) -> Iterator[Any]:
+    """
+    Yield elements of the top-level array `key` from a chunked JSON object
+
+    Args:
+        chunks: Raw body chunks (e.g. response.iter_content())
+        key: Name of the array field to stream
+        fields: Optional dict that receives the other top-level fields
+    """
+    parser = JSONArrayStreamParser(key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+    if fields is not None:
+        fields.update(parser.fields)
+
+
+class JSONObjectFieldParser:
+    """
+    Push parser emitting the top-level fields of a JSON object as they complete
+
+    Meant for model output streamed token by token: text before the
+    opening brace (prose, a ```json fence) is skipped, and each
+    (key, value) pair is returned as soon as its value is complete, so
+    callers can show the summary while later fields are still generating.
+    Anything after the closing brace is ignored.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = "start"
+        self._current_key = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing brace of the object was seen"""
+        return self._state == "done"
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add text and return the fields completed by it"""
+        if self._state == "done":
+            return []
+        self._buffer += chunk
+        return self._parse()
+
+    def _decode_value(self, final_chars: str):
+        """Decode one value; scalars are only complete once a delimiter follows"""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer)
+        except json.JSONDecodeError:
+            return False, None
+        rest = self._buffer[end:].lstrip(_WHITESPACE)
+        if not rest or rest[0] not in final_chars:
+            return False, None
+        self._buffer = self._buffer[end:]
+        return True, value
+
+    def _parse(self) -> List[Tuple[str, Any]]:
+        fields = []
+        while True:
+            if self._state == "start":
+                start = self._buffer.find("{")
+                if start < 0:
+                    self._buffer = ""
+                    return fields
+                self._buffer = self._buffer[start + 1:]
+                self._state = "key"
+                continue
+
+            self._buffer = self._buffer.lstrip(_WHITESPACE)
+            if self._state == "done" or not self._buffer:
+                return fields
+
+            head = self._buffer[0]
+            if self._state == "key":
+                if head == "}":
+                    self._buffer = ""
+                    self._state = "done"
+                    continue
+                complete, key = self._decode_value(":")
+                if not complete:
+                    return fields
+                self._current_key = key
+                self._state = "colon"
+            elif self._state == "colon":
+                self._buffer = self._buffer[1:]  # ":" checked by _decode_value
+                self._state = "value"
+            elif self._state == "value":
+                complete, value = self._decode_value(",}")
+                if not complete:
+                    return fields
+                self.fields[self._current_key] = value
+                fields.append((self._current_key, value))
+                self._state = "after_value"
+            elif self._state == "after_value":
+                if head == "}":
+                    self._buffer = ""
+                    self._state = "done"
+                    continue
+                if head != ",":
+                    raise ValueError(f"Expected ',' in JSON object, got '{head}'")
+                self._buffer = self._buffer[1:]
+                self._state = "key"
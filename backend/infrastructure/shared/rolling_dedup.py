@@ -0,0 +1,65 @@
+"""
+Rolling-Window Deduplication
+Remembers recently seen keys within a time window and a fixed size budget
+"""
+import json
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Hashable, Optional
+
+
+class RollingWindowDedup:
+    """
+    Set of recently seen keys, each stamped with the time it belongs to
+
+    Keys older than `window` behind the newest timestamp are forgotten,
+    and the earliest added keys are dropped beyond `max_entries`, so memory and
+    the persisted state stay bounded however long the process runs.
+    Callers must treat anything older than the window as already seen.
+    """
+
+    def __init__(self, window_seconds: float, max_entries: int):
+        self.window = timedelta(seconds=window_seconds)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, datetime]" = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return str(key) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: Hashable, stamp: datetime):
+        """Remember a key with its timestamp"""
+        self._entries[str(key)] = stamp
+        self._entries.move_to_end(str(key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def prune(self, newest: datetime) -> int:
+        """Forget keys that fell out of the window behind `newest`"""
+        horizon = newest - self.window
+        expired = [key for key, stamp in self._entries.items() if stamp < horizon]
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+    def horizon(self, newest: datetime) -> datetime:
+        """Oldest timestamp still covered by the window"""
+        return newest - self.window
+
+    def dumps(self) -> str:
+        """Serialize for persistence"""
+        return json.dumps({key: stamp.isoformat() for key, stamp in self._entries.items()})
+
+    def loads(self, data: Optional[str]):
+        """Restore state produced by dumps (ignores empty or invalid data)"""
+        self._entries.clear()
+        if not data:
+            return
+        try:
+            entries = json.loads(data)
+        except ValueError:
+            return
+        for key, stamp in sorted(entries.items(), key=lambda item: item[1]):
+            self.add(key, datetime.fromisoformat(stamp))
@@ -0,0 +1,125 @@
+"""
+Stale-While-Revalidate Cache
+In-process async cache that serves stale entries while refreshing them
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from ..integrations.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+CACHE_FRESH = "fresh"
+CACHE_STALE = "stale"
+CACHE_MISS = "miss"
+
+
+class StaleWhileRevalidateCache:
+    """
+    TTL cache with stale-while-revalidate semantics
+
+    Entries younger than ttl are served as fresh. Entries older than
+    ttl but within ttl + stale_ttl are served immediately as stale while
+    one background task reloads them. Anything older is a miss and is
+    loaded inline; concurrent misses for a key share one load.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, stale_ttl_seconds: float, max_entries: int):
+        self.name = name
+        self.ttl = ttl_seconds
+        self.stale_ttl = stale_ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self._loads = SingleFlight(name)
+        self._generation = 0
+        self.hits = {CACHE_FRESH: 0, CACHE_STALE: 0, CACHE_MISS: 0}
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Tuple[Any, str, float]:
+        """
+        Get a value, loading or revalidating it as needed
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing a fresh value
+
+        Returns:
+            (value, state, age_seconds) where state is fresh, stale or miss
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None:
+            value, stored_at = entry
+            age = now - stored_at
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits[CACHE_FRESH] += 1
+                return value, CACHE_FRESH, age
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.hits[CACHE_STALE] += 1
+                self._revalidate(key, loader)
+                return value, CACHE_STALE, age
+
+        self.hits[CACHE_MISS] += 1
+        value = await self._loads.do_async(key, lambda: self._load(key, loader))
+        return value, CACHE_MISS, 0.0
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generation
+        value = await loader()
+        # Don't resurrect data that was invalidated while loading
+        if generation == self._generation:
+            self._store(key, value)
+        return value
+
+    def _store(self, key: Hashable, value: Any):
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _revalidate(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        """Start one background refresh per key"""
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                await self._loads.do_async(key, lambda: self._load(key, loader))
+                logger.debug(f"[CACHE] {self.name} refreshed {key}")
+            except Exception as e:
+                logger.warning(f"[CACHE] {self.name} refresh failed for {key}, keeping stale entry: {str(e)}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Drop entries so the next read reloads them
+
+        Args:
+            predicate: Selects keys to drop; all entries when omitted
+
+        Returns:
+            Number of entries dropped
+        """
+        self._generation += 1
+        keys = [key for key in self._entries if predicate is None or predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        if keys:
+            logger.info(f"[CACHE] {self.name} invalidated {len(keys)} entries")
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit counters and size"""
+        return {
+            "entries": len(self._entries),
+            "refreshing": len(self._refreshing),
+            "hits": dict(self.hits)
+        }
@@ -0,0 +1,59 @@
+"""
+Text Utilities
+Helpers for turning FreshService HTML into plain text
+"""
+import hashlib
+import html
+import re
+from typing import Any, Dict, Tuple
+
+
+# Tags that start a new line when rendered; replaced with a space so words in
+# adjacent blocks don't run together, as they don't in FreshService's description_text
+BLOCK_TAG_PATTERN = re.compile(
+    r'</?(?:p|div|br|hr|li|ul|ol|dl|dt|dd|tr|td|th|table|thead|tbody|h[1-6]|blockquote|pre|section|article)\b[^>]*>',
+    re.IGNORECASE
+)
+
+
+def clean_html(html_text: str) -> str:
+    """Remove HTML tags and decode entities from text"""
+    if not html_text:
+        return ""
+    
+    # Remove HTML tags, keeping block boundaries as whitespace
+    text = BLOCK_TAG_PATTERN.sub(' ', html_text)
+    text = re.sub(r'<[^>]+>', '', text)
+    
+    # Decode all HTML entities (&nbsp; becomes a non-breaking space, collapsed below)
+    text = html.unescape(text)
+    
+    # Clean up extra whitespace
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    
+    return text
+
+
+def ticket_analysis_text(ticket: Dict[str, Any]) -> Tuple[str, str]:
+    """Subject and plain-text description of a ticket, as sent for analysis"""
+    subject = ticket.get("subject") or ""
+    description_text = ticket.get("description_text") or ""
+    return subject, description_text or clean_html(ticket.get("description") or "")
+
+
+def _normalized_analysis_text(ticket: Dict[str, Any]) -> str:
+    subject, description = ticket_analysis_text(ticket)
+    # description_text and cleaned HTML differ in whitespace only; hash both alike
+    return f"{' '.join(subject.split())}\n{' '.join(description.split())}"
+
+
+def ticket_content_hash(ticket: Dict[str, Any]) -> str:
+    """sha256 of the analyzed ticket content; changes only when the analysis input does"""
+    return hashlib.sha256(_normalized_analysis_text(ticket).encode("utf-8")).hexdigest()
+
+
+def analysis_cache_key(ticket: Dict[str, Any], prompt_version: str, model_id: str) -> str:
+    """sha256 of everything that determines an analysis: content, prompt version and model"""
+    text = f"{prompt_version}\n{model_id}\n{_normalized_analysis_text(ticket)}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -0,0 +1,69 @@
+"""
+Ticket Analysis Repository
+Slack notification claims keyed by ticket ID and content hash
+"""
+import logging
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from .database_config import SessionLocal
+from .database_models import TicketAnalysisRecord
+
+logger = logging.getLogger(__name__)
+
+
+class TicketAnalysisRepository:
+    """
+    Reads and writes for ticket_analyses
+
+    Analysis results themselves live in analysis_logs (AnalysisResultCache);
+    this table only records which ticket content Slack was notified about.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _filter(db, ticket_id: str, content_hash: str):
+        return db.query(TicketAnalysisRecord).filter(
+            TicketAnalysisRecord.ticket_id == str(ticket_id),
+            TicketAnalysisRecord.content_hash == content_hash
+        )
+
+    def claim_notification(self, ticket_id: str, content_hash: str) -> bool:
+        """
+        Claim the single notification for this ticket content
+
+        Returns:
+            True for exactly one caller across processes
+        """
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            # A released claim leaves its row behind with notified_at cleared
+            claimed = self._filter(db, ticket_id, content_hash).filter(
+                TicketAnalysisRecord.notified_at.is_(None)
+            ).update({TicketAnalysisRecord.notified_at: now}, synchronize_session=False)
+            if claimed:
+                db.commit()
+                return True
+
+            db.add(TicketAnalysisRecord(
+                ticket_id=str(ticket_id),
+                content_hash=content_hash,
+                notified_at=now,
+                created_at=now
+            ))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another caller holds the claim
+                db.rollback()
+                return False
+        return True
+
+    def release_notification(self, ticket_id: str, content_hash: str):
+        """Undo a claim whose notification could not be sent"""
+        with self.session_factory() as db:
+            self._filter(db, ticket_id, content_hash).update(
+                {TicketAnalysisRecord.notified_at: None}, synchronize_session=False
+            )
+            db.commit()
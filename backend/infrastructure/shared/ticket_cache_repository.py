@@ -0,0 +1,171 @@
+"""
+Ticket Cache Repository
+Local mirror of FreshService tickets stored in tickets_cache
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Set
+from sqlalchemy import func
+from .database_config import SessionLocal
+from .database_models import TicketCache, SyncState
+
+logger = logging.getLogger(__name__)
+
+UPSERT_CHUNK_SIZE = 500
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a FreshService ISO timestamp into a naive UTC datetime"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def get_sync_state(db, key: str) -> Optional[str]:
+    """Read a persisted state value"""
+    row = db.query(SyncState).filter(SyncState.key == key).first()
+    return row.value if row else None
+
+
+def set_sync_state(db, key: str, value: str):
+    """Write a persisted state value (caller commits)"""
+    row = db.query(SyncState).filter(SyncState.key == key).first()
+    if row:
+        row.value = value
+    else:
+        db.add(SyncState(key=key, value=value))
+
+
+class TicketCacheRepository:
+    """Reads and bulk writes for the tickets_cache mirror"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _to_row(ticket: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        return {
+            "ticket_id": ticket.get("id"),
+            "subject": (ticket.get("subject") or "")[:255],
+            "status": str(ticket.get("status")) if ticket.get("status") is not None else None,
+            "priority": str(ticket.get("priority")) if ticket.get("priority") is not None else None,
+            "requester_id": ticket.get("requester_id"),
+            "group_id": ticket.get("group_id"),
+            "description": ticket.get("description_text") or ticket.get("description"),
+            "payload": json.dumps(ticket),
+            "created_at": parse_timestamp(ticket.get("created_at")) or now,
+            "updated_at": parse_timestamp(ticket.get("updated_at")) or now,
+            "cached_at": now
+        }
+
+    def upsert_tickets(self, tickets: List[Dict[str, Any]], state: Optional[Dict[str, str]] = None) -> int:
+        """
+        Insert or update tickets in one transaction
+
+        Args:
+            tickets: FreshService ticket dicts
+            state: Optional sync state to persist in the same transaction
+
+        Returns:
+            Number of tickets written
+        """
+        now = datetime.utcnow()
+        rows = {row["ticket_id"]: row for row in (self._to_row(t, now) for t in tickets) if row["ticket_id"]}
+
+        with self.session_factory() as db:
+            ids = list(rows.keys())
+            existing = {}
+            for start in range(0, len(ids), UPSERT_CHUNK_SIZE):
+                chunk = ids[start:start + UPSERT_CHUNK_SIZE]
+                existing.update(
+                    db.query(TicketCache.ticket_id, TicketCache.id).filter(TicketCache.ticket_id.in_(chunk)).all()
+                )
+
+            updates = [{**row, "id": existing[ticket_id]} for ticket_id, row in rows.items() if ticket_id in existing]
+            inserts = [row for ticket_id, row in rows.items() if ticket_id not in existing]
+            if updates:
+                db.bulk_update_mappings(TicketCache, updates)
+            if inserts:
+                db.bulk_insert_mappings(TicketCache, inserts)
+            for key, value in (state or {}).items():
+                set_sync_state(db, key, value)
+            db.commit()
+
+        logger.info(f"[CACHE] Upserted {len(rows)} tickets ({len(inserts)} new, {len(updates)} updated)")
+        return len(rows)
+
+    def delete_missing(self, seen_ids: Set[int]) -> List[int]:
+        """Delete cached tickets that no longer exist upstream, returning their IDs"""
+        with self.session_factory() as db:
+            cached_ids = {ticket_id for (ticket_id,) in db.query(TicketCache.ticket_id).all()}
+            stale = list(cached_ids - seen_ids)
+            for start in range(0, len(stale), UPSERT_CHUNK_SIZE):
+                chunk = stale[start:start + UPSERT_CHUNK_SIZE]
+                db.query(TicketCache).filter(TicketCache.ticket_id.in_(chunk)).delete(synchronize_session=False)
+            db.commit()
+
+        if stale:
+            logger.info(f"[CACHE] Removed {len(stale)} tickets deleted upstream")
+        return stale
+
+    def get_state(self, key: str) -> Optional[str]:
+        """Read a persisted sync state value"""
+        with self.session_factory() as db:
+            return get_sync_state(db, key)
+
+    def get_states(self, keys: List[str]) -> Dict[str, str]:
+        """Read several persisted sync state values (missing keys are left out)"""
+        with self.session_factory() as db:
+            rows = db.query(SyncState).filter(SyncState.key.in_(keys)).all()
+            return {row.key: row.value for row in rows}
+
+    def set_state(self, key: str, value: str):
+        """Write a persisted sync state value"""
+        self.set_states({key: value})
+
+    def set_states(self, values: Dict[str, str]):
+        """Write several persisted sync state values in one transaction"""
+        with self.session_factory() as db:
+            for key, value in values.items():
+                set_sync_state(db, key, value)
+            db.commit()
+
+    def get_tickets(self, status: Optional[str] = None, priority: Optional[str] = None, group_id: Optional[int] = None, page: int = 1, per_page: int = 100) -> Dict[str, Any]:
+        """Get a page of cached tickets, shaped like FreshServiceIntegration.get_tickets"""
+        with self.session_factory() as db:
+            query = db.query(TicketCache)
+            if group_id:
+                query = query.filter(TicketCache.group_id == group_id)
+            if status:
+                query = query.filter(TicketCache.status == str(status))
+            if priority:
+                query = query.filter(TicketCache.priority == str(priority))
+
+            total = query.with_entities(func.count(TicketCache.id)).scalar()
+            rows = (
+                query.order_by(TicketCache.created_at.desc())
+                .offset((page - 1) * per_page)
+                .limit(per_page)
+                .all()
+            )
+            tickets = [json.loads(row.payload) for row in rows]
+
+        return {
+            "tickets": tickets,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "has_more": (page * per_page) < total
+        }
+
+    def get_ticket(self, ticket_id: str) -> Optional[Dict]:
+        """Get a cached ticket by FreshService ID"""
+        if not str(ticket_id).isdigit():
+            return None
+        with self.session_factory() as db:
+            row = db.query(TicketCache).filter(TicketCache.ticket_id == int(ticket_id)).first()
+            return json.loads(row.payload) if row else None
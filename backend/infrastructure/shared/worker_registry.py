@@ -0,0 +1,66 @@
+"""
+Worker Registry
+Database leases that tell background workers which peers are alive
+"""
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+from .database_config import SessionLocal
+from .database_models import WorkerLease
+
+logger = logging.getLogger(__name__)
+
+
+def new_worker_id() -> str:
+    """Identity unique to this process (host, pid and a random suffix)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class WorkerRegistry:
+    """
+    Heartbeat-renewed leases in the worker_leases table
+
+    A worker is live while its lease has not expired; a crashed worker
+    drops out once its lease runs out, without any cleanup.
+    """
+
+    def __init__(self, lease_seconds: float, session_factory=SessionLocal):
+        self.lease = timedelta(seconds=lease_seconds)
+        self.session_factory = session_factory
+
+    def heartbeat(self, worker_id: str) -> List[str]:
+        """
+        Renew a worker's lease and list the live workers
+
+        Expired leases are deleted in the same transaction.
+
+        Returns:
+            Sorted IDs of workers holding an unexpired lease
+        """
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            lease = db.query(WorkerLease).filter(WorkerLease.worker_id == worker_id).first()
+            if lease is None:
+                logger.info(f"[WORKERS] Registering worker {worker_id}")
+                lease = WorkerLease(worker_id=worker_id, hostname=socket.gethostname(), started_at=now)
+                db.add(lease)
+            lease.heartbeat_at = now
+            lease.expires_at = now + self.lease
+
+            expired = db.query(WorkerLease).filter(WorkerLease.expires_at < now).delete(synchronize_session=False)
+            if expired:
+                logger.info(f"[WORKERS] Removed {expired} expired worker leases")
+            db.commit()
+
+            live = db.query(WorkerLease.worker_id).filter(WorkerLease.expires_at >= now).all()
+        return sorted(worker for (worker,) in live)
+
+    def release(self, worker_id: str):
+        """Give up a lease so peers take over immediately"""
+        with self.session_factory() as db:
+            db.query(WorkerLease).filter(WorkerLease.worker_id == worker_id).delete(synchronize_session=False)
+            db.commit()
+        logger.info(f"[WORKERS] Released lease of worker {worker_id}")
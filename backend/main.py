@@ -3,10 +3,12 @@ FreshAI Platform - Backend Main Server
 Screaming Architecture: Features are immediately visible
 """
 import logging
+import math
 import sys
 import os
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 # Add backend directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -25,6 +27,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Cache", "Age", "Retry-After"],
 )
 
 # Register Feature Routes (Screaming Architecture)
@@ -58,6 +61,54 @@ try:
 except Exception as e:
     logger.error(f"❌ Failed to import webhook routes: {e}")
 
+# FreshService still answering 429 after retries: tell clients when to come back instead of a 500
+from config import config
+from infrastructure.integrations import RateLimitExceeded
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    retry_after = exc.retry_after if exc.retry_after is not None else config.FRESHSERVICE_BACKOFF_MAX_SECONDS
+    logger.warning(f"🚦 FreshService rate limit reached for {request.url.path}, retry after {retry_after:.0f}s")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "FreshService rate limit reached, try again later"},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+# Application lifecycle
+@app.on_event("startup")
+async def startup():
+    """Create tables and start background services"""
+    import asyncio
+    from config import config
+    from infrastructure.shared import init_db
+    from services.ticket_sync import ticket_sync_service
+    from services.ticket_polling import polling_service
+    from services.analysis_jobs import analysis_job_pool
+    init_db()
+    analysis_job_pool.start()
+    if config.TICKET_SYNC_ENABLED:
+        asyncio.create_task(ticket_sync_service.start())
+    if config.AUTO_ANALYZE_ENABLED:
+        asyncio.create_task(polling_service.start())
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background services and release shared outbound connection pools"""
+    from services.ticket_sync import ticket_sync_service
+    from services.ticket_polling import polling_service
+    from services.analysis_jobs import analysis_job_pool
+    ticket_sync_service.stop()
+    polling_service.stop()
+    # Workers hand their jobs back before the clients they use are closed
+    await analysis_job_pool.stop()
+    from api.freshservice_client import close_freshservice_clients, aclose_freshservice_clients
+    close_freshservice_clients()
+    await aclose_freshservice_clients()
+    logger.info("🔌 FreshService connection pools closed")
+    from infrastructure.ai_providers import close_bedrock_provider
+    close_bedrock_provider()
+
 # Basic routes
 @app.get("/health")
 async def health():
@@ -68,6 +119,37 @@ async def debug_routes():
     routes = [{"path": r.path, "methods": getattr(r, "methods", ["GET"])} for r in app.routes]
     return {"routes": routes}
 
+@app.get("/debug/freshservice")
+async def debug_freshservice():
+    """FreshService transport diagnostics (connection pools, rate limiting, coalescing)"""
+    from infrastructure.shared import get_pool_stats
+    from infrastructure.integrations import freshservice_rate_limiter, freshservice_single_flight
+    return {
+        "connection_pools": get_pool_stats(),
+        "rate_limiter": freshservice_rate_limiter.get_stats(),
+        "single_flight": freshservice_single_flight.get_stats()
+    }
+
+@app.get("/debug/polling")
+async def debug_polling():
+    """Ticket polling diagnostics (watermarks, sharding, tickets queued)"""
+    from services.ticket_polling import polling_service
+    return polling_service.get_stats()
+
+@app.get("/debug/analysis-jobs")
+async def debug_analysis_jobs():
+    """Analysis job queue diagnostics (depth, oldest job age, dead letters, reuse, cache, admission)"""
+    import asyncio
+    from services.analysis_jobs import analysis_job_pool
+    from services.analysis_idempotency import idempotent_analysis
+    from services.admission_control import webhook_admission
+    from infrastructure.shared import analysis_result_cache
+    stats = await asyncio.to_thread(analysis_job_pool.get_stats)
+    stats["idempotency"] = idempotent_analysis.get_stats()
+    stats["analysis_cache"] = analysis_result_cache.get_stats()
+    stats["webhook_admission"] = webhook_admission.get_stats()
+    return stats
+
 @app.get("/features")
 async def list_features():
     """List available features in the system"""
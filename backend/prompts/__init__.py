@@ -5,10 +5,12 @@ Contains system prompts and prompt templates for AI analysis.
 
 from .ticket_analysis_prompt import (
     TICKET_ANALYSIS_SYSTEM_PROMPT,
-    TICKET_ANALYSIS_PROMPT_TEMPLATE
+    TICKET_ANALYSIS_PROMPT_TEMPLATE,
+    TICKET_ANALYSIS_PROMPT_VERSION
 )
 
 __all__ = [
     "TICKET_ANALYSIS_SYSTEM_PROMPT",
-    "TICKET_ANALYSIS_PROMPT_TEMPLATE"
+    "TICKET_ANALYSIS_PROMPT_TEMPLATE",
+    "TICKET_ANALYSIS_PROMPT_VERSION"
 ]
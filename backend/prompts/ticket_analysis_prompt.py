@@ -3,6 +3,9 @@ System prompt for FreshAI ticket analysis using AWS Bedrock Claude model.
 Defines the behavior and instructions for AI-powered ticket analysis.
 """
 
+# Bump whenever either prompt changes, so cached analyses from the old prompt are not reused
+TICKET_ANALYSIS_PROMPT_VERSION = "1"
+
 TICKET_ANALYSIS_SYSTEM_PROMPT = """You are a professional support ticket analyzer. Your role is to analyze support tickets and provide structured insights WITHOUT hallucinating or making assumptions beyond what is explicitly stated in the ticket.
 
 IMPORTANT RULES:
@@ -0,0 +1,124 @@
+"""
+Webhook Admission Control
+Sheds webhook load before it turns into unbounded analysis backlog
+"""
+import logging
+import asyncio
+import math
+from typing import Any, Dict, Optional
+from config import config
+from infrastructure.shared import AnalysisJobRepository
+from services.analysis_jobs import analysis_job_pool
+
+logger = logging.getLogger(__name__)
+
+REJECT_IN_FLIGHT = "in_flight"
+REJECT_QUEUE = "queue_depth"
+REJECT_GROUP = "group_share"
+
+
+class WebhookAdmissionController:
+    """
+    Limits on webhook requests being handled and analysis jobs outstanding
+
+    A request is refused when max_in_flight requests are already being
+    handled, when max_queue_depth jobs are pending or running, or when
+    its group already holds group_share of that depth, so one noisy group
+    cannot crowd the others out of the queue. Refused callers get a
+    Retry-After hint; FreshService retries the webhook later.
+    """
+
+    def __init__(
+        self,
+        repository: AnalysisJobRepository,
+        max_in_flight: int,
+        max_queue_depth: int,
+        group_share: float,
+        retry_after_seconds: int
+    ):
+        self.repository = repository
+        self.max_in_flight = max_in_flight
+        self.max_queue_depth = max_queue_depth
+        self.max_group_depth = max(1, math.ceil(max_queue_depth * group_share))
+        self.retry_after_seconds = retry_after_seconds
+        self.in_flight = 0
+        # Admitted requests whose job is not enqueued yet, by group
+        self.reserved: Dict[Optional[str], int] = {}
+        self.admitted = 0
+        self.rejected = {REJECT_IN_FLIGHT: 0, REJECT_QUEUE: 0, REJECT_GROUP: 0}
+
+    def try_enter(self) -> bool:
+        """Count a request as in flight, unless the limit is reached"""
+        if self.in_flight >= self.max_in_flight:
+            self.rejected[REJECT_IN_FLIGHT] += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def leave(self):
+        """Finish a request admitted by try_enter"""
+        self.in_flight -= 1
+
+    async def check_queue(self, group_id: Optional[Any]) -> Optional[str]:
+        """
+        Check the analysis backlog before enqueueing a job for a group
+
+        An admitted request reserves its slot until release_queue_slot is
+        called after the enqueue, so concurrent requests in this process
+        cannot all pass the check against the same backlog count. Other
+        processes only see the slot once the job is in the table, so with
+        several processes the depth limits can be overshot by at most the
+        requests they admit at the same moment.
+
+        Returns:
+            None to admit (call release_queue_slot once enqueued), or the
+            reason for refusing
+        """
+        outstanding = await asyncio.to_thread(self.repository.outstanding_by_group)
+        # No await from here on, so the check and the reservation are atomic within the process
+        group_key = str(group_id) if group_id is not None else None
+        if sum(outstanding.values()) + sum(self.reserved.values()) >= self.max_queue_depth:
+            self.rejected[REJECT_QUEUE] += 1
+            return REJECT_QUEUE
+        if outstanding.get(group_key, 0) + self.reserved.get(group_key, 0) >= self.max_group_depth:
+            self.rejected[REJECT_GROUP] += 1
+            return REJECT_GROUP
+        self.reserved[group_key] = self.reserved.get(group_key, 0) + 1
+        self.admitted += 1
+        return None
+
+    def release_queue_slot(self, group_id: Optional[Any]):
+        """Drop the reservation of an admitted request once its job is enqueued (or failed)"""
+        group_key = str(group_id) if group_id is not None else None
+        remaining = self.reserved.get(group_key, 0) - 1
+        if remaining > 0:
+            self.reserved[group_key] = remaining
+        else:
+            self.reserved.pop(group_key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limits and admission counters"""
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "max_queue_depth": self.max_queue_depth,
+            "max_group_depth": self.max_group_depth,
+            "reserved": sum(self.reserved.values()),
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected)
+        }
+
+
+def create_webhook_admission(repository: AnalysisJobRepository) -> WebhookAdmissionController:
+    """Controller configured from the WEBHOOK_* settings"""
+    return WebhookAdmissionController(
+        repository,
+        max_in_flight=config.WEBHOOK_MAX_IN_FLIGHT,
+        max_queue_depth=config.WEBHOOK_MAX_QUEUE_DEPTH,
+        group_share=config.WEBHOOK_GROUP_QUEUE_SHARE,
+        retry_after_seconds=config.WEBHOOK_RETRY_AFTER_SECONDS
+    )
+
+
+# Global admission controller for webhook-triggered analyses
+webhook_admission = create_webhook_admission(analysis_job_pool.repository)
@@ -3,118 +3,232 @@ AI Ticket Analyzer Service
 Legacy service - delegates to infrastructure layer
 Use infrastructure.ai_providers.BedrockAIProvider for new code
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any
-import re
-from infrastructure.ai_providers import BedrockAIProvider
-from prompts import TICKET_ANALYSIS_SYSTEM_PROMPT, TICKET_ANALYSIS_PROMPT_TEMPLATE
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Callable, List, Tuple
+from config import config
+from infrastructure.ai_providers import BedrockAIProvider, get_bedrock_provider
+from infrastructure.shared.analysis_cache import AnalysisResultCache, analysis_result_cache
+from infrastructure.shared.json_stream import JSONObjectFieldParser
+from infrastructure.shared.text import ticket_analysis_text, analysis_cache_key
+from prompts import TICKET_ANALYSIS_SYSTEM_PROMPT, TICKET_ANALYSIS_PROMPT_TEMPLATE, TICKET_ANALYSIS_PROMPT_VERSION
 
 logger = logging.getLogger(__name__)
 
 
-def clean_html(html_text: str) -> str:
-    """Remove HTML tags and decode entities from text"""
-    if not html_text:
-        return ""
-    
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', html_text)
-    
-    # Decode common HTML entities
-    text = text.replace('&nbsp;', ' ')
-    text = text.replace('&lt;', '<')
-    text = text.replace('&gt;', '>')
-    text = text.replace('&amp;', '&')
-    text = text.replace('&quot;', '"')
-    text = text.replace('&#39;', "'")
-    
-    # Clean up extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-    
-    return text
-
-
 class TicketAnalyzer:
     """Analyzes tickets using AWS Bedrock API - Legacy adapter"""
 
-    def __init__(self, aws_access_key: Optional[str] = None, aws_secret_key: Optional[str] = None):
+    def __init__(
+        self,
+        aws_access_key: Optional[str] = None,
+        aws_secret_key: Optional[str] = None,
+        provider: Optional[BedrockAIProvider] = None,
+        cache: Optional[AnalysisResultCache] = None
+    ):
         """
         Initialize the ticket analyzer
 
         Args:
             aws_access_key: AWS Access Key (defaults to AWS_ACCESS_KEY env var)
             aws_secret_key: AWS Secret Key (defaults to AWS_SECRET_ACCESS_KEY env var)
+            provider: Bedrock provider to use (defaults to the shared one)
+            cache: Analysis result cache (defaults to the shared one)
         """
-        self.provider = BedrockAIProvider(aws_access_key, aws_secret_key)
+        if provider is None:
+            # Explicit credentials get their own client; otherwise share the process-wide one
+            if aws_access_key or aws_secret_key:
+                provider = BedrockAIProvider(aws_access_key, aws_secret_key)
+            else:
+                provider = get_bedrock_provider()
+        self.provider = provider
         self.client = self.provider.client
+        self.cache = cache or analysis_result_cache
 
-    def analyze_ticket(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_ticket(self, ticket_data: Dict[str, Any], force: bool = False) -> Dict[str, Any]:
         """
         Analyze a ticket and provide insights
 
+        Blocks for the whole Bedrock call; async callers should use
+        analyze_ticket_async.
+
+        Args:
+            ticket_data: Dictionary containing ticket information
+            force: Call the model even if this content was analyzed before
+
+        Returns:
+            Dictionary with analysis results or error; "cached" is True
+            when the analysis came from the cache
+        """
+        prompt, error = self._prepare(ticket_data)
+        if error:
+            return error
+
+        key = self.cache_key(ticket_data)
+        cached = None if force else self.cache.get(key)
+        if cached is not None:
+            return self._success(ticket_data, cached, cached=True)
+
+        try:
+            analysis_result = self.provider.analyze(self._get_system_prompt(), prompt)
+            self._remember(key, ticket_data, analysis_result)
+            return self._success(ticket_data, analysis_result)
+        except Exception as e:
+            return self._failure(ticket_data, e)
+
+    async def analyze_ticket_async(
+        self,
+        ticket_data: Dict[str, Any],
+        timeout: Optional[float] = None,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Analyze a ticket without blocking the event loop
+
         Args:
             ticket_data: Dictionary containing ticket information
+            timeout: Seconds before giving up (defaults to BEDROCK_CALL_TIMEOUT_SECONDS)
+            force: Call the model even if this content was analyzed before
 
         Returns:
             Dictionary with analysis results or error
         """
+        prompt, error = self._prepare(ticket_data)
+        if error:
+            return error
+
+        key = self.cache_key(ticket_data)
+        cached = None if force else await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return self._success(ticket_data, cached, cached=True)
+
+        timeout = config.BEDROCK_CALL_TIMEOUT_SECONDS if timeout is None else timeout
+        try:
+            analysis_result = await self.provider.analyze_async(self._get_system_prompt(), prompt, timeout=timeout)
+            await asyncio.to_thread(self._remember, key, ticket_data, analysis_result)
+            return self._success(ticket_data, analysis_result)
+        except asyncio.TimeoutError:
+            return self._failure(ticket_data, f"timed out after {timeout}s")
+        except Exception as e:
+            return self._failure(ticket_data, e)
+
+    async def stream_analysis(
+        self,
+        ticket_data: Dict[str, Any],
+        timeout: Optional[float] = None,
+        force: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze a ticket, yielding each analysis field as the model writes it
+
+        Args:
+            ticket_data: Dictionary containing ticket information
+            timeout: Seconds for the whole stream (defaults to BEDROCK_CALL_TIMEOUT_SECONDS)
+            force: Call the model even if this content was analyzed before
+
+        Yields:
+            {"event": "field", "field": ..., "value": ...} per completed field,
+            then one {"event": "complete", "result": ...} whose result has the
+            shape of analyze_ticket's (status success or error)
+        """
+        prompt, error = self._prepare(ticket_data)
+        if error:
+            yield {"event": "complete", "result": error}
+            return
+
+        key = self.cache_key(ticket_data)
+        cached = None if force else await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            for field, value in cached.items():
+                yield {"event": "field", "field": field, "value": value}
+            yield {"event": "complete", "result": self._success(ticket_data, cached, cached=True)}
+            return
+
+        timeout = config.BEDROCK_CALL_TIMEOUT_SECONDS if timeout is None else timeout
+        parser = JSONObjectFieldParser()
+        text = []
+        try:
+            async for delta in self.provider.analyze_stream_async(self._get_system_prompt(), prompt, timeout=timeout):
+                text.append(delta)
+                for field, value in parser.feed(delta):
+                    yield {"event": "field", "field": field, "value": value}
+            # Fall back to parsing the whole answer if the fields never closed cleanly
+            analysis_result = parser.fields if parser.done else self.provider.parse_response_text("".join(text))
+            await asyncio.to_thread(self._remember, key, ticket_data, analysis_result)
+            result = self._success(ticket_data, analysis_result)
+        except asyncio.TimeoutError:
+            result = self._failure(ticket_data, f"timed out after {timeout}s")
+        except Exception as e:
+            result = self._failure(ticket_data, e)
+        yield {"event": "complete", "result": result}
+
+    def _prepare(self, ticket_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Build the analysis prompt, or the error result when there is nothing to analyze"""
         if not self.client:
-            return {
+            return None, {
                 "status": "error",
                 "message": "AWS credentials not configured",
                 "ticket_id": ticket_data.get("id"),
             }
 
-        try:
-            # Log incoming ticket data for debugging
-            logger.info(f"[AI] Received ticket_data keys: {list(ticket_data.keys()) if ticket_data else 'None'}")
-            
-            ticket_id = ticket_data.get("id")
-            subject = ticket_data.get("subject", "")
-            description = ticket_data.get("description", "")
-            description_text = ticket_data.get("description_text", "")
-
-            # Clean HTML from descriptions
-            if description and not description_text:
-                description = clean_html(description)
-            
-            # Use description_text if available, otherwise use cleaned description
-            full_description = description_text or description
-            
-            logger.info(f"[AI] Analyzing ticket {ticket_id}...")
-            logger.info(f"[AI] Subject: {subject[:50] if subject else 'EMPTY'}...")
-            logger.info(f"[AI] Description length: {len(full_description)}")
-            logger.info(f"[AI] Description preview: {full_description[:100] if full_description else 'EMPTY'}...")
-
-            if not subject and not full_description:
-                logger.warning(f"[AI] Empty ticket data received for ticket {ticket_id}")
-                return {
-                    "status": "error",
-                    "message": "Ticket has no subject or description to analyze",
-                    "ticket_id": ticket_id,
-                }
-
-            prompt = self._create_analysis_prompt(subject, full_description)
-            system_prompt = self._get_system_prompt()
-            
-            analysis_result = self.provider.analyze(system_prompt, prompt)
+        # Log incoming ticket data for debugging
+        logger.info(f"[AI] Received ticket_data keys: {list(ticket_data.keys()) if ticket_data else 'None'}")
+        
+        ticket_id = ticket_data.get("id")
+        
+        # Use description_text if available, otherwise the description without HTML
+        subject, full_description = ticket_analysis_text(ticket_data)
+        
+        logger.info(f"[AI] Analyzing ticket {ticket_id}...")
+        logger.info(f"[AI] Subject: {subject[:50] if subject else 'EMPTY'}...")
+        logger.info(f"[AI] Description length: {len(full_description)}")
+        logger.info(f"[AI] Description preview: {full_description[:100] if full_description else 'EMPTY'}...")
 
-            logger.info(f"[AI] Analysis complete for ticket {ticket_id}")
-
-            return {
-                "status": "success",
+        if not subject and not full_description:
+            logger.warning(f"[AI] Empty ticket data received for ticket {ticket_id}")
+            return None, {
+                "status": "error",
+                "message": "Ticket has no subject or description to analyze",
                 "ticket_id": ticket_id,
-                "analysis": analysis_result,
             }
 
-        except Exception as e:
-            logger.error(f"[AI] Error analyzing ticket: {str(e)}")
-            return {
-                "status": "error",
-                "message": f"Analysis failed: {str(e)}",
-                "ticket_id": ticket_data.get("id"),
-            }
+        return self._create_analysis_prompt(subject, full_description), None
+
+    def cache_key(self, ticket_data: Dict[str, Any]) -> str:
+        """Key of this ticket's analysis: its content, the prompt version and the model"""
+        return analysis_cache_key(ticket_data, TICKET_ANALYSIS_PROMPT_VERSION, self.provider.model_id)
+
+    def _remember(self, key: str, ticket_data: Dict[str, Any], analysis_result: Dict[str, Any]):
+        self.cache.put(
+            key,
+            analysis_result,
+            ticket_id=ticket_data.get("id"),
+            prompt_version=TICKET_ANALYSIS_PROMPT_VERSION,
+            model_id=self.provider.model_id
+        )
+
+    @staticmethod
+    def _success(ticket_data: Dict[str, Any], analysis_result: Dict[str, Any], cached: bool = False) -> Dict[str, Any]:
+        ticket_id = ticket_data.get("id")
+        if cached:
+            logger.info(f"[AI] Using cached analysis for ticket {ticket_id}")
+        else:
+            logger.info(f"[AI] Analysis complete for ticket {ticket_id}")
+        return {
+            "status": "success",
+            "ticket_id": ticket_id,
+            "analysis": analysis_result,
+            "cached": cached,
+        }
+
+    @staticmethod
+    def _failure(ticket_data: Dict[str, Any], error) -> Dict[str, Any]:
+        logger.error(f"[AI] Error analyzing ticket: {str(error)}")
+        return {
+            "status": "error",
+            "message": f"Analysis failed: {str(error)}",
+            "ticket_id": ticket_data.get("id"),
+        }
 
     def _get_system_prompt(self) -> str:
         """Get the system prompt for consistent AI behavior"""
@@ -127,33 +241,103 @@ class TicketAnalyzer:
             description=description
         )
 
+    async def iter_analyze_tickets(
+        self,
+        tickets: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        force: bool = False,
+        analyze: Optional[Callable[..., Awaitable[Dict[str, Any]]]] = None
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Analyze tickets concurrently, yielding each result as it finishes
+
+        Args:
+            tickets: List of ticket dictionaries
+            concurrency: Analyses in flight at once (defaults to ANALYSIS_BATCH_CONCURRENCY)
+            timeout: Seconds per ticket (defaults to BEDROCK_CALL_TIMEOUT_SECONDS)
+            force: Call the model even for tickets analyzed before
+            analyze: Coroutine function called as analyze(ticket, timeout=, force=)
+                for each ticket (defaults to analyze_ticket_async)
+
+        Yields:
+            (index into tickets, analyze_ticket_async result), in completion
+            order. A ticket that times out or fails yields an error result;
+            it never stops the batch. Closing the iterator early cancels
+            the analyses still pending.
+        """
+        semaphore = asyncio.Semaphore(concurrency or config.ANALYSIS_BATCH_CONCURRENCY)
+        analyze = analyze or self.analyze_ticket_async
+
+        async def run(index: int, ticket: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return index, await analyze(ticket, timeout=timeout, force=force)
+                except Exception as e:
+                    return index, self._failure(ticket, e)
+
+        tasks = [asyncio.create_task(run(index, ticket)) for index, ticket in enumerate(tickets)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def analyze_multiple_tickets_async(
+        self,
+        tickets: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Analyze multiple tickets concurrently (see iter_analyze_tickets)
+
+        Returns:
+            Dictionary with batch analysis results, in the order of tickets
+        """
+        ordered: List[Optional[Dict[str, Any]]] = [None] * len(tickets)
+        async for index, result in self.iter_analyze_tickets(tickets, concurrency, timeout, force):
+            ordered[index] = result
+        return self.batch_summary(ordered)
+
     def analyze_multiple_tickets(
-        self, tickets: list
+        self,
+        tickets: list,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        force: bool = False
     ) -> Dict[str, Any]:
         """
         Analyze multiple tickets
 
+        Blocking wrapper around analyze_multiple_tickets_async for scripts;
+        it cannot be called from a running event loop.
+
         Args:
             tickets: List of ticket dictionaries
+            concurrency: Analyses in flight at once (defaults to ANALYSIS_BATCH_CONCURRENCY)
+            timeout: Seconds per ticket (defaults to BEDROCK_CALL_TIMEOUT_SECONDS)
+            force: Call the model even for tickets analyzed before
 
         Returns:
             Dictionary with batch analysis results
         """
-        results = []
-        failed = []
+        return asyncio.run(self.analyze_multiple_tickets_async(tickets, concurrency, timeout, force))
 
-        for ticket in tickets:
-            result = self.analyze_ticket(ticket)
-            if result["status"] == "success":
-                results.append(result)
-            else:
-                failed.append(result)
+    @staticmethod
+    def batch_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate per-ticket results into the batch_analysis_complete summary"""
+        successful = [result for result in results if result["status"] == "success"]
+        failed = [result for result in results if result["status"] != "success"]
 
         return {
             "status": "batch_analysis_complete",
-            "total": len(tickets),
-            "successful": len(results),
+            "total": len(results),
+            "successful": len(successful),
             "failed": len(failed),
-            "results": results,
+            "results": successful,
             "failures": failed,
         }
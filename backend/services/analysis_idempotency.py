@@ -0,0 +1,169 @@
+"""
+Idempotent Ticket Analysis
+One analysis and one Slack notification per ticket content, whatever the trigger
+"""
+import logging
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from config import config
+from infrastructure.integrations.single_flight import SingleFlight
+from infrastructure.shared import TicketAnalysisRepository
+from infrastructure.shared.text import ticket_content_hash
+from infrastructure.notifications import SlackNotificationService
+from infrastructure.ai_providers import get_bedrock_provider
+from services.ai_analyzer import TicketAnalyzer
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_SENT = "sent"
+NOTIFY_DUPLICATE = "duplicate"
+NOTIFY_FAILED = "failed"
+NOTIFY_DISABLED = "disabled"
+
+
+class IdempotentAnalysisService:
+    """
+    Shared entry point for webhook jobs, the poller and the /analyze endpoints
+
+    Results are reused through the analyzer's AnalysisResultCache, keyed
+    on the ticket content, the prompt version and the model, so an edited
+    ticket, a new prompt or a new model each get a fresh analysis.
+    Concurrent requests for the same key join the in-flight analysis.
+    Slack is notified at most once per ticket content, across processes.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[TicketAnalysisRepository] = None,
+        analyzer_factory: Optional[Callable[[], TicketAnalyzer]] = None
+    ):
+        self.repository = repository or TicketAnalysisRepository()
+        # Analyzers share the process-wide Bedrock client and result cache unless told otherwise
+        self.analyzer_factory = analyzer_factory or (lambda: TicketAnalyzer(provider=get_bedrock_provider()))
+        self._analyzer: Optional[TicketAnalyzer] = None
+        self._flights = SingleFlight("ticket_analysis")
+        self.reused = 0
+
+    @property
+    def analyzer(self) -> TicketAnalyzer:
+        if self._analyzer is None:
+            self._analyzer = self.analyzer_factory()
+        return self._analyzer
+
+    async def analyze(self, ticket: Dict[str, Any], force: bool = False, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Analyze a ticket unless this content was already analyzed
+
+        Args:
+            ticket: FreshService ticket dict
+            force: Skip the analysis cache and call the model
+            timeout: Seconds before giving up (defaults to BEDROCK_CALL_TIMEOUT_SECONDS);
+                callers joining an in-flight analysis share its timeout
+
+        Returns:
+            TicketAnalyzer.analyze_ticket result; "reused" is True when it
+            came from an earlier analysis
+        """
+        key = (str(ticket.get("id")), self.analyzer.cache_key(ticket))
+        # A forced analysis must not join an in-flight one that may be served from cache
+        flight_key = (*key, "force") if force else key
+        result = await self._flights.do_async(
+            flight_key, lambda: self.analyzer.analyze_ticket_async(ticket, timeout=timeout, force=force)
+        )
+        return self._mark_reused(key[0], result)
+
+    def iter_analyze_tickets(
+        self,
+        tickets: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        force: bool = False
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Analyze tickets concurrently through analyze()
+
+        Same as TicketAnalyzer.iter_analyze_tickets, but each ticket is
+        reused or joined like any other trigger.
+
+        Yields:
+            (index into tickets, analyze result), in completion order
+        """
+        return self.analyzer.iter_analyze_tickets(tickets, concurrency, timeout, force, analyze=self.analyze)
+
+    async def stream(self, ticket: Dict[str, Any], force: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a ticket analysis field by field
+
+        A cached result is replayed as field events right away; otherwise
+        the analysis is streamed from Bedrock and cached once complete.
+        Streams are not joined with concurrent analyze() calls.
+
+        Args:
+            ticket: FreshService ticket dict
+            force: Skip the analysis cache and call the model
+
+        Yields:
+            TicketAnalyzer.stream_analysis events; the complete event's
+            result carries "reused" like analyze()
+        """
+        async for event in self.analyzer.stream_analysis(ticket, force=force):
+            if event["event"] == "complete":
+                event = {**event, "result": self._mark_reused(str(ticket.get("id")), event["result"])}
+            yield event
+
+    def _mark_reused(self, ticket_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        reused = bool(result.get("cached"))
+        if reused:
+            self.reused += 1
+            logger.info(f"[ANALYSIS] ♻️  Reusing earlier analysis for ticket {ticket_id}")
+        return {**result, "reused": reused}
+
+    async def notify_slack(self, ticket: Dict[str, Any], analysis: Dict[str, Any]) -> str:
+        """
+        Send the analysis to Slack unless it was already sent for this content
+
+        Returns:
+            One of sent, duplicate, failed or disabled
+        """
+        if not config.SLACK_WEBHOOK_URL:
+            return NOTIFY_DISABLED
+
+        ticket_id = str(ticket.get("id"))
+        key = (ticket_id, ticket_content_hash(ticket))
+        if not await asyncio.to_thread(self.repository.claim_notification, *key):
+            logger.info(f"[ANALYSIS] ⏭️  Slack already notified for ticket {ticket_id}")
+            return NOTIFY_DUPLICATE
+
+        slack_service = SlackNotificationService(config.SLACK_WEBHOOK_URL)
+        try:
+            sent = await asyncio.to_thread(
+                slack_service.send_ticket_analysis,
+                ticket_id,
+                analysis["analysis"],
+                domain=config.FRESHSERVICE_DOMAIN
+            )
+        except Exception as e:
+            logger.error(f"[ANALYSIS] ❌ Slack notification error for ticket {ticket_id}: {str(e)}")
+            sent = False
+
+        if not sent:
+            # Let a later trigger try again
+            await asyncio.to_thread(self.repository.release_notification, *key)
+            return NOTIFY_FAILED
+        return NOTIFY_SENT
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Reused-result and in-flight join counters"""
+        return {
+            "reused": self.reused,
+            "in_flight": self._flights.get_stats()
+        }
+
+
+# Global analysis service shared by every analysis trigger
+idempotent_analysis = IdempotentAnalysisService()
+
+
+def get_analysis_service() -> IdempotentAnalysisService:
+    """FastAPI dependency for the shared analysis service"""
+    return idempotent_analysis
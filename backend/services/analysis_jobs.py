@@ -0,0 +1,234 @@
+"""
+Analysis Job Workers
+Pool of workers that run queued ticket analyses from analysis_jobs
+"""
+import logging
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from config import config
+from api.freshservice_client import get_async_freshservice_client
+from infrastructure.shared import AnalysisJobRepository, new_worker_id, JOB_DEAD
+from services.analysis_idempotency import idempotent_analysis, NOTIFY_SENT, NOTIFY_FAILED, NOTIFY_DISABLED
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL_SECONDS = 3600
+
+# Fields TicketAnalyzer.analyze_ticket reads; one description field is enough
+ANALYSIS_FIELDS = ("subject",)
+DESCRIPTION_FIELDS = ("description", "description_text")
+
+
+def analyzable_ticket(ticket_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    The ticket to carry in a job, when it can be analyzed as is
+    
+    Webhook payloads and poller results only sometimes include the
+    subject and description; jobs without them fetch the ticket. Blank
+    values count as missing, since automations send "" or null for
+    placeholders they could not fill.
+    
+    Returns:
+        The ticket, or None if fields are missing and it must be fetched
+    """
+    if not all(ticket_data.get(field) for field in ANALYSIS_FIELDS):
+        return None
+    if not any(ticket_data.get(field) for field in DESCRIPTION_FIELDS):
+        return None
+    return ticket_data
+
+
+async def analyze_ticket_job(job: Dict[str, Any]):
+    """
+    Analyze and notify Slack for one queued ticket
+
+    Uses the ticket carried by the job (e.g. from the webhook payload)
+    and only fetches it from FreshService when the job has none.
+
+    Raises:
+        Exception: If the ticket could not be analyzed, so the job is retried
+    """
+    ticket_id = job["ticket_id"]
+    logger.info(f"[JOBS] 🤖 Analyzing ticket {ticket_id} (job {job['id']}, attempt {job['attempts']})")
+
+    ticket = job.get("ticket")
+    if not ticket:
+        client = get_async_freshservice_client()
+        ticket = await client.get_ticket(ticket_id)
+        if not ticket:
+            raise ValueError(f"Ticket {ticket_id} not found")
+
+    # Duplicate triggers for the same content reuse one analysis and one notification
+    analysis = await idempotent_analysis.analyze(ticket)
+    if analysis.get("status") != "success":
+        raise RuntimeError(f"Analysis failed: {analysis.get('message')}")
+
+    logger.info(f"[JOBS] ✅ Analysis completed for ticket {ticket_id}")
+
+    notified = await idempotent_analysis.notify_slack(ticket, analysis)
+    if notified == NOTIFY_SENT:
+        logger.info(f"[JOBS] 📨 Slack notification sent for ticket {ticket_id}")
+    elif notified == NOTIFY_FAILED:
+        logger.error(f"[JOBS] ❌ Failed to send Slack notification for ticket {ticket_id}")
+    elif notified == NOTIFY_DISABLED:
+        logger.warning(f"[JOBS] ⚠️ Slack webhook not configured, skipping notification")
+
+
+class AnalysisJobWorkerPool:
+    """
+    Workers that claim jobs from the durable analysis queue
+
+    Producers (webhooks, manual triggers) only insert a row and call
+    notify(), so they return immediately; jobs survive restarts and
+    crashes and are picked up by whichever process claims them first.
+    Idle workers poll the table, and notify() wakes local workers early.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[AnalysisJobRepository] = None,
+        handler: Callable[[Dict[str, Any]], Awaitable[Any]] = analyze_ticket_job,
+        concurrency: Optional[int] = None
+    ):
+        self.repository = repository or create_analysis_job_repository()
+        self.handler = handler
+        self.concurrency = concurrency or config.ANALYSIS_JOB_WORKERS
+        self.worker_id = new_worker_id()
+        self.workers: List[asyncio.Task] = []
+        self.running = False
+        self.in_progress = 0
+        self.completed = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_purge = time.monotonic()
+
+    def start(self):
+        """Start the worker tasks"""
+        if self.workers:
+            return
+        self.running = True
+        self._wakeup = asyncio.Event()
+        self.workers = [asyncio.create_task(self._worker(n)) for n in range(self.concurrency)]
+        logger.info(f"[JOBS] 🚀 Started {self.concurrency} analysis job workers ({self.worker_id})")
+
+    async def stop(self):
+        """
+        Stop the workers and wait for them to exit
+
+        Jobs they hold are handed back to the queue before this returns,
+        so callers can close the clients the handlers use afterwards.
+        """
+        logger.info("[JOBS] 🛑 Stopping analysis job workers")
+        self.running = False
+        workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def notify(self):
+        """Wake idle workers after a job was enqueued"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def enqueue(
+        self,
+        ticket_id: str,
+        group_id: Optional[str] = None,
+        source: str = "webhook",
+        ticket: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Persist a job and wake the workers"""
+        job_id = await asyncio.to_thread(self.repository.enqueue, ticket_id, group_id, source, ticket)
+        self.notify()
+        return job_id
+
+    async def _worker(self, worker_number: int):
+        while self.running:
+            try:
+                job = await asyncio.to_thread(self.repository.claim, self.worker_id)
+            except Exception as e:
+                logger.error(f"[JOBS] ❌ Could not claim a job: {str(e)}")
+                job = None
+
+            if job is None:
+                await self._idle()
+                continue
+
+            self.in_progress += 1
+            try:
+                await self.run_job(job)
+            finally:
+                self.in_progress -= 1
+
+    async def _idle(self):
+        """Wait for a notify() or the next poll, purging old jobs now and then"""
+        if time.monotonic() - self._last_purge > PURGE_INTERVAL_SECONDS:
+            self._last_purge = time.monotonic()
+            try:
+                await asyncio.to_thread(
+                    self.repository.purge_finished,
+                    timedelta(hours=config.ANALYSIS_JOB_RETENTION_HOURS)
+                )
+            except Exception as e:
+                logger.warning(f"[JOBS] ⚠️  Could not purge finished jobs: {str(e)}")
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=config.ANALYSIS_JOB_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def run_job(self, job: Dict[str, Any]):
+        """Run one claimed job and record the outcome"""
+        try:
+            await self.handler(job)
+        except asyncio.CancelledError:
+            await asyncio.shield(asyncio.to_thread(self.repository.release, job["id"], self.worker_id))
+            raise
+        except Exception as e:
+            status = await asyncio.to_thread(self.repository.fail, job["id"], self.worker_id, str(e))
+            if status == JOB_DEAD:
+                self.dead_lettered += 1
+                logger.error(f"[JOBS] ☠️  Job {job['id']} (ticket {job['ticket_id']}) dead-lettered after {job['attempts']} attempts: {str(e)}")
+            else:
+                self.retried += 1
+                delay = self.repository.retry_delay(job["attempts"])
+                logger.warning(f"[JOBS] ⚠️  Job {job['id']} (ticket {job['ticket_id']}) failed, retrying in {delay:.0f}s: {str(e)}")
+            return
+
+        if await asyncio.to_thread(self.repository.complete, job["id"], self.worker_id):
+            self.completed += 1
+        else:
+            logger.warning(f"[JOBS] ⚠️  Job {job['id']} outlived its visibility timeout and was reclaimed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and age from the table plus this process's worker counters"""
+        return {
+            "queue": self.repository.get_stats(),
+            "workers": {
+                "worker_id": self.worker_id,
+                "running": self.running,
+                "concurrency": len(self.workers),
+                "in_progress": self.in_progress,
+                "completed": self.completed,
+                "retried": self.retried,
+                "dead_lettered": self.dead_lettered
+            },
+            "dead_letter": self.repository.get_dead_jobs()
+        }
+
+
+def create_analysis_job_repository() -> AnalysisJobRepository:
+    """Repository configured from the ANALYSIS_JOB_* settings"""
+    return AnalysisJobRepository(
+        visibility_timeout=config.ANALYSIS_JOB_VISIBILITY_TIMEOUT_SECONDS,
+        max_attempts=config.ANALYSIS_JOB_MAX_ATTEMPTS,
+        retry_base_seconds=config.ANALYSIS_JOB_RETRY_BASE_SECONDS,
+        retry_max_seconds=config.ANALYSIS_JOB_RETRY_MAX_SECONDS
+    )
+
+
+# Global analysis job worker pool
+analysis_job_pool = AnalysisJobWorkerPool()
@@ -0,0 +1,138 @@
+"""
+Adaptive Poll Scheduler
+Chooses the delay before the next poll from observed ticket arrivals
+"""
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional
+from config import config
+from infrastructure.integrations import freshservice_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptivePollScheduler:
+    """
+    Poll interval driven by an EWMA of the ticket arrival rate
+
+    The interval aims for about `target_per_poll` new tickets per poll:
+    bursts shorten it towards min_interval, quiet periods stretch it
+    towards max_interval. Consecutive errors back off exponentially, and
+    a rate limiter running low on headroom pushes the interval towards
+    the maximum. Every decision is kept for diagnostics.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        initial_interval: float,
+        target_per_poll: float = 1.0,
+        smoothing: float = 0.3,
+        low_headroom_ratio: float = 0.25,
+        rate_limiter=freshservice_rate_limiter
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.target_per_poll = target_per_poll
+        self.smoothing = smoothing
+        self.low_headroom_ratio = low_headroom_ratio
+        self.rate_limiter = rate_limiter
+        self.interval = self._clamp(initial_interval)
+        self.arrival_rate: Optional[float] = None  # Tickets per second
+        self.consecutive_errors = 0
+        self.decisions = deque(maxlen=50)
+        self.reasons: Dict[str, int] = {}
+        self._last_poll: Optional[float] = None
+        self._error_base = self.interval  # Interval in force when the current error streak began
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def record_success(self, new_tickets: int) -> float:
+        """
+        Update the arrival rate after a successful poll
+
+        Args:
+            new_tickets: Tickets found by the poll
+
+        Returns:
+            Seconds to wait before the next poll
+        """
+        now = time.monotonic()
+        elapsed = now - self._last_poll if self._last_poll is not None else self.interval
+        self._last_poll = now
+        self.consecutive_errors = 0
+
+        observed = new_tickets / max(elapsed, 1e-3)
+        if self.arrival_rate is None:
+            self.arrival_rate = observed
+        else:
+            self.arrival_rate = self.smoothing * observed + (1 - self.smoothing) * self.arrival_rate
+
+        if self.arrival_rate > 0:
+            interval = self.target_per_poll / self.arrival_rate
+            reason = "arrivals"
+        else:
+            interval = self.max_interval
+            reason = "idle"
+        return self._decide(interval, reason, new_tickets)
+
+    def record_error(self) -> float:
+        """Back off exponentially after a failed poll"""
+        self._last_poll = time.monotonic()
+        self.consecutive_errors += 1
+        if self.consecutive_errors == 1:
+            self._error_base = self.interval
+        interval = self._error_base * (2 ** min(self.consecutive_errors, 10))
+        return self._decide(interval, "error_backoff", None)
+
+    def _decide(self, interval: float, reason: str, new_tickets: Optional[int]) -> float:
+        limiter = self.rate_limiter.get_stats()
+        headroom = limiter["headroom_ratio"]
+        if headroom < self.low_headroom_ratio:
+            # Slide towards max_interval as the remaining budget approaches zero
+            pressure = (self.low_headroom_ratio - headroom) / self.low_headroom_ratio
+            interval = interval + (self.max_interval - interval) * pressure
+            reason = "rate_limit"
+        interval = self._clamp(max(interval, limiter["blocked_for_seconds"]))
+
+        self.interval = interval
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        self.decisions.append({
+            "at": datetime.utcnow().isoformat(),
+            "interval_seconds": round(interval, 2),
+            "reason": reason,
+            "new_tickets": new_tickets,
+            "arrival_rate_per_minute": round((self.arrival_rate or 0.0) * 60, 3),
+            "headroom_ratio": headroom,
+            "consecutive_errors": self.consecutive_errors
+        })
+        logger.info(f"[POLLING] ⏱️  Next poll in {interval:.1f}s ({reason})")
+        return interval
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current interval, decision counts and recent decisions"""
+        return {
+            "interval_seconds": round(self.interval, 2),
+            "min_interval_seconds": self.min_interval,
+            "max_interval_seconds": self.max_interval,
+            "arrival_rate_per_minute": round((self.arrival_rate or 0.0) * 60, 3),
+            "consecutive_errors": self.consecutive_errors,
+            "decisions_by_reason": dict(self.reasons),
+            "recent_decisions": list(self.decisions)
+        }
+
+
+def create_poll_scheduler() -> AdaptivePollScheduler:
+    """Scheduler configured from the POLLING_* settings"""
+    return AdaptivePollScheduler(
+        min_interval=config.POLLING_MIN_INTERVAL_SECONDS,
+        max_interval=config.POLLING_MAX_INTERVAL_SECONDS,
+        initial_interval=config.POLLING_INTERVAL_SECONDS,
+        target_per_poll=config.POLLING_TARGET_TICKETS_PER_POLL,
+        smoothing=config.POLLING_RATE_SMOOTHING,
+        low_headroom_ratio=config.POLLING_LOW_HEADROOM_RATIO
+    )
@@ -1,27 +1,86 @@
 """
 Automatic Ticket Polling Service
-Polls FreshService for new tickets and analyzes them automatically
+Polls FreshService for new tickets and queues them for automatic analysis
 """
 import logging
 import asyncio
 from datetime import datetime, timedelta
-from typing import Set
+from typing import List, Dict, Any, Optional, Tuple
 from config import config
-from api.freshservice_client import FreshServiceClient
-from services.ai_analyzer import TicketAnalyzer
-from infrastructure.notifications import SlackNotificationService
+from api.freshservice_client import get_async_freshservice_client
+from infrastructure.integrations.freshservice_integration import build_group_filter_queries, FILTER_MAX_PAGES
+from infrastructure.shared import TicketCacheRepository, RollingWindowDedup, WorkerRegistry, ConsistentHashRing, new_worker_id
+from infrastructure.shared.ticket_cache_repository import parse_timestamp
+from services.analysis_jobs import AnalysisJobWorkerPool, analysis_job_pool, analyzable_ticket
+from services.poll_scheduler import AdaptivePollScheduler, create_poll_scheduler
 
 logger = logging.getLogger(__name__)
 
+# Per-group keys are "<prefix>:<group_id>"; the bare keys hold pre-sharding state
+WATERMARK_KEY = "polling:created_at_watermark"
+RECENT_TICKETS_KEY = "polling:recent_tickets"
+
+
+def watermark_key(group_id: str) -> str:
+    return f"{WATERMARK_KEY}:{group_id}"
+
+
+def recent_tickets_key(group_id: str) -> str:
+    return f"{RECENT_TICKETS_KEY}:{group_id}"
+
+
+class GroupPollState:
+    """Polling progress of one monitored group"""
+    
+    def __init__(self, watermark: datetime, not_before: Optional[datetime] = None):
+        self.watermark = watermark  # Newest created_at already seen
+        self.not_before = not_before  # First run only: ignore tickets from before the start
+        # Tickets already queued, kept for a bounded window behind the watermark
+        self.recent_tickets = RollingWindowDedup(config.POLLING_DEDUP_WINDOW_SECONDS, config.POLLING_DEDUP_MAX_ENTRIES)
+    
+    def cutoff(self) -> datetime:
+        """Tickets created before this were covered by earlier cycles"""
+        # Late-indexed tickets a little behind the watermark still count as new
+        cutoff = self.recent_tickets.horizon(self.watermark)
+        return max(cutoff, self.not_before) if self.not_before else cutoff
+
 
 class TicketPollingService:
-    """Service that polls FreshService for new tickets and analyzes them"""
+    """
+    Service that polls FreshService for new tickets and queues their analysis
     
-    def __init__(self):
-        self.processed_tickets: Set[str] = set()
+    Several processes can run it at once: each holds a heartbeat-renewed
+    lease in the database, and monitored groups are spread over the live
+    workers with a consistent-hash ring. New tickets become jobs in the
+    durable analysis queue before the group's watermark moves past them,
+    so neither a restart nor a failed analysis loses a ticket, and a group
+    that moves to another worker resumes where it stopped.
+    """
+    
+    def __init__(
+        self,
+        repository: Optional[TicketCacheRepository] = None,
+        scheduler: Optional[AdaptivePollScheduler] = None,
+        registry: Optional[WorkerRegistry] = None,
+        job_pool: Optional[AnalysisJobWorkerPool] = None
+    ):
+        self.repository = repository or TicketCacheRepository()
+        self.scheduler = scheduler or create_poll_scheduler()
+        self.registry = registry or WorkerRegistry(config.POLLING_LEASE_SECONDS)
+        self.job_pool = job_pool or analysis_job_pool
+        self.worker_id = new_worker_id()
+        self.live_workers: List[str] = []
+        self.group_states: Dict[str, GroupPollState] = {}
         self.service_start_time = None  # Will be set when service starts
         self.last_check = None
         self.running = False
+        self.heartbeat_task: Optional[asyncio.Task] = None
+        self.queued = 0
+        self.queries_per_cycle = 0
+        self.pages_last_cycle = 0
+        self.pages_max_cycle = 0
+        self.pages_total = 0
+        self.cycles = 0
         
     async def start(self):
         """Start the polling service"""
@@ -34,155 +93,285 @@ class TicketPollingService:
             return
         
         self.running = True
-        self.service_start_time = datetime.now()  # IMPORTANT: Only analyze tickets after this time
+        self.service_start_time = datetime.utcnow()  # UTC, like created_at
         self.last_check = self.service_start_time
         
-        logger.info(f"[POLLING] 🚀 Starting ticket polling service")
+        logger.info(f"[POLLING] 🚀 Starting ticket polling service (worker {self.worker_id})")
         logger.info(f"[POLLING] ⏰ Service started at: {self.service_start_time.isoformat()}")
-        logger.info(f"[POLLING] ⚠️  Will ONLY analyze tickets created AFTER this time")
         logger.info(f"[POLLING] Monitoring groups: {config.AUTO_ANALYZE_GROUP_IDS}")
-        logger.info(f"[POLLING] Check interval: {config.POLLING_INTERVAL_SECONDS} seconds")
+        logger.info(f"[POLLING] Check interval: {config.POLLING_INTERVAL_SECONDS}s, adapting between {config.POLLING_MIN_INTERVAL_SECONDS}s and {config.POLLING_MAX_INTERVAL_SECONDS}s")
+        
+        self.heartbeat_task = asyncio.create_task(self._heartbeat_loop())
         
         while self.running:
             try:
-                await self.check_new_tickets()
-                await asyncio.sleep(config.POLLING_INTERVAL_SECONDS)
+                new_tickets = await self.check_new_tickets()
+                delay = self.scheduler.record_success(new_tickets)
             except Exception as e:
                 logger.error(f"[POLLING] ❌ Error in polling loop: {str(e)}")
-                await asyncio.sleep(60)  # Wait 1 minute on error
+                delay = self.scheduler.record_error()
+            await asyncio.sleep(delay)
+    
+    async def heartbeat(self):
+        """Renew this worker's lease and refresh the set of live workers"""
+        live = await asyncio.to_thread(self.registry.heartbeat, self.worker_id)
+        if live != self.live_workers:
+            logger.info(f"[POLLING] 👥 Live workers: {len(live)} ({', '.join(live)})")
+        self.live_workers = live
+    
+    async def _heartbeat_loop(self):
+        """Keep the lease alive independently of the poll interval"""
+        while self.running:
+            try:
+                await self.heartbeat()
+            except Exception as e:
+                logger.warning(f"[POLLING] ⚠️  Heartbeat failed: {str(e)}")
+            await asyncio.sleep(config.POLLING_HEARTBEAT_SECONDS)
+    
+    def owned_groups(self, group_ids: List[str]) -> List[str]:
+        """Groups this worker polls, by consistent hashing over the live workers"""
+        ring = ConsistentHashRing(self.live_workers or [self.worker_id])
+        return [group_id for group_id in group_ids if ring.get_node(group_id) == self.worker_id]
+    
+    async def load_group_states(self, group_ids: List[str]):
+        """
+        Load persisted progress for groups this worker just took over
+        
+        Groups without saved progress start from the pre-sharding
+        watermark when there is one, otherwise from now (first run: only
+        tickets created after this point are analyzed).
+        """
+        for group_id in list(self.group_states):
+            if group_id not in group_ids:
+                logger.info(f"[POLLING] Group {group_id} moved to another worker")
+                del self.group_states[group_id]
+        
+        new_groups = [group_id for group_id in group_ids if group_id not in self.group_states]
+        if not new_groups:
+            return
+        
+        keys = [WATERMARK_KEY] + [key for g in new_groups for key in (watermark_key(g), recent_tickets_key(g))]
+        saved = await asyncio.to_thread(self.repository.get_states, keys)
+        now = datetime.utcnow()
+        initial = {}
+        
+        for group_id in new_groups:
+            watermark = parse_timestamp(saved.get(watermark_key(group_id))) or parse_timestamp(saved.get(WATERMARK_KEY))
+            if watermark:
+                state = GroupPollState(watermark)
+                state.recent_tickets.loads(saved.get(recent_tickets_key(group_id)))
+                logger.info(f"[POLLING] ⏩ Group {group_id}: resuming from watermark {watermark.isoformat()}")
+            else:
+                state = GroupPollState(now, not_before=now)
+                # Saved right away so downtime before the first new ticket is still covered
+                initial[watermark_key(group_id)] = now.isoformat()
+                logger.info(f"[POLLING] ⚠️  Group {group_id}: first run, will ONLY analyze tickets created AFTER {now.isoformat()}")
+            self.group_states[group_id] = state
+        
+        if initial:
+            await asyncio.to_thread(self.repository.set_states, initial)
     
     def stop(self):
-        """Stop the polling service"""
+        """Stop the polling service and release its lease"""
         logger.info("[POLLING] 🛑 Stopping ticket polling service")
         self.running = False
+        if self.heartbeat_task:
+            self.heartbeat_task.cancel()
+            self.heartbeat_task = None
+        if self.live_workers:
+            try:
+                self.registry.release(self.worker_id)
+            except Exception as e:
+                logger.warning(f"[POLLING] ⚠️  Could not release worker lease: {str(e)}")
+            self.live_workers = []
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Polling and sharding counters for diagnostics (analysis is in /debug/analysis-jobs)"""
+        return {
+            "running": self.running,
+            "worker_id": self.worker_id,
+            "live_workers": self.live_workers,
+            "owned_groups": sorted(self.group_states),
+            "queued": self.queued,
+            "queries_per_cycle": self.queries_per_cycle,
+            "pages_last_cycle": self.pages_last_cycle,
+            "pages_max_cycle": self.pages_max_cycle,
+            "pages_avg_cycle": round(self.pages_total / self.cycles, 2) if self.cycles else 0.0,
+            "watermarks": {group_id: state.watermark.isoformat() for group_id, state in self.group_states.items()},
+            "recent_tickets": sum(len(state.recent_tickets) for state in self.group_states.values()),
+            "last_check": self.last_check.isoformat() if self.last_check else None,
+            "scheduler": self.scheduler.get_stats()
+        }
+    
+    async def _fetch_filter_query(self, client, query: str, watermark: datetime) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get every ticket matching one filter query that is newer than the watermark
+        
+        Results come newest first, so pages are read until one reaches a
+        ticket older than the watermark. Normally that is page 1, or page
+        2 when a full page of tickets arrived since the last cycle.
+        
+        Returns:
+            (tickets, pages fetched)
+        """
+        tickets = []
+        page = 1
+        while True:
+            result = await client.filter_tickets(query, page=page)
+            batch = result.get("tickets", [])
+            tickets.extend(batch)
+            
+            reached_watermark = any(
+                (parse_timestamp(t.get("created_at")) or watermark) < watermark
+                for t in batch
+            )
+            if reached_watermark or not batch or not result.get("has_more"):
+                break
+            if page >= FILTER_MAX_PAGES:
+                logger.warning(f"[POLLING] ⚠️  Filter page limit reached before the watermark; older new tickets may be missed")
+                break
+            page += 1
+        
+        logger.info(f"[POLLING] Found {len(tickets)} tickets over {page} pages for query {query}")
+        return tickets, page
     
-    async def check_new_tickets(self):
-        """Check for new tickets in configured groups"""
+    async def fetch_group_tickets(self, client, group_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get recent tickets for the given groups in as few requests as possible
+        
+        Groups are OR'd into one /tickets/filter query per cycle (split
+        only when the query length limit forces it) and the results are
+        mapped back to their groups locally. Each query pages back to the
+        oldest watermark among its groups.
+        
+        Raises:
+            Exception: If any of the filter requests fails
+        """
+        # Filter dates have day granularity; a day of slack keeps the boundary safe
+        oldest = min(self.group_states[group_id].cutoff() for group_id in group_ids)
+        created_after = (oldest - timedelta(days=1)).strftime("%Y-%m-%d")
+        queries = build_group_filter_queries(group_ids, created_after)
+        self.queries_per_cycle = len(queries)
+        
+        results = await asyncio.gather(*(
+            self._fetch_filter_query(client, query, min(self.group_states[g].watermark for g in groups))
+            for query, groups in queries
+        ))
+        
+        pages = sum(pages for _, pages in results)
+        self.pages_last_cycle = pages
+        self.pages_max_cycle = max(self.pages_max_cycle, pages)
+        self.pages_total += pages
+        self.cycles += 1
+        
+        by_group: Dict[str, List[Dict[str, Any]]] = {group_id: [] for group_id in group_ids}
+        for tickets, _ in results:
+            for ticket in tickets:
+                group_id = str(ticket.get("group_id"))
+                if group_id in by_group:
+                    by_group[group_id].append(ticket)
+        
+        for group_id, tickets in by_group.items():
+            logger.info(f"[POLLING] Found {len(tickets)} recent tickets in group {group_id}")
+        return by_group
+    
+    async def check_new_tickets(self) -> int:
+        """
+        Check for new tickets in the groups assigned to this worker
+        
+        All groups are covered by one filter query (see fetch_group_tickets)
+        and new tickets are only enqueued as analysis jobs, so a tick never
+        waits on analysis backlog. A group's watermark and dedup window are
+        saved only after all of its new tickets are enqueued; if enqueueing
+        fails, the next cycle sees the same tickets again (jobs enqueued
+        twice share one analysis through the idempotency store).
+        
+        Returns:
+            Number of new tickets queued
+        
+        Raises:
+            Exception: If FreshService could not be polled or jobs could not be
+                enqueued, so the scheduler can back off
+        """
         try:
             logger.info("[POLLING] 🔍 Checking for new tickets...")
             
-            client = FreshServiceClient(
-                api_key=config.FRESHSERVICE_API_KEY,
-                domain=config.FRESHSERVICE_DOMAIN
-            )
+            if not self.live_workers:
+                await self.heartbeat()
             
-            # Get configured group IDs
+            # Get configured group IDs and keep the ones hashed to this worker
             group_ids = [g.strip() for g in config.AUTO_ANALYZE_GROUP_IDS if g.strip()]
+            owned = self.owned_groups(group_ids)
+            await self.load_group_states(owned)
+            if not owned:
+                logger.info(f"[POLLING] No groups assigned to this worker ({len(self.live_workers)} live workers)")
+                return 0
+            
+            client = get_async_freshservice_client()
+            by_group = await self.fetch_group_tickets(client, owned)
             
             new_tickets_found = 0
             
-            for group_id in group_ids:
-                logger.info(f"[POLLING] Checking group {group_id}...")
-                
-                # Get tickets for this group (first page only, most recent)
-                result = client.get_tickets(
-                    group_id=int(group_id),
-                    page=1,
-                    per_page=30
-                )
-                
-                tickets = result.get("tickets", [])
-                logger.info(f"[POLLING] Found {len(tickets)} total tickets in group {group_id}")
+            for group_id, tickets in by_group.items():
+                state = self.group_states[group_id]
+                cutoff = state.cutoff()
+                newest = state.watermark
+                new_tickets = []
                 
                 for ticket in tickets:
                     ticket_id = str(ticket.get("id"))
-                    created_at_str = ticket.get("created_at", "")
                     
-                    # Skip if already processed
-                    if ticket_id in self.processed_tickets:
+                    # Skip if already queued
+                    if ticket_id in state.recent_tickets:
                         continue
                     
-                    # CRITICAL: Only analyze tickets created AFTER service started
-                    try:
-                        # Parse ticket creation time
-                        ticket_created = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-                        # Remove timezone info for comparison
-                        ticket_created_naive = ticket_created.replace(tzinfo=None)
-                        
-                        # Check if ticket was created BEFORE service started
-                        if ticket_created_naive < self.service_start_time:
-                            logger.debug(f"[POLLING] ⏭️  Skipping old ticket {ticket_id} (created {ticket_created_naive} < service start {self.service_start_time})")
-                            self.processed_tickets.add(ticket_id)  # Mark as processed to skip next time
-                            continue
-                        
-                        # Check if ticket was created before last check
-                        if ticket_created_naive < self.last_check:
-                            logger.debug(f"[POLLING] ⏭️  Skipping ticket {ticket_id} (created before last check)")
-                            self.processed_tickets.add(ticket_id)
-                            continue
-                            
-                    except Exception as e:
-                        logger.warning(f"[POLLING] ⚠️  Could not parse date for ticket {ticket_id}: {e}")
-                        # If we can't parse the date, skip this ticket to be safe
-                        self.processed_tickets.add(ticket_id)
+                    ticket_created = parse_timestamp(ticket.get("created_at"))
+                    if ticket_created is None:
+                        logger.warning(f"[POLLING] ⚠️  Could not parse date for ticket {ticket_id}, skipping")
+                        # Remember it so the warning isn't repeated every cycle
+                        state.recent_tickets.add(ticket_id, state.watermark)
                         continue
                     
-                    # New ticket found!
-                    logger.info(f"[POLLING] 🆕 NEW TICKET DETECTED: {ticket_id} (created at {ticket_created_naive})")
-                    new_tickets_found += 1
-                    
-                    # Analyze ticket
-                    await self.analyze_ticket(ticket_id, group_id, ticket)
+                    # Older than the window: covered by a previous cycle (or before the first start)
+                    if ticket_created < cutoff:
+                        logger.debug(f"[POLLING] ⏭️  Skipping old ticket {ticket_id} (created {ticket_created} < {cutoff})")
+                        continue
                     
-                    # Mark as processed
-                    self.processed_tickets.add(ticket_id)
+                    # New ticket found!
+                    logger.info(f"[POLLING] 🆕 NEW TICKET DETECTED: {ticket_id} (created at {ticket_created})")
+                    new_tickets.append((ticket_id, ticket_created, ticket))
+                
+                # Persist the jobs first; only then may progress move past these tickets
+                for ticket_id, ticket_created, ticket in new_tickets:
+                    await self.job_pool.enqueue(ticket_id, group_id, source="poller", ticket=analyzable_ticket(ticket))
+                    state.recent_tickets.add(ticket_id, ticket_created)
+                    newest = max(newest, ticket_created)
+                queued = len(new_tickets)
+                self.queued += queued
+                
+                # Everything up to the newest ticket seen has now been covered
+                state.watermark = newest
+                state.recent_tickets.prune(state.watermark)
+                if queued:
+                    await asyncio.to_thread(self.repository.set_states, {
+                        watermark_key(group_id): state.watermark.isoformat(),
+                        recent_tickets_key(group_id): state.recent_tickets.dumps()
+                    })
+                new_tickets_found += queued
             
             # Update last check time
-            self.last_check = datetime.now()
+            self.last_check = datetime.utcnow()
             
             if new_tickets_found > 0:
-                logger.info(f"[POLLING] ✅ Processed {new_tickets_found} new tickets")
+                logger.info(f"[POLLING] ✅ Queued {new_tickets_found} new tickets for analysis")
             else:
-                logger.info(f"[POLLING] ✅ No new tickets (only tickets created after {self.service_start_time.strftime('%Y-%m-%d %H:%M:%S')} will be analyzed)")
-                
-        except Exception as e:
-            logger.error(f"[POLLING] ❌ Error checking tickets: {str(e)}")
-    
-    async def analyze_ticket(self, ticket_id: str, group_id: str, ticket_data: dict = None):
-        """Analyze a ticket and send to Slack"""
-        try:
-            logger.info(f"[POLLING] 🤖 Analyzing ticket {ticket_id}...")
+                logger.info(f"[POLLING] ✅ No new tickets in {len(owned)} groups")
             
-            # If we don't have full ticket data, fetch it
-            if not ticket_data or not ticket_data.get("description"):
-                client = FreshServiceClient(
-                    api_key=config.FRESHSERVICE_API_KEY,
-                    domain=config.FRESHSERVICE_DOMAIN
-                )
-                ticket_data = client.get_ticket(ticket_id)
-                
-                if not ticket_data:
-                    logger.error(f"[POLLING] ❌ Could not fetch ticket {ticket_id}")
-                    return
-            
-            # Analyze ticket
-            analyzer = TicketAnalyzer()
-            analysis = analyzer.analyze_ticket(ticket_data)
-            
-            if analysis.get("status") != "success":
-                logger.error(f"[POLLING] ❌ Analysis failed for ticket {ticket_id}")
-                return
-            
-            logger.info(f"[POLLING] ✅ Analysis complete for ticket {ticket_id}")
-            
-            # Send to Slack
-            if config.SLACK_WEBHOOK_URL:
-                slack_service = SlackNotificationService(config.SLACK_WEBHOOK_URL)
-                success = slack_service.send_ticket_analysis(
-                    ticket_id,
-                    analysis["analysis"],
-                    domain=config.FRESHSERVICE_DOMAIN
-                )
-                
-                if success:
-                    logger.info(f"[POLLING] 📨 Slack notification sent for ticket {ticket_id}")
-                else:
-                    logger.error(f"[POLLING] ❌ Failed to send Slack notification")
-            else:
-                logger.warning(f"[POLLING] ⚠️ Slack webhook not configured")
+            return new_tickets_found
                 
         except Exception as e:
-            logger.error(f"[POLLING] ❌ Error analyzing ticket {ticket_id}: {str(e)}")
+            logger.error(f"[POLLING] ❌ Error checking tickets: {str(e)}")
+            raise
 
 
 # Global polling service instance
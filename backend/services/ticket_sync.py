@@ -0,0 +1,171 @@
+"""
+Incremental Ticket Sync Service
+Mirrors FreshService tickets into the local tickets_cache table
+"""
+import logging
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Set
+from config import config
+from api.freshservice_client import get_freshservice_client
+from infrastructure.shared import TicketCacheRepository
+from infrastructure.search import TicketSearchIndex, ticket_search_index
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_KEY = "ticket_sync:updated_since"
+LAST_FULL_SYNC_KEY = "ticket_sync:last_full_sync"
+
+
+class TicketSyncService:
+    """Service that keeps tickets_cache in step with FreshService"""
+
+    def __init__(self, repository: Optional[TicketCacheRepository] = None, search_index: Optional[TicketSearchIndex] = None):
+        self.repository = repository or TicketCacheRepository()
+        self.search_index = search_index
+        self.running = False
+        self.cycles = 0
+        self.last_result: Optional[Dict[str, Any]] = None
+        self._ready = False
+        # Held for the whole of a sync; POST /sync and the sync loop must not overlap
+        self._sync_lock = threading.Lock()
+
+    def is_syncing(self) -> bool:
+        """Whether a sync is running right now"""
+        return self._sync_lock.locked()
+
+    def sync_once(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Pull changed tickets and upsert them into the mirror
+
+        Incremental runs ask FreshService only for tickets updated since
+        the persisted watermark, oldest first, and advance the watermark
+        with every committed batch so an interrupted run resumes where it
+        stopped. A full run rescans every ticket and removes cached
+        tickets that no longer exist upstream.
+
+        FreshService pages by offset, so a ticket updated mid-run moves
+        to the end of the result and can shift another ticket past a
+        page boundary. The watermark therefore never passes the run's
+        start minus TICKET_SYNC_OVERLAP_SECONDS: anything updated while
+        the run was paging is fetched again by the next run.
+
+        Only one sync runs at a time; a call made while another is
+        running returns at once without syncing.
+
+        Args:
+            full: Rescan everything and reconcile deletions
+
+        Returns:
+            Summary of the run ("skipped" when another sync was running)
+        """
+        if not self._sync_lock.acquire(blocking=False):
+            logger.info(f"[SYNC] Sync already running, skipping {'full' if full else 'incremental'} sync")
+            return {"mode": "full" if full else "incremental", "skipped": True}
+        try:
+            return self._sync(full)
+        finally:
+            self._sync_lock.release()
+
+    def _sync(self, full: bool) -> Dict[str, Any]:
+        started = datetime.utcnow()
+        # Same format as FreshService's updated_at, so plain string comparison orders them
+        overlap_start = (started - timedelta(seconds=config.TICKET_SYNC_OVERLAP_SECONDS)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        watermark = self.repository.get_state(WATERMARK_KEY)
+        if watermark and not full and self.search_index and self.search_index.count() == 0:
+            logger.info("[SYNC] Search index is empty, rescanning to build it")
+            full = True
+        since = config.TICKET_SYNC_INITIAL_SINCE if full or not watermark else watermark
+        logger.info(f"[SYNC] 🔄 Starting {'full' if full else 'incremental'} sync (updated_since={since})")
+
+        client = get_freshservice_client()
+        batch = []
+        seen: Set[int] = set()
+        upserted = 0
+        newest = watermark
+
+        def flush():
+            nonlocal upserted, batch
+            state = {WATERMARK_KEY: min(newest, overlap_start)} if newest else None
+            upserted += self.repository.upsert_tickets(batch, state=state)
+            if self.search_index:
+                self.search_index.index_tickets(batch)
+            batch = []
+
+        for ticket in client.iter_tickets(updated_since=since, order_by="updated_at", order_type="asc"):
+            batch.append(ticket)
+            if full:
+                seen.add(ticket.get("id"))
+            updated_at = ticket.get("updated_at")
+            if updated_at and (newest is None or updated_at > newest):
+                newest = updated_at
+            if len(batch) >= config.TICKET_SYNC_BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+
+        deleted = 0
+        if full:
+            deleted_ids = self.repository.delete_missing(seen)
+            if self.search_index:
+                self.search_index.delete_tickets(deleted_ids)
+            deleted = len(deleted_ids)
+            self.repository.upsert_tickets([], state={LAST_FULL_SYNC_KEY: started.isoformat()})
+
+        result = {
+            "mode": "full" if full else "incremental",
+            "updated_since": since,
+            "upserted": upserted,
+            "deleted": deleted,
+            "watermark": min(newest, overlap_start) if newest else None,
+            "started_at": started.isoformat(),
+            "duration_seconds": round((datetime.utcnow() - started).total_seconds(), 2)
+        }
+        self.last_result = result
+        logger.info(f"[SYNC] ✅ Sync complete: {upserted} upserted, {deleted} deleted, watermark={result['watermark']}")
+        return result
+
+    def is_ready(self) -> bool:
+        """Whether the mirror has completed at least one sync"""
+        if not self._ready:
+            self._ready = self.repository.get_state(WATERMARK_KEY) is not None
+        return self._ready
+
+    def get_status(self) -> Dict[str, Any]:
+        """Current sync state for diagnostics"""
+        return {
+            "running": self.running,
+            "syncing": self.is_syncing(),
+            "cycles": self.cycles,
+            "watermark": self.repository.get_state(WATERMARK_KEY),
+            "last_full_sync": self.repository.get_state(LAST_FULL_SYNC_KEY),
+            "last_result": self.last_result
+        }
+
+    async def start(self):
+        """Run sync cycles in the background until stopped"""
+        if not config.TICKET_SYNC_ENABLED:
+            logger.info("[SYNC] Ticket sync is disabled, not starting sync service")
+            return
+
+        self.running = True
+        logger.info(f"[SYNC] 🚀 Starting ticket sync service (interval {config.TICKET_SYNC_INTERVAL_SECONDS}s)")
+
+        while self.running:
+            try:
+                full = self.cycles % config.TICKET_SYNC_RECONCILE_EVERY == 0 and self.cycles > 0
+                await asyncio.to_thread(self.sync_once, full)
+            except Exception as e:
+                logger.error(f"[SYNC] ❌ Error in sync loop: {str(e)}")
+            self.cycles += 1
+            await asyncio.sleep(config.TICKET_SYNC_INTERVAL_SECONDS)
+
+    def stop(self):
+        """Stop the sync service"""
+        logger.info("[SYNC] 🛑 Stopping ticket sync service")
+        self.running = False
+
+
+# Global sync service instance
+ticket_sync_service = TicketSyncService(search_index=ticket_search_index)
@@ -0,0 +1,21 @@
+"""
+Shared test fixtures
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from infrastructure.shared.database_models import Base
+
+
+@pytest.fixture
+def engine():
+    """Create an empty in-memory database shared by every session"""
+    return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+@pytest.fixture
+def session_factory(engine):
+    """Create all tables on the in-memory database and return its session factory"""
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
@@ -0,0 +1,108 @@
+"""
+Tests for the content-addressed analysis cache
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+from infrastructure.shared.database_models import AnalysisLog
+from infrastructure.shared import AnalysisResultCache, TicketAnalysisRepository
+from services.ai_analyzer import TicketAnalyzer
+from services.analysis_idempotency import IdempotentAnalysisService
+
+TICKET = {"id": 101, "subject": "VPN down", "description": "<p>Cannot connect</p>"}
+
+
+def make_analyzer(cache, model_id="model-a"):
+    """Create an analyzer whose provider counts its calls"""
+    provider = Mock()
+    provider.client = Mock()
+    provider.model_id = model_id
+    provider.analyze.side_effect = lambda system, prompt: {
+        "summary": f"call {provider.analyze.call_count}",
+        "possible_categories": [{"category": "Network", "confidence": "high", "reason": "VPN"}]
+    }
+    provider.analyze_async = AsyncMock(side_effect=lambda system, prompt, timeout: provider.analyze(system, prompt))
+    return TicketAnalyzer(provider=provider, cache=cache)
+
+
+def test_same_content_is_served_from_cache(session_factory):
+    """Test a repeat analysis, even of another ticket with the same text, skips the model"""
+    analyzer = make_analyzer(AnalysisResultCache(session_factory=session_factory))
+
+    first = analyzer.analyze_ticket(dict(TICKET))
+    second = analyzer.analyze_ticket({**TICKET, "id": 102, "description_text": "Cannot  connect"})
+
+    assert analyzer.provider.analyze.call_count == 1
+    assert second["analysis"] == first["analysis"]
+    assert second["cached"] is True and second["ticket_id"] == 102
+
+
+def test_cache_survives_restart_in_analysis_logs(session_factory):
+    """Test a new process reads the stored result and the row holds the full JSON"""
+    make_analyzer(AnalysisResultCache(session_factory=session_factory)).analyze_ticket(dict(TICKET))
+
+    cache = AnalysisResultCache(session_factory=session_factory)
+    restarted = make_analyzer(cache)
+    result = restarted.analyze_ticket(dict(TICKET))
+
+    assert restarted.provider.analyze.call_count == 0
+    assert result["cached"] is True
+    assert cache.get_stats()["hits"] == {"memory": 0, "database": 1}
+    with session_factory() as db:
+        row = db.query(AnalysisLog).one()
+    assert row.ticket_id == 101 and row.model_id == "model-a" and row.classification == "Network"
+    assert json.loads(row.result) == result["analysis"]
+
+
+def test_model_change_and_content_change_miss_the_cache(session_factory):
+    """Test the key covers the model id and the ticket text"""
+    cache = AnalysisResultCache(session_factory=session_factory)
+    make_analyzer(cache).analyze_ticket(dict(TICKET))
+
+    other_model = make_analyzer(cache, model_id="model-b")
+    other_model.analyze_ticket(dict(TICKET))
+    other_model.analyze_ticket({**TICKET, "subject": "VPN still down"})
+
+    assert other_model.provider.analyze.call_count == 2
+
+
+def test_force_bypasses_and_refreshes_cache(session_factory):
+    """Test force=True calls the model and later lookups get the new result"""
+    analyzer = make_analyzer(AnalysisResultCache(session_factory=session_factory))
+    analyzer.analyze_ticket(dict(TICKET))
+
+    forced = analyzer.analyze_ticket(dict(TICKET), force=True)
+    again = analyzer.analyze_ticket(dict(TICKET))
+
+    assert analyzer.provider.analyze.call_count == 2
+    assert forced["cached"] is False
+    assert again["analysis"]["summary"] == forced["analysis"]["summary"] == "call 2"
+    with session_factory() as db:
+        assert db.query(AnalysisLog).count() == 1
+
+
+def test_memory_is_bounded_by_lru():
+    """Test the least recently used entry is evicted first"""
+    cache = AnalysisResultCache(max_entries=2, session_factory=None)
+    cache.put("a", {"summary": "a"})
+    cache.put("b", {"summary": "b"})
+    cache.get("a")
+    cache.put("c", {"summary": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"summary": "a"} and cache.get("c") == {"summary": "c"}
+
+
+@pytest.mark.asyncio
+async def test_forced_service_analysis_replaces_cached_result(session_factory):
+    """Test force=True through the service skips the cache and caches the new analysis"""
+    analyzer = make_analyzer(AnalysisResultCache(session_factory=session_factory))
+    service = IdempotentAnalysisService(TicketAnalysisRepository(session_factory), analyzer_factory=lambda: analyzer)
+
+    await service.analyze(dict(TICKET))
+    forced = await service.analyze(dict(TICKET), force=True)
+    reused = await service.analyze(dict(TICKET))
+
+    assert analyzer.provider.analyze.call_count == 2
+    assert forced["reused"] is False
+    assert reused["reused"] is True and reused["analysis"]["summary"] == "call 2"
@@ -0,0 +1,111 @@
+"""
+Tests for idempotent ticket analysis shared by all triggers
+"""
+import asyncio
+import threading
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from infrastructure.shared import TicketAnalysisRepository, AnalysisResultCache
+from services.ai_analyzer import TicketAnalyzer
+from services.analysis_idempotency import IdempotentAnalysisService, NOTIFY_SENT, NOTIFY_DUPLICATE, NOTIFY_FAILED
+
+TICKET = {"id": 101, "subject": "VPN down", "description": "<p>Cannot connect</p>"}
+
+
+@pytest.fixture
+def repository(session_factory):
+    """Create a notification claim repository on the in-memory database"""
+    return TicketAnalysisRepository(session_factory)
+
+
+@pytest.fixture
+def provider():
+    """Create a slow provider that counts its calls"""
+    lock = threading.Lock()
+    provider = Mock()
+    provider.client = Mock()
+    provider.model_id = "model-a"
+    provider.calls = 0
+
+    async def analyze_async(system_prompt, user_prompt, timeout):
+        with lock:
+            provider.calls += 1
+        await asyncio.sleep(0.05)
+        return {"summary": user_prompt.split("TICKET SUBJECT: ")[1].split("\n")[0]}
+
+    provider.analyze_async = AsyncMock(side_effect=analyze_async)
+    return provider
+
+
+def make_service(repository, provider, session_factory):
+    """Create a service as a fresh process would, sharing only the database"""
+    analyzer = TicketAnalyzer(provider=provider, cache=AnalysisResultCache(session_factory=session_factory))
+    return IdempotentAnalysisService(repository, analyzer_factory=lambda: analyzer)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_join_one_analysis(repository, provider, session_factory):
+    """Test simultaneous triggers for the same ticket share one Bedrock call"""
+    service = make_service(repository, provider, session_factory)
+
+    results = await asyncio.gather(*(service.analyze(dict(TICKET)) for _ in range(3)))
+
+    assert provider.calls == 1
+    assert all(result["analysis"] == {"summary": "VPN down"} for result in results)
+
+
+@pytest.mark.asyncio
+async def test_completed_analysis_is_reused_until_content_changes(repository, provider, session_factory):
+    """Test later triggers (any process) get the stored result; an edit re-analyzes"""
+    await make_service(repository, provider, session_factory).analyze(TICKET)
+    other_process = make_service(repository, provider, session_factory)
+
+    reused = await other_process.analyze(TICKET)
+    edited = await other_process.analyze({**TICKET, "subject": "VPN still down"})
+
+    assert reused["reused"] is True and reused["analysis"] == {"summary": "VPN down"}
+    assert edited["reused"] is False
+    assert provider.calls == 2
+    assert other_process.get_stats()["reused"] == 1
+
+
+@pytest.mark.asyncio
+async def test_prompt_or_model_change_re_analyzes(repository, provider, session_factory):
+    """Test a new prompt version or model id is not served the old result"""
+    await make_service(repository, provider, session_factory).analyze(TICKET)
+
+    with patch('services.ai_analyzer.TICKET_ANALYSIS_PROMPT_VERSION', "2"):
+        new_prompt = await make_service(repository, provider, session_factory).analyze(TICKET)
+    provider.model_id = "model-b"
+    new_model = await make_service(repository, provider, session_factory).analyze(TICKET)
+
+    assert new_prompt["reused"] is False and new_model["reused"] is False
+    assert provider.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_analysis_is_not_stored(repository, provider, session_factory):
+    """Test an error result is retried by the next trigger"""
+    provider.analyze_async.side_effect = RuntimeError("throttled")
+    service = make_service(repository, provider, session_factory)
+
+    await service.analyze(TICKET)
+    await service.analyze(TICKET)
+
+    assert provider.analyze_async.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_slack_is_notified_once_per_content(repository, provider, session_factory):
+    """Test duplicate triggers don't repeat the Slack message, and a failed send can be retried"""
+    service = make_service(repository, provider, session_factory)
+    analysis = await service.analyze(TICKET)
+    slack = Mock()
+    slack.send_ticket_analysis.side_effect = [False, True]
+
+    with patch('services.analysis_idempotency.config.SLACK_WEBHOOK_URL', "https://hooks.slack.test"), \
+            patch('services.analysis_idempotency.SlackNotificationService', return_value=slack):
+        outcomes = [await service.notify_slack(TICKET, analysis) for _ in range(3)]
+
+    assert outcomes == [NOTIFY_FAILED, NOTIFY_SENT, NOTIFY_DUPLICATE]
+    assert slack.send_ticket_analysis.call_count == 2
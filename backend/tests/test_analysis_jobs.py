@@ -0,0 +1,293 @@
+"""
+Tests for the durable analysis job queue
+"""
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+from infrastructure.shared import AnalysisJobRepository, JOB_PENDING, JOB_DEAD
+from fastapi import HTTPException
+from services.analysis_jobs import AnalysisJobWorkerPool
+from services.admission_control import WebhookAdmissionController
+
+
+@pytest.fixture
+def repository(session_factory):
+    """Create a job repository on an in-memory database"""
+    return AnalysisJobRepository(
+        visibility_timeout=60,
+        max_attempts=3,
+        retry_base_seconds=10,
+        retry_max_seconds=25,
+        session_factory=session_factory
+    )
+
+
+def later(seconds):
+    """Patch the repository clock forward"""
+    clock = patch('infrastructure.shared.analysis_job_repository.datetime')
+    mock = clock.start()
+    mock.utcnow.return_value = datetime.utcnow() + timedelta(seconds=seconds)
+    return clock
+
+
+def test_claim_is_exclusive_and_complete_removes_job(repository):
+    """Test a claimed job is hidden from other workers until completed"""
+    first = repository.enqueue("101", "1")
+    repository.enqueue("102", "1")
+
+    job = repository.claim("worker-a")
+    other = repository.claim("worker-b")
+
+    assert job["id"] == first and job["attempts"] == 1
+    assert other["ticket_id"] == "102"
+    assert repository.claim("worker-c") is None
+    assert repository.complete(job["id"], "worker-a")
+    assert repository.get_stats()["done"] == 1
+
+
+def test_expired_visibility_timeout_makes_job_claimable_again(repository):
+    """Test a job held by a crashed worker is reclaimed and the old claim is void"""
+    repository.enqueue("101")
+    job = repository.claim("worker-a")
+
+    clock = later(61)
+    try:
+        reclaimed = repository.claim("worker-b")
+    finally:
+        clock.stop()
+
+    assert reclaimed["id"] == job["id"] and reclaimed["attempts"] == 2
+    assert not repository.complete(job["id"], "worker-a")
+    assert repository.complete(job["id"], "worker-b")
+
+
+def test_failures_back_off_exponentially_then_dead_letter(repository):
+    """Test retries wait 10s then 20s and the third failure dead-letters the job"""
+    repository.enqueue("101")
+    delays = []
+
+    for attempt in range(3):
+        clock = later(sum(delays) + attempt * 0.001)
+        try:
+            job = repository.claim("worker-a")
+            status = repository.fail(job["id"], "worker-a", "Bedrock throttled")
+        finally:
+            clock.stop()
+        delays.append(repository.retry_delay(job["attempts"]))
+
+    assert delays[:2] == [10, 20]
+    assert repository.retry_delay(3) == 25
+    assert status == JOB_DEAD
+    assert repository.get_stats()["dead"] == 1
+    assert repository.get_dead_jobs()[0]["last_error"] == "Bedrock throttled"
+
+
+def test_failed_job_waits_for_backoff(repository):
+    """Test a failed job is delayed, not immediately claimable"""
+    repository.enqueue("101")
+    job = repository.claim("worker-a")
+
+    assert repository.fail(job["id"], "worker-a", "boom") == JOB_PENDING
+    assert repository.claim("worker-a") is None
+    assert repository.get_stats()["delayed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_runs_enqueued_jobs_and_retries_failures(repository):
+    """Test enqueue wakes the workers and a failing handler leaves the job for retry"""
+    seen = []
+
+    async def handler(job):
+        seen.append(job["ticket_id"])
+        if job["ticket_id"] == "bad":
+            raise RuntimeError("boom")
+
+    # One worker: the in-memory database is a single connection shared across threads
+    pool = AnalysisJobWorkerPool(repository=repository, handler=handler, concurrency=1)
+    with patch('services.analysis_jobs.config.ANALYSIS_JOB_POLL_SECONDS', 0.05):
+        pool.start()
+        try:
+            await pool.enqueue("good", "1")
+            await pool.enqueue("bad", "1")
+            for _ in range(500):
+                if pool.completed + pool.retried == 2:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await pool.stop()
+
+    assert sorted(seen) == ["bad", "good"]
+    assert pool.completed == 1 and pool.retried == 1
+    stats = repository.get_stats()
+    assert stats["done"] == 1 and stats["delayed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_workers_to_hand_back_held_jobs(repository):
+    """Test a job held at shutdown is back in the queue by the time stop() returns"""
+    started = asyncio.Event()
+
+    async def handler(job):
+        started.set()
+        await asyncio.sleep(10)
+
+    pool = AnalysisJobWorkerPool(repository=repository, handler=handler, concurrency=1)
+    pool.start()
+    await pool.enqueue("slow", "1")
+    await asyncio.wait_for(started.wait(), timeout=5)
+
+    await pool.stop()
+
+    assert pool.workers == []
+    job = repository.claim("worker-b")
+    assert job["ticket_id"] == "slow" and job["attempts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_webhook_enqueues_instead_of_running_analysis():
+    """Test the ticket-created webhook returns once the job is persisted"""
+    from api.routes import webhooks
+
+    request = AsyncMock()
+    request.json.return_value = {"ticket_changes": {"id": 101, "group_id": 1}}
+
+    admission = WebhookAdmissionController(Mock(), 10, 10, 1.0, 30)
+    admission.repository.outstanding_by_group.return_value = {}
+
+    with patch.object(webhooks.analysis_job_pool, 'enqueue', AsyncMock(return_value=7)) as enqueue, \
+            patch.object(webhooks, 'webhook_admission', admission), \
+            patch('api.routes.webhooks.config.AUTO_ANALYZE_GROUP_IDS', ["1"]), \
+            patch('api.routes.webhooks.invalidate_ticket_lists'):
+        result = await webhooks.ticket_created_webhook(request)
+
+    enqueue.assert_awaited_once_with(101, 1, source="webhook", ticket=None)
+    assert result["job_id"] == 7
+
+
+@pytest.mark.asyncio
+async def test_webhook_payload_with_ticket_fields_skips_get_ticket(repository):
+    """Test a payload carrying subject and description is analyzed without a fetch"""
+    from api.routes import webhooks
+    from services import analysis_jobs
+
+    changes = {"id": 101, "group_id": 1, "subject": "VPN down", "description": "<p>Cannot connect</p>"}
+    request = AsyncMock()
+    request.json.return_value = {"ticket_changes": changes}
+    pool = AnalysisJobWorkerPool(repository=repository)
+    client = AsyncMock()
+    analysis = AsyncMock()
+    analysis.analyze.return_value = {"status": "success", "analysis": {}}
+
+    with patch.object(webhooks, 'analysis_job_pool', pool), \
+            patch.object(webhooks, 'webhook_admission', WebhookAdmissionController(repository, 10, 10, 1.0, 30)), \
+            patch('api.routes.webhooks.config.AUTO_ANALYZE_GROUP_IDS', ["1"]), \
+            patch('api.routes.webhooks.invalidate_ticket_lists'), \
+            patch.object(analysis_jobs, 'idempotent_analysis', analysis), \
+            patch('services.analysis_jobs.get_async_freshservice_client', return_value=client):
+        await webhooks.ticket_created_webhook(request)
+        request.json.return_value = {"ticket_changes": {"id": 102, "group_id": 1}}
+        await webhooks.ticket_created_webhook(request)
+
+        for _ in range(2):
+            await analysis_jobs.analyze_ticket_job(repository.claim("worker-a"))
+
+    analyzed = [call.args[0] for call in analysis.analyze.await_args_list]
+    assert analyzed[0] == changes
+    client.get_ticket.assert_awaited_once_with("102")
+
+
+def test_blank_payload_fields_are_fetched_instead_of_analyzed():
+    """Test a payload with an empty subject or null description isn't taken as the ticket"""
+    from services.analysis_jobs import analyzable_ticket
+
+    assert analyzable_ticket({"id": 1, "subject": "VPN down", "description": None}) is None
+    assert analyzable_ticket({"id": 1, "subject": "VPN down", "description": "", "description_text": ""}) is None
+    assert analyzable_ticket({"id": 1, "subject": "", "description": "<p>Cannot connect</p>"}) is None
+    ticket = {"id": 1, "subject": "VPN down", "description": None, "description_text": "Cannot connect"}
+    assert analyzable_ticket(ticket) is ticket
+
+
+def test_payload_html_and_fetched_text_hash_alike():
+    """Test a webhook's HTML description and the fetched description_text are the same analysis input"""
+    from services.analysis_jobs import analyzable_ticket
+    from infrastructure.shared.text import ticket_content_hash, analysis_cache_key
+
+    payload = analyzable_ticket({
+        "id": 101,
+        "subject": "VPN down",
+        "description": (
+            '<div dir="ltr"><div>Hi team,</div><div><br></div>'
+            "<p>I can&rsquo;t connect to the VPN&nbsp;since 9am.</p>"
+            "<ul><li>Windows&nbsp;11</li><li>Client <b>v5.2</b></li></ul>"
+            "<div>Thanks &amp; regards</div></div>"
+        )
+    })
+    fetched = {
+        "id": 101,
+        "subject": "VPN down",
+        "description": "<p>ignored when description_text is present</p>",
+        "description_text": "Hi team,\n\nI can\u2019t connect to the VPN since 9am.\n\nWindows 11\nClient v5.2\n\nThanks & regards"
+    }
+
+    assert ticket_content_hash(payload) == ticket_content_hash(fetched)
+    assert analysis_cache_key(payload, "1", "model-a") == analysis_cache_key(fetched, "1", "model-a")
+
+
+def test_claim_takes_turns_between_groups(repository):
+    """Test a backlog in one group doesn't delay another group's job"""
+    for n in range(5):
+        repository.enqueue(f"noisy-{n}", "1")
+    repository.enqueue("quiet", "2")
+
+    claimed = [repository.claim("worker-a")["ticket_id"] for _ in range(3)]
+
+    assert claimed == ["noisy-0", "quiet", "noisy-1"]
+
+
+@pytest.mark.asyncio
+async def test_webhook_sheds_load_with_retry_after(repository):
+    """Test 429 + Retry-After for a full queue, a group over its share, and too many in flight"""
+    from api.routes import webhooks
+
+    admission = WebhookAdmissionController(repository, max_in_flight=1, max_queue_depth=4, group_share=0.5, retry_after_seconds=30)
+    pool = AnalysisJobWorkerPool(repository=repository)
+
+    async def send(ticket_id, group_id):
+        request = AsyncMock()
+        request.json.return_value = {"ticket_changes": {"id": ticket_id, "group_id": group_id}}
+        try:
+            return (await webhooks.ticket_created_webhook(request))["status"]
+        except HTTPException as e:
+            assert e.headers["Retry-After"] == "30"
+            return e.status_code
+
+    with patch.object(webhooks, 'analysis_job_pool', pool), \
+            patch.object(webhooks, 'webhook_admission', admission), \
+            patch('api.routes.webhooks.config.AUTO_ANALYZE_GROUP_IDS', []), \
+            patch('api.routes.webhooks.invalidate_ticket_lists'):
+        noisy = [await send(n, 1) for n in range(1, 4)]
+        others = [await send(10, 2), await send(11, 3), await send(12, 4)]
+
+        admission.in_flight = 1
+        busy = await send(13, 5)
+
+    assert noisy == ["ok", "ok", 429]
+    assert others == ["ok", "ok", 429]
+    assert busy == 429
+    assert admission.get_stats()["rejected"] == {"in_flight": 1, "queue_depth": 1, "group_share": 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_admissions_reserve_queue_slots(repository):
+    """Test requests checked before any of them enqueued can't overshoot the queue depth"""
+    admission = WebhookAdmissionController(repository, max_in_flight=10, max_queue_depth=2, group_share=1.0, retry_after_seconds=30)
+
+    decisions = await asyncio.gather(*(admission.check_queue("1") for _ in range(4)))
+    for _ in range(2):
+        repository.enqueue("101", "1")
+        admission.release_queue_slot("1")
+
+    assert decisions.count(None) == 2
+    assert await admission.check_queue("1") is not None
+    assert admission.get_stats()["reserved"] == 0
@@ -0,0 +1,132 @@
+"""
+Tests for streaming ticket analysis
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from infrastructure.shared import TicketAnalysisRepository, JSONObjectFieldParser, AnalysisResultCache
+from infrastructure.ai_providers import BedrockAIProvider
+from services.ai_analyzer import TicketAnalyzer
+from services.analysis_idempotency import IdempotentAnalysisService
+
+TICKET = {"id": 101, "subject": "VPN down", "description": "<p>Cannot connect</p>"}
+
+ANALYSIS = {
+    "summary": "User cannot connect to the VPN",
+    "possible_categories": [{"category": "Network", "confidence": "high", "reason": "VPN"}],
+    "user_sentiment": {"overall_feeling": "frustrated", "indicators": [], "urgency_level": "high"}
+}
+
+ANSWER = "Here is the analysis:\n```json\n" + json.dumps(ANALYSIS, indent=2) + "\n```"
+
+
+def chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def bedrock_stream(text, size=5):
+    """Mock invoke_model_with_response_stream events for a text answer"""
+    events = [{"chunk": {"bytes": json.dumps({"type": "message_start"}).encode()}}]
+    for piece in chunks(text, size):
+        delta = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": piece}}
+        events.append({"chunk": {"bytes": json.dumps(delta).encode()}})
+    events.append({"chunk": {"bytes": json.dumps({"type": "message_stop"}).encode()}})
+    return {"body": iter(events)}
+
+
+@pytest.fixture
+def provider():
+    """Create a provider whose client streams ANSWER"""
+    provider = BedrockAIProvider("key", "secret", max_concurrency=2)
+    provider.client = Mock()
+    provider.client.invoke_model_with_response_stream.side_effect = lambda **kwargs: bedrock_stream(ANSWER)
+    yield provider
+    provider.close()
+
+
+@pytest.mark.parametrize("size", [1, 3, 7])
+def test_field_parser_emits_fields_as_they_complete(size):
+    """Test each field is emitted once its value is closed, in document order"""
+    parser = JSONObjectFieldParser()
+    emitted = []
+    fed = ""
+
+    for piece in chunks(ANSWER, size):
+        fed += piece
+        for field, value in parser.feed(piece):
+            emitted.append(field)
+            assert value == ANALYSIS[field]
+            # The summary is available long before the model finishes writing
+            if field == "summary":
+                assert len(fed) < ANSWER.index("user_sentiment")
+
+    assert emitted == list(ANALYSIS)
+    assert parser.done and parser.fields == ANALYSIS
+
+
+@pytest.mark.asyncio
+async def test_analyzer_streams_fields_then_complete(provider):
+    """Test stream_analysis yields field events then the usual success result"""
+    analyzer = TicketAnalyzer(provider=provider, cache=AnalysisResultCache(session_factory=None))
+
+    events = [event async for event in analyzer.stream_analysis(dict(TICKET))]
+
+    assert [event["field"] for event in events[:-1]] == list(ANALYSIS)
+    assert events[-1]["event"] == "complete"
+    assert events[-1]["result"] == {"status": "success", "ticket_id": 101, "analysis": ANALYSIS, "cached": False}
+    kwargs = provider.client.invoke_model_with_response_stream.call_args.kwargs
+    assert kwargs["modelId"] == provider.model_id
+
+
+@pytest.mark.asyncio
+async def test_analyzer_stream_error_becomes_error_result(provider):
+    """Test a failing stream ends with an error result instead of raising"""
+    provider.client.invoke_model_with_response_stream.side_effect = RuntimeError("throttled")
+    analyzer = TicketAnalyzer(provider=provider, cache=AnalysisResultCache(session_factory=None))
+
+    events = [event async for event in analyzer.stream_analysis(dict(TICKET))]
+
+    assert len(events) == 1
+    assert events[0]["result"]["status"] == "error" and "throttled" in events[0]["result"]["message"]
+
+
+@pytest.mark.asyncio
+async def test_service_caches_streamed_result_and_replays_it(provider, session_factory):
+    """Test a streamed analysis is cached and the next stream replays it without Bedrock"""
+    service = IdempotentAnalysisService(
+        TicketAnalysisRepository(session_factory),
+        analyzer_factory=lambda: TicketAnalyzer(provider=provider, cache=AnalysisResultCache(session_factory=session_factory))
+    )
+
+    first = [event async for event in service.stream(dict(TICKET))]
+    second = [event async for event in service.stream(dict(TICKET))]
+
+    assert first[-1]["result"]["reused"] is False
+    assert second[-1]["result"]["reused"] is True
+    assert [e.get("field") for e in first] == [e.get("field") for e in second]
+    assert provider.client.invoke_model_with_response_stream.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_sends_server_sent_events():
+    """Test the SSE endpoint frames field and complete events and notifies Slack after"""
+    from features.ticket_analysis.presentation import api
+
+    async def stream(ticket, force=False):
+        yield {"event": "field", "field": "summary", "value": "VPN down"}
+        yield {"event": "complete", "result": {"status": "success", "analysis": {"summary": "VPN down"}}}
+
+    service = Mock()
+    service.stream = stream
+    service.notify_slack = AsyncMock(return_value="sent")
+    client = AsyncMock()
+    client.get_ticket.return_value = dict(TICKET)
+
+    with patch.object(api, 'get_fs_client', return_value=client):
+        response = await api.stream_ticket_analysis("101", analysis_service=service)
+        frames = [frame async for frame in response.body_iterator]
+
+    assert response.media_type == "text/event-stream"
+    assert frames[0] == 'event: field\ndata: {"field": "summary", "value": "VPN down"}\n\n'
+    assert frames[1].startswith("event: complete\n")
+    service.notify_slack.assert_awaited_once()
@@ -0,0 +1,146 @@
+"""
+Tests for concurrent batch analysis
+"""
+import asyncio
+import json
+import time
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from infrastructure.shared import AnalysisResultCache
+from services.ai_analyzer import TicketAnalyzer
+from services.analysis_idempotency import IdempotentAnalysisService
+
+
+def make_ticket(n, delay=0.05):
+    return {"id": n, "subject": f"Ticket {n}", "description": "text", "delay": delay}
+
+
+@pytest.fixture
+def analyzer():
+    """Create an analyzer whose Bedrock calls take each ticket's delay and track concurrency"""
+    provider = Mock()
+    provider.client = Mock()
+    provider.model_id = "model-a"
+    provider.running = 0
+    provider.peak = 0
+    delays = {}
+
+    async def analyze_async(system_prompt, user_prompt, timeout):
+        provider.running += 1
+        provider.peak = max(provider.peak, provider.running)
+        try:
+            subject = user_prompt.split("TICKET SUBJECT: ")[1].split("\n")[0]
+            await asyncio.wait_for(asyncio.sleep(delays[subject]), timeout)
+            return {"summary": subject}
+        finally:
+            provider.running -= 1
+
+    provider.analyze_async = analyze_async
+    analyzer = TicketAnalyzer(provider=provider, cache=AnalysisResultCache(session_factory=None))
+    analyzer.delays = delays
+    return analyzer
+
+
+def batch(analyzer, *delays):
+    tickets = [make_ticket(n, delay) for n, delay in enumerate(delays)]
+    analyzer.delays.update({ticket["subject"]: ticket["delay"] for ticket in tickets})
+    return tickets
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_concurrently_and_keeps_summary_shape(analyzer):
+    """Test at most `concurrency` analyses run at once and results keep input order"""
+    tickets = batch(analyzer, *[0.05] * 8)
+
+    started = time.monotonic()
+    summary = await analyzer.analyze_multiple_tickets_async(tickets, concurrency=3)
+
+    assert time.monotonic() - started < 0.3  # 8 x 0.05s one at a time would be 0.4s
+    assert analyzer.provider.peak == 3
+    assert summary["status"] == "batch_analysis_complete"
+    assert (summary["total"], summary["successful"], summary["failed"]) == (8, 8, 0)
+    assert [result["ticket_id"] for result in summary["results"]] == list(range(8))
+
+
+@pytest.mark.asyncio
+async def test_results_stream_as_they_finish_and_slow_ticket_times_out(analyzer):
+    """Test fast tickets are yielded first and a slow one becomes an error result"""
+    tickets = batch(analyzer, 1.0, 0.01, 0.02)
+
+    order = [index async for index, _ in analyzer.iter_analyze_tickets(tickets, concurrency=3, timeout=0.2)]
+    summary = await analyzer.analyze_multiple_tickets_async(tickets, concurrency=3, timeout=0.2)
+
+    assert order == [1, 2, 0]
+    assert summary["successful"] == 2 and summary["failed"] == 1
+    assert summary["failures"][0]["ticket_id"] == 0 and "timed out" in summary["failures"][0]["message"]
+
+
+@pytest.mark.asyncio
+async def test_closing_the_iterator_cancels_pending_analyses(analyzer):
+    """Test a consumer that stops early doesn't leave analyses running"""
+    tickets = batch(analyzer, 0.01, 1.0, 1.0)
+
+    results = analyzer.iter_analyze_tickets(tickets, concurrency=3)
+    first = await results.__anext__()
+    await results.aclose()
+
+    assert first[0] == 0
+    assert analyzer.provider.running == 0
+
+
+def test_blocking_wrapper_returns_summary(analyzer):
+    """Test analyze_multiple_tickets still works from synchronous code"""
+    summary = analyzer.analyze_multiple_tickets(batch(analyzer, 0.01, 0.01), concurrency=2)
+
+    assert summary["successful"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint_reports_missing_tickets_and_streams_results(analyzer):
+    """Test the batch endpoint keeps request order, reuses analyses, and has a server-sent event form"""
+    from features.ticket_analysis.presentation import api
+
+    tickets = {str(t["id"]): t for t in batch(analyzer, 0.05, 0.01, 0.01)}
+    client = AsyncMock()
+    client.get_ticket.side_effect = lambda ticket_id: tickets.get(ticket_id)
+    service = IdempotentAnalysisService(Mock(), analyzer_factory=lambda: analyzer)
+
+    with patch.object(api, 'get_fs_client', return_value=client):
+        summary = await api.analyze_ticket_batch(["0", "404", "2", "1"], analysis_service=service)
+        response = await api.analyze_ticket_batch(["0", "1"], stream=True, analysis_service=service)
+        frames = [frame async for frame in response.body_iterator]
+
+    assert (summary["total"], summary["successful"], summary["failed"]) == (4, 3, 1)
+    assert [result["ticket_id"] for result in summary["results"]] == [0, 2, 1]
+    assert summary["failures"][0] == {"status": "error", "message": "Ticket not found", "ticket_id": "404"}
+    assert [frame.split("\n")[0] for frame in frames] == ["event: result", "event: result", "event: complete"]
+    streamed = [json.loads(frame.split("data: ")[1]) for frame in frames]
+    assert all(result["reused"] for result in streamed[:2])
+    assert [result["ticket_id"] for result in streamed[-1]["results"]] == [0, 1]
+    assert service.get_stats()["reused"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_joins_in_flight_analysis_of_the_same_ticket(analyzer):
+    """Test a batch and a concurrent single analysis of one ticket share the Bedrock call"""
+    from features.ticket_analysis.application import AnalyzeTicketBatchUseCase
+
+    ticket = batch(analyzer, 0.05)[0]
+    client = AsyncMock()
+    client.get_ticket.return_value = ticket
+    service = IdempotentAnalysisService(Mock(), analyzer_factory=lambda: analyzer)
+    calls = []
+    analyze_async = analyzer.provider.analyze_async
+
+    async def counting(*args, **kwargs):
+        calls.append(1)
+        return await analyze_async(*args, **kwargs)
+
+    analyzer.provider.analyze_async = counting
+    single, summary = await asyncio.gather(
+        service.analyze(ticket),
+        AnalyzeTicketBatchUseCase(service, client).execute(["0"])
+    )
+
+    assert len(calls) == 1
+    assert summary["results"][0]["analysis"] == single["analysis"]
@@ -0,0 +1,60 @@
+"""
+Tests for non-blocking Bedrock calls
+"""
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from infrastructure.ai_providers import BedrockAIProvider
+from infrastructure.shared import AnalysisResultCache
+from services.ai_analyzer import TicketAnalyzer
+
+
+@pytest.fixture
+def provider():
+    """Create a provider whose blocking call takes 200 ms"""
+    provider = BedrockAIProvider("key", "secret", max_concurrency=2)
+    provider.client = Mock()
+    release = threading.Event()
+
+    def analyze(system_prompt, user_prompt):
+        release.wait(0.2)
+        return {"summary": user_prompt[:10], "thread": threading.current_thread().name}
+
+    provider.analyze = analyze
+    yield provider
+    release.set()
+    provider.close()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_keeps_running_during_analysis(provider):
+    """Test other coroutines run while analyses are in flight, on the Bedrock threads"""
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    results = await asyncio.gather(*(provider.analyze_async("system", f"ticket {n}") for n in range(2)))
+    task.cancel()
+
+    assert ticks >= 10
+    assert all(result["thread"].startswith("bedrock") for result in results)
+
+
+@pytest.mark.asyncio
+async def test_per_call_timeout_returns_error_result(provider):
+    """Test a slow call gives up at the timeout instead of holding the caller"""
+    analyzer = TicketAnalyzer(provider=provider, cache=AnalysisResultCache(session_factory=None))
+
+    started = time.monotonic()
+    result = await analyzer.analyze_ticket_async({"id": 1, "subject": "VPN", "description": "down"}, timeout=0.05)
+
+    assert time.monotonic() - started < 0.15
+    assert result["status"] == "error" and "timed out" in result["message"]
+    assert provider.get_stats()["timeouts"] == 1
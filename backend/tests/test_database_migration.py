@@ -0,0 +1,54 @@
+"""
+Tests for adding new model columns to existing databases
+"""
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+from infrastructure.shared.database_models import Base
+from infrastructure.shared import AnalysisResultCache, migrate_db
+
+# Tables as created by the first release; create_all leaves existing tables as they are
+FIRST_RELEASE_SCHEMA = [
+    """CREATE TABLE tickets_cache (
+        id INTEGER PRIMARY KEY, ticket_id INTEGER UNIQUE, subject VARCHAR(255), status VARCHAR(50),
+        priority VARCHAR(50), requester_id INTEGER, description TEXT,
+        created_at DATETIME, updated_at DATETIME, cached_at DATETIME
+    )""",
+    """CREATE TABLE analysis_logs (
+        id INTEGER PRIMARY KEY, ticket_id INTEGER, summary TEXT, classification VARCHAR(100),
+        automation_opportunities TEXT, created_at DATETIME, updated_at DATETIME
+    )""",
+    "INSERT INTO analysis_logs (ticket_id, summary) VALUES (7, 'old row')"
+]
+
+
+@pytest.fixture
+def engine(engine):
+    """Create the first release schema on the in-memory database, then any newer tables"""
+    with engine.begin() as connection:
+        for statement in FIRST_RELEASE_SCHEMA:
+            connection.execute(text(statement))
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def test_missing_columns_are_added_once(engine):
+    """Test init_db's migration adds the new columns and is a no-op the second time"""
+    added = migrate_db(engine, Base.metadata)
+
+    assert {"analysis_logs.content_hash", "analysis_logs.prompt_version", "analysis_logs.model_id",
+            "analysis_logs.result", "tickets_cache.group_id", "tickets_cache.payload"} <= set(added)
+    assert migrate_db(engine, Base.metadata) == []
+    columns = {column["name"] for column in inspect(engine).get_columns("tickets_cache")}
+    assert {"group_id", "payload"} <= columns
+
+
+def test_analysis_cache_works_on_migrated_database(engine, session_factory):
+    """Test the cache reads back from a migrated analysis_logs and its key stays unique"""
+    migrate_db(engine, Base.metadata)
+
+    AnalysisResultCache(session_factory=session_factory).put("key", {"summary": "VPN"}, ticket_id=101)
+
+    assert AnalysisResultCache(session_factory=session_factory).get("key") == {"summary": "VPN"}
+    with pytest.raises(IntegrityError), engine.begin() as connection:
+        connection.execute(text("INSERT INTO analysis_logs (content_hash) VALUES ('key')"))
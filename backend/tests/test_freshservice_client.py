@@ -3,8 +3,9 @@ Tests for FreshService client
 """
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from api.freshservice_client import FreshServiceClient
+from api.freshservice_client import FreshServiceClient, AsyncFreshServiceClient
 import base64
+import httpx
 
 @pytest.fixture
 def client():
@@ -86,3 +87,126 @@ def test_search_tickets(mock_request, client, mock_response):
     
     assert result == mock_response.json.return_value
     assert mock_request.called
+
+def test_clients_share_connection_pool(client):
+    """Test clients for the same host reuse one keep-alive session"""
+    other = FreshServiceClient(api_key="other_key", domain="testdomain")
+    assert other.session is client.session
+
+
+@pytest.mark.asyncio
+async def test_async_get_tickets_matches_sync_shape():
+    """Test async client returns the same pagination shape as the sync client"""
+    def handler(request):
+        assert request.url.path == "/api/v2/tickets"
+        return httpx.Response(200, json={"tickets": [{"id": 1}], "total": 3})
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async_client = AsyncFreshServiceClient(api_key="test_key", domain="testdomain")
+    with patch('infrastructure.integrations.async_freshservice_integration.get_async_client', return_value=http):
+        result = await async_client.get_tickets(page=1, per_page=1)
+
+    assert result == {"tickets": [{"id": 1}], "page": 1, "per_page": 1, "total": 3, "has_more": True}
+
+
+def test_get_all_tickets_fetches_pages_in_order_and_retries(client):
+    """Test remaining pages are fetched concurrently, kept in order and retried"""
+    failures = {3: 1}
+
+    def fetch_page(status, priority, group_id, page, per_page):
+        if failures.get(page):
+            failures[page] -= 1
+            raise ConnectionError("boom")
+        return {"tickets": [{"id": page}], "page": page, "per_page": per_page, "total": 4, "has_more": page < 4}
+
+    with patch.object(client, '_fetch_tickets_page', side_effect=fetch_page), \
+            patch('infrastructure.integrations.freshservice_integration.time.sleep'):
+        tickets = client.get_all_tickets(per_page=1)
+
+    assert [t["id"] for t in tickets] == [1, 2, 3, 4]
+
+
+def test_iter_tickets_streams_across_pages(client):
+    """Test iter_tickets decodes pages incrementally and stops on a short page"""
+    pages = {
+        1: b'{"tickets": [{"id": 1}, {"id": 2}]}',
+        2: b'{"tickets": [{"id": 3}]}'
+    }
+
+    def send(method, endpoint, stream=False, params=None):
+        body = pages[params["page"]]
+        response = Mock()
+        response.iter_content.return_value = (body[i:i + 5] for i in range(0, len(body), 5))
+        return response
+
+    with patch.object(client, '_send_response', side_effect=send) as mock_send:
+        tickets = list(client.iter_tickets(per_page=2, updated_since="2024-01-01T00:00:00Z"))
+
+    assert [t["id"] for t in tickets] == [1, 2, 3]
+    assert mock_send.call_args[1]["params"]["updated_since"] == "2024-01-01T00:00:00Z"
+
+
+@pytest.mark.asyncio
+async def test_iter_tickets_rejects_group_filter(client):
+    """Test a group filter is refused instead of stopping after one 30-ticket /tickets/filter page"""
+    async_client = AsyncFreshServiceClient(api_key="test_key", domain="testdomain")
+
+    with patch.object(client, '_send_response') as mock_send, \
+            patch.object(async_client, '_send_response') as mock_async_send:
+        with pytest.raises(ValueError, match="filter_tickets"):
+            list(client.iter_tickets(group_id=5, updated_since="2024-01-01T00:00:00Z"))
+        with pytest.raises(ValueError, match="filter_tickets"):
+            [ticket async for ticket in async_client.iter_tickets(group_id=5)]
+
+    mock_send.assert_not_called()
+    mock_async_send.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_get_ticket_embeds_and_completes_conversations():
+    """Test include params are sent and truncated embedded threads are paged in full"""
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path, dict(request.url.params)))
+        if request.url.path.endswith("/conversations"):
+            page = int(request.url.params["page"])
+            count = 100 if page == 1 else 5
+            return httpx.Response(200, json={"conversations": [{"id": i} for i in range(count)]})
+        return httpx.Response(200, json={"ticket": {"id": 1, "conversations": [{"id": i} for i in range(10)]}})
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async_client = AsyncFreshServiceClient(api_key="test_key", domain="testdomain")
+    with patch('infrastructure.integrations.async_freshservice_integration.get_async_client', return_value=http):
+        ticket = await async_client.get_ticket("1", include=["requester", "conversations"])
+
+    assert seen[0] == ("/api/v2/tickets/1", {"include": "conversations,requester"})
+    assert [params["page"] for _, params in seen[1:]] == ["1", "2"]
+    assert len(ticket["conversations"]) == 105
+
+
+@pytest.mark.asyncio
+async def test_ticket_details_fetches_ticket_and_conversations_concurrently():
+    """Test the use case overlaps the ticket and conversation requests"""
+    import asyncio
+    from features.ticket_management.application import GetTicketDetailsUseCase
+
+    in_flight = []
+    overlap = []
+
+    async def track(result):
+        in_flight.append(1)
+        await asyncio.sleep(0.01)
+        overlap.append(len(in_flight))
+        in_flight.pop()
+        return result
+
+    fs = Mock()
+    fs.get_ticket = Mock(side_effect=lambda ticket_id, include=None: track({"id": 1, "include": include}))
+    fs.get_ticket_conversations = Mock(side_effect=lambda ticket_id: track([{"id": 9}]))
+
+    ticket = await GetTicketDetailsUseCase(fs).execute("1", include=["conversations", "stats"])
+
+    assert max(overlap) == 2
+    assert ticket["include"] == ["stats"]
+    assert ticket["conversations"] == [{"id": 9}]
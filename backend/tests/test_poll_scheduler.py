@@ -0,0 +1,70 @@
+"""
+Tests for the adaptive poll scheduler
+"""
+import pytest
+from unittest.mock import Mock, patch
+from services.poll_scheduler import AdaptivePollScheduler
+
+
+@pytest.fixture
+def limiter():
+    """Rate limiter stub with plenty of headroom"""
+    limiter = Mock()
+    limiter.get_stats.return_value = {"headroom_ratio": 1.0, "blocked_for_seconds": 0.0}
+    return limiter
+
+
+@pytest.fixture
+def scheduler(limiter):
+    """Create a scheduler bounded to 10-300s"""
+    return AdaptivePollScheduler(min_interval=10, max_interval=300, initial_interval=30, smoothing=0.5, rate_limiter=limiter)
+
+
+def poll(scheduler, at, new_tickets):
+    """Record a successful poll at a given monotonic time"""
+    with patch('services.poll_scheduler.time.monotonic', return_value=at):
+        return scheduler.record_success(new_tickets)
+
+
+def test_interval_shrinks_in_bursts_and_grows_when_idle(scheduler):
+    """Test arrivals pull the interval down and quiet periods push it up, within bounds"""
+    poll(scheduler, 0, 0)
+    burst = [poll(scheduler, t, 6) for t in (30, 40, 50)]
+    assert burst[-1] == 10
+    assert scheduler.decisions[-1]["reason"] == "arrivals"
+
+    t = 50
+    intervals = []
+    for _ in range(12):
+        t += intervals[-1] if intervals else 10
+        intervals.append(poll(scheduler, t, 0))
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == 300
+
+
+def test_errors_back_off_exponentially_and_reset(scheduler):
+    """Test consecutive errors double the interval up to the maximum"""
+    delays = [scheduler.record_error() for _ in range(5)]
+
+    assert delays[:3] == [60, 120, 240]
+    assert delays[-1] == 300
+    assert scheduler.get_stats()["decisions_by_reason"]["error_backoff"] == 5
+
+    poll(scheduler, 1000, 0)
+    assert scheduler.consecutive_errors == 0
+
+
+def test_low_rate_limit_headroom_slows_polling(scheduler, limiter):
+    """Test a draining rate limit budget stretches the interval and honours blocks"""
+    poll(scheduler, 0, 0)
+    busy = [poll(scheduler, t, 10) for t in (10, 20)][-1]
+
+    limiter.get_stats.return_value = {"headroom_ratio": 0.05, "blocked_for_seconds": 0.0}
+    constrained = poll(scheduler, 30, 10)
+    limiter.get_stats.return_value = {"headroom_ratio": 1.0, "blocked_for_seconds": 45.0}
+    blocked = poll(scheduler, 40, 10)
+
+    assert busy == 10
+    assert constrained > 200
+    assert scheduler.decisions[-2]["reason"] == "rate_limit"
+    assert blocked == 45
@@ -0,0 +1,43 @@
+"""
+Tests for the shared Bedrock provider registry
+"""
+import threading
+import pytest
+from unittest.mock import patch
+from infrastructure.ai_providers import provider_registry, get_bedrock_provider, close_bedrock_provider
+from services.ai_analyzer import TicketAnalyzer
+
+
+@pytest.fixture
+def boto_client():
+    """Patch boto3 client creation and reset the shared provider around the test"""
+    close_bedrock_provider()
+    with patch('infrastructure.ai_providers.bedrock_provider.boto3.client') as client, \
+            patch.object(provider_registry.config, 'AWS_ACCESS_KEY', "key"), \
+            patch.object(provider_registry.config, 'AWS_SECRET_ACCESS_KEY', "secret"):
+        yield client
+    close_bedrock_provider()
+
+
+def test_one_client_per_process_with_tuned_pool(boto_client):
+    """Test concurrent callers get one provider whose client has the pool config"""
+    providers = []
+    threads = [threading.Thread(target=lambda: providers.append(get_bedrock_provider())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert boto_client.call_count == 1
+    assert all(provider is providers[0] for provider in providers)
+    client_config = boto_client.call_args.kwargs["config"]
+    assert client_config.max_pool_connections == provider_registry.config.BEDROCK_MAX_POOL_CONNECTIONS
+    assert client_config.tcp_keepalive is True
+
+
+def test_analyzers_share_the_provider(boto_client):
+    """Test new analyzers don't build new Bedrock clients"""
+    first, second = TicketAnalyzer(), TicketAnalyzer()
+
+    assert first.provider is second.provider
+    assert boto_client.call_count == 1
@@ -0,0 +1,104 @@
+"""
+Tests for FreshService rate limiting and retries
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from infrastructure.integrations.rate_limiter import TokenBucketRateLimiter, RateLimitExceeded, parse_retry_after
+from api.freshservice_client import FreshServiceClient
+
+
+@pytest.fixture
+def limiter():
+    """Create limiter with 60 req/min and 10% headroom"""
+    return TokenBucketRateLimiter(requests_per_minute=60, headroom=0.1)
+
+
+def make_response(status_code, headers=None, body=None):
+    """Build a mock requests response"""
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.text = ""
+    response.json.return_value = body or {}
+    response.raise_for_status.return_value = None
+    return response
+
+
+def test_headroom_reduces_capacity(limiter):
+    """Test the bucket keeps headroom below the plan limit"""
+    assert limiter.capacity == pytest.approx(54)
+    assert limiter._reserve() == 0
+
+
+def test_remaining_header_drains_bucket(limiter):
+    """Test X-RateLimit-Remaining caps available tokens"""
+    limiter.update(200, {"X-RateLimit-Total": "60", "X-RateLimit-Remaining": "6"})
+    assert limiter.tokens == pytest.approx(0, abs=0.1)
+    assert limiter._reserve() > 0
+
+
+def test_total_header_resizes_bucket(limiter):
+    """Test X-RateLimit-Total replaces the configured plan limit"""
+    limiter.update(200, {"X-RateLimit-Total": "120"})
+    assert limiter.limit == 120
+    assert limiter.capacity == pytest.approx(108)
+
+
+def test_429_pauses_all_callers(limiter):
+    """Test Retry-After on a 429 blocks every subsequent acquire"""
+    retry_after = limiter.update(429, {"Retry-After": "5"})
+    assert retry_after == 5
+    assert limiter._reserve() >= 4.9
+
+
+def test_parse_retry_after():
+    """Test Retry-After parsing"""
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+
+
+@pytest.fixture
+def client():
+    """Create test client with an isolated, fast limiter"""
+    with patch('infrastructure.integrations.freshservice_integration.freshservice_rate_limiter',
+               TokenBucketRateLimiter(requests_per_minute=6000, headroom=0.1)):
+        yield FreshServiceClient(api_key="test_key", domain="testdomain")
+
+
+@patch('infrastructure.integrations.freshservice_integration.time.sleep')
+def test_request_retries_on_429_then_succeeds(mock_sleep, client):
+    """Test _request retries a 429 instead of failing the call"""
+    responses = [
+        make_response(429, {"Retry-After": "0"}),
+        make_response(200, body={"ticket": {"id": 1}})
+    ]
+    with patch.object(client.session, 'request', side_effect=responses) as mock_request:
+        assert client.get_ticket("1") == {"id": 1}
+    assert mock_request.call_count == 2
+
+
+@patch('infrastructure.integrations.freshservice_integration.time.sleep')
+def test_get_tickets_surfaces_rate_limit(mock_sleep, client):
+    """Test get_tickets raises instead of returning an empty page when rate limited"""
+    with patch.object(client.session, 'request', return_value=make_response(429, {"Retry-After": "0"})):
+        with pytest.raises(RateLimitExceeded):
+            client.get_tickets()
+
+
+def test_ticket_list_rate_limit_becomes_503_with_retry_after():
+    """Test a rate-limited ticket list reaches the client as 503 + Retry-After, not a 500"""
+    from fastapi.testclient import TestClient
+    from main import app
+    from features.ticket_management.presentation import api
+
+    fs_client = Mock()
+    fs_client.get_tickets_page = AsyncMock(side_effect=RateLimitExceeded("rate limited", retry_after=12.3))
+    api_client = TestClient(app)
+
+    with patch.object(api, 'get_fs_client', return_value=fs_client), \
+            patch.object(api, 'get_ticket_cache', return_value=None):
+        response = api_client.get("/api/tickets/", params={"page": 99, "group_id": 4242})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "13"
@@ -0,0 +1,112 @@
+"""
+Tests for single-flight request coalescing
+"""
+import asyncio
+import threading
+import pytest
+from infrastructure.integrations.single_flight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    """Test identical concurrent calls from threads run once"""
+    flight = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"ticket": {"id": 1}}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("ticket:1", fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while flight.get_stats()["collapsed"] < 4:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"ticket": {"id": 1}}] * 5
+    assert flight.get_stats()["collapsed"] == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_share_one_call_with_independent_copies():
+    """Test identical concurrent coroutines run once and get their own copies"""
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"ticket": {"id": 1}}
+
+    results = await asyncio.gather(*(flight.do_async("ticket:1", fetch) for _ in range(3)))
+
+    assert len(calls) == 1
+    results[1]["ticket"]["conversations"] = []
+    assert "conversations" not in results[0]["ticket"]
+    assert flight.get_stats() == {"executed": 1, "collapsed": 2, "in_flight": 0, "collapse_ratio": 0.667}
+
+
+@pytest.mark.asyncio
+async def test_followers_receive_leader_error():
+    """Test waiters get the leader's exception and nothing is cached"""
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ConnectionError("down")
+
+    results = await asyncio.gather(*(flight.do_async("k", fail) for _ in range(2)), return_exceptions=True)
+
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert flight.get_stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_leader_mutating_its_result_does_not_leak_to_followers():
+    """Test the leader's caller gets its own copy when followers share the result"""
+    flight = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return {"tickets": [1]}
+
+    async def leader():
+        result = await flight.do_async("k", fetch)
+        result["tickets"].append("leader")
+        return result
+
+    lead = asyncio.create_task(leader())
+    await asyncio.sleep(0)
+    follower = await flight.do_async("k", fetch)
+
+    assert follower == {"tickets": [1]}
+    assert (await lead)["tickets"] == [1, "leader"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_the_call_to_a_follower():
+    """Test cancelling the leading task doesn't cancel tasks that joined it"""
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    leader = asyncio.create_task(flight.do_async("k", fetch))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(flight.do_async("k", fetch)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await asyncio.gather(*followers) == ["value", "value"]
+    assert leader.cancelled()
+    assert len(calls) == 2
+    assert flight.get_stats()["in_flight"] == 0
@@ -0,0 +1,94 @@
+"""
+Tests for the stale-while-revalidate ticket list cache
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from infrastructure.shared import StaleWhileRevalidateCache, CACHE_FRESH, CACHE_STALE, CACHE_MISS
+
+
+@pytest.fixture
+def cache():
+    """Create cache with 10s ttl and 60s stale window"""
+    return StaleWhileRevalidateCache("test", ttl_seconds=10, stale_ttl_seconds=60, max_entries=2)
+
+
+def loader_returning(*values):
+    """Build a loader returning values in order"""
+    remaining = list(values)
+
+    async def load():
+        return remaining.pop(0)
+    return load
+
+
+@pytest.mark.asyncio
+async def test_miss_then_fresh(cache):
+    """Test first read loads and the next is served fresh"""
+    load = loader_returning("v1")
+    assert (await cache.get("k", load))[:2] == ("v1", CACHE_MISS)
+    assert (await cache.get("k", load))[:2] == ("v1", CACHE_FRESH)
+
+
+@pytest.mark.asyncio
+async def test_stale_served_while_refreshing(cache):
+    """Test an expired entry is returned at once and refreshed in the background"""
+    load = loader_returning("v1", "v2")
+    await cache.get("k", load)
+
+    # Age the entry past its ttl
+    entry_value, stored_at = cache._entries["k"]
+    cache._entries["k"] = (entry_value, stored_at - 20)
+
+    value, state, age = await cache.get("k", load)
+    assert (value, state) == ("v1", CACHE_STALE)
+    assert age >= 20
+
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert (await cache.get("k", load))[:2] == ("v2", CACHE_FRESH)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_by_predicate(cache):
+    """Test invalidation drops only the selected entries"""
+    await cache.get((1, 30, 5, None, None), loader_returning("group 5"))
+    await cache.get((1, 30, 7, None, None), loader_returning("group 7"))
+
+    assert cache.invalidate(lambda key: key[2] == 5) == 1
+    assert (1, 30, 5, None, None) not in cache._entries
+    assert (1, 30, 7, None, None) in cache._entries
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction(cache):
+    """Test the cache keeps at most max_entries"""
+    for key in ("a", "b", "c"):
+        await cache.get(key, loader_returning(key))
+    assert list(cache._entries) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_failed_ticket_fetch_is_not_cached(cache):
+    """Test a FreshService error keeps the stale list and is raised on a miss instead of caching an empty page"""
+    from features.ticket_management.application.list_tickets import ListTicketsUseCase
+
+    page = {"tickets": [{"id": 1}], "page": 1, "per_page": 30, "total": 1, "has_more": False}
+    client = AsyncMock()
+    client.get_tickets_page.side_effect = [page, RuntimeError("503 from FreshService"), RuntimeError("still down")]
+    use_case = ListTicketsUseCase(client, list_cache=cache)
+    await use_case.execute()
+
+    # Age the entry past its ttl so the next read revalidates in the background
+    key, (value, stored_at) = next(iter(cache._entries.items()))
+    cache._entries[key] = (value, stored_at - 20)
+    stale = await use_case.execute()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert stale["tickets"] == [{"id": 1}] and use_case.cache_state == CACHE_STALE
+    assert cache._entries[key][0] is value
+    with pytest.raises(RuntimeError):
+        await use_case.execute(page=2)
+    assert len(cache._entries) == 1
+    client.get_tickets.assert_not_called()
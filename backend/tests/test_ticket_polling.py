@@ -0,0 +1,229 @@
+"""
+Tests for the automatic ticket polling service
+"""
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+from infrastructure.integrations.freshservice_integration import build_group_filter_queries, FILTER_QUERY_MAX_LENGTH
+from infrastructure.shared import WorkerRegistry, AnalysisJobRepository
+from services.analysis_jobs import AnalysisJobWorkerPool
+from services.ticket_polling import (
+    TicketPollingService, GroupPollState, WATERMARK_KEY, watermark_key, recent_tickets_key
+)
+
+
+def make_ticket(ticket_id, created_at):
+    """Build a FreshService-shaped list ticket"""
+    return {"id": ticket_id, "subject": f"Ticket {ticket_id}", "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%SZ")}
+
+
+def make_service(repository=None, job_pool=None):
+    """Create a polling service that is the only live worker"""
+    registry = Mock()
+    if job_pool is None:
+        job_pool = Mock()
+        job_pool.enqueue = AsyncMock(return_value=1)
+    service = TicketPollingService(repository=repository or Mock(), registry=registry, job_pool=job_pool)
+    registry.heartbeat.return_value = [service.worker_id]
+    return service
+
+
+@pytest.fixture
+def service():
+    """Create a polling service that started an hour ago, owning groups 1-3"""
+    service = make_service()
+    service.service_start_time = datetime.utcnow() - timedelta(hours=1)
+    service.last_check = service.service_start_time
+    for group_id in ("1", "2", "3"):
+        service.group_states[group_id] = GroupPollState(service.service_start_time, not_before=service.service_start_time)
+    yield service
+    service.stop()
+
+
+def test_group_filter_queries_split_only_at_length_limit():
+    """Test groups share one OR'd query until the length limit forces a split"""
+    groups = [str(26000250000 + n) for n in range(30)]
+
+    single = build_group_filter_queries(groups[:3], "2024-03-01")
+    split = build_group_filter_queries(groups, "2024-03-01")
+
+    assert single == [(
+        "(group_id:26000250000 OR group_id:26000250001 OR group_id:26000250002) AND created_at:>'2024-03-01'",
+        groups[:3]
+    )]
+    assert len(split) > 1
+    assert [g for _, chunk in split for g in chunk] == groups
+    assert all(len(query) + 2 <= FILTER_QUERY_MAX_LENGTH for query, _ in split)
+
+
+@pytest.mark.asyncio
+async def test_check_new_tickets_uses_one_query_and_only_enqueues_jobs(service):
+    """Test one filter request covers all groups and new tickets become durable jobs"""
+    recent = datetime.utcnow() - timedelta(minutes=5)
+    client = Mock()
+    client.filter_tickets = AsyncMock(return_value={"tickets": [
+        {**make_ticket(10, recent), "group_id": 1, "description_text": "VPN down"},
+        {**make_ticket(20, recent), "group_id": 2},
+        {**make_ticket(30, recent), "group_id": 3},
+        {**make_ticket(40, recent), "group_id": 99}
+    ]})
+
+    with patch('services.ticket_polling.config.AUTO_ANALYZE_GROUP_IDS', ["1", "2", "3"]), \
+            patch('services.ticket_polling.get_async_freshservice_client', return_value=client):
+        assert await asyncio.wait_for(service.check_new_tickets(), timeout=1) == 3
+
+    assert client.filter_tickets.await_count == 1
+    assert client.filter_tickets.call_args[0][0].startswith("(group_id:1 OR group_id:2 OR group_id:3) AND created_at:>")
+    jobs = {call.args[0]: call for call in service.job_pool.enqueue.await_args_list}
+    assert sorted(jobs) == ["10", "20", "30"]
+    assert all(call.kwargs["source"] == "poller" for call in jobs.values())
+    # Tickets carrying a description are analyzed as is; the others are fetched by the job
+    assert jobs["10"].kwargs["ticket"]["description_text"] == "VPN down"
+    assert jobs["20"].kwargs["ticket"] is None
+    assert all(ticket_id in service.group_states[g].recent_tickets for ticket_id, g in (("10", "1"), ("20", "2"), ("30", "3")))
+
+
+@pytest.mark.asyncio
+async def test_failed_enqueue_keeps_watermark_so_ticket_is_seen_again(service):
+    """Test progress is only saved once the ticket's job is persisted"""
+    recent = datetime.utcnow() - timedelta(minutes=5)
+    client = Mock()
+    client.filter_tickets = AsyncMock(return_value={"tickets": [{**make_ticket(10, recent), "group_id": 1}]})
+    state = service.group_states["1"]
+    watermark = state.watermark
+    service.job_pool.enqueue.side_effect = [RuntimeError("database is locked"), 7]
+
+    with patch('services.ticket_polling.config.AUTO_ANALYZE_GROUP_IDS', ["1"]), \
+            patch('services.ticket_polling.get_async_freshservice_client', return_value=client):
+        with pytest.raises(RuntimeError):
+            await service.check_new_tickets()
+
+        assert state.watermark == watermark and "10" not in state.recent_tickets
+        assert not service.repository.set_states.called
+
+        assert await service.check_new_tickets() == 1
+
+    assert state.watermark > watermark
+    assert service.repository.set_states.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_check_new_tickets_pages_until_watermark(service):
+    """Test a burst larger than one page is read up to the watermark and counted"""
+    now = datetime.utcnow()
+    burst = [{**make_ticket(100 - n, now - timedelta(seconds=n)), "group_id": 1} for n in range(40)]
+    state = service.group_states["1"]
+    older = {**make_ticket(1, state.watermark - timedelta(minutes=1)), "group_id": 1}
+    pages = {1: burst[:30], 2: burst[30:] + [older] + [older] * 19, 3: [older] * 30}
+
+    async def filter_tickets(query, page):
+        return {"tickets": pages[page], "has_more": True}
+
+    client = Mock()
+    client.filter_tickets = AsyncMock(side_effect=filter_tickets)
+
+    with patch('services.ticket_polling.config.AUTO_ANALYZE_GROUP_IDS', ["1"]), \
+            patch('services.ticket_polling.get_async_freshservice_client', return_value=client):
+        await service.check_new_tickets()
+
+    assert client.filter_tickets.await_count == 2
+    assert service.job_pool.enqueue.await_count == 40
+    assert service.get_stats()["pages_last_cycle"] == 2
+    assert state.watermark == datetime.fromisoformat(burst[0]["created_at"][:-1])
+    saved = service.repository.set_states.call_args[0][0]
+    assert saved[watermark_key("1")] == state.watermark.isoformat()
+    assert len(json.loads(saved[recent_tickets_key("1")])) == 40
+
+
+@pytest.mark.asyncio
+async def test_restart_resumes_from_saved_watermark_and_dedup(session_factory):
+    """Test a restarted service queues downtime tickets exactly once, as persisted jobs"""
+    stopped_at = datetime.utcnow() - timedelta(hours=2)
+    queued_before = {**make_ticket(5, stopped_at), "group_id": 1}
+    during_downtime = {**make_ticket(6, stopped_at + timedelta(minutes=30)), "group_id": 1}
+    before_window = {**make_ticket(4, stopped_at - timedelta(hours=3)), "group_id": 1}
+
+    first = GroupPollState(stopped_at)
+    first.recent_tickets.add("5", stopped_at)
+    state = {watermark_key("1"): stopped_at.isoformat(), recent_tickets_key("1"): first.recent_tickets.dumps()}
+
+    repository = Mock()
+    repository.get_states.side_effect = lambda keys: {key: state[key] for key in keys if key in state}
+    client = Mock()
+    client.filter_tickets = AsyncMock(return_value={"tickets": [during_downtime, queued_before, before_window]})
+    jobs = AnalysisJobRepository(60, 3, 10, 25, session_factory=session_factory)
+    service = make_service(repository, job_pool=AnalysisJobWorkerPool(repository=jobs))
+
+    with patch('services.ticket_polling.config.AUTO_ANALYZE_GROUP_IDS', ["1"]), \
+            patch('services.ticket_polling.get_async_freshservice_client', return_value=client):
+        await service.check_new_tickets()
+
+    assert service.group_states["1"].not_before is None
+    job = jobs.claim("worker-a")
+    assert (job["ticket_id"], job["group_id"], job["source"]) == ("6", "1", "poller")
+    assert jobs.claim("worker-a") is None
+
+
+@pytest.mark.asyncio
+async def test_groups_resume_from_pre_sharding_watermark():
+    """Test groups without per-group progress start from the old global watermark"""
+    legacy = datetime.utcnow() - timedelta(minutes=30)
+    repository = Mock()
+    repository.get_states.return_value = {WATERMARK_KEY: legacy.isoformat()}
+    service = make_service(repository)
+
+    await service.load_group_states(["1", "2"])
+
+    assert {g: s.watermark for g, s in service.group_states.items()} == {"1": legacy, "2": legacy}
+    assert not repository.set_states.called
+
+
+def test_groups_are_sharded_across_live_workers():
+    """Test live workers split groups without overlap and absorb a dead peer's groups"""
+    groups = [str(26000250000 + n) for n in range(40)]
+    first, second = make_service(), make_service()
+    first.live_workers = second.live_workers = sorted([first.worker_id, second.worker_id])
+
+    owned_first = first.owned_groups(groups)
+    owned_second = second.owned_groups(groups)
+
+    assert owned_first and owned_second
+    assert sorted(owned_first + owned_second) == sorted(groups)
+
+    second.live_workers = [second.worker_id]
+    assert second.owned_groups(groups) == groups
+
+
+def test_worker_registry_expires_missed_heartbeats(session_factory):
+    """Test a worker drops out of the live set once its lease runs out"""
+    registry = WorkerRegistry(lease_seconds=60, session_factory=session_factory)
+
+    registry.heartbeat("a")
+    assert registry.heartbeat("b") == ["a", "b"]
+
+    with patch('infrastructure.shared.worker_registry.datetime') as clock:
+        clock.utcnow.return_value = datetime.utcnow() + timedelta(seconds=90)
+        assert registry.heartbeat("b") == ["b"]
+
+    registry.release("b")
+    assert registry.heartbeat("c") == ["c"]
+
+
+def test_rolling_dedup_is_bounded_by_window_and_size():
+    """Test old keys expire and the size budget holds"""
+    from infrastructure.shared import RollingWindowDedup
+    now = datetime.utcnow()
+    dedup = RollingWindowDedup(window_seconds=60, max_entries=3)
+    for n in range(5):
+        dedup.add(n, now - timedelta(seconds=30 - n))
+    dedup.add("old", now - timedelta(minutes=5))
+
+    assert len(dedup) == 3 and "0" not in dedup
+
+    dedup.prune(now)
+    restored = RollingWindowDedup(window_seconds=60, max_entries=3)
+    restored.loads(dedup.dumps())
+
+    assert "old" not in restored and "4" in restored
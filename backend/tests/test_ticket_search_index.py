@@ -0,0 +1,112 @@
+"""
+Tests for the local ticket search index
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from infrastructure.search import TicketSearchIndex, build_match_query
+from features.ticket_management.application.search_tickets import SearchTicketsUseCase
+from services.ticket_sync import TicketSyncService
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Create an index in a temporary database"""
+    return TicketSearchIndex(str(tmp_path / "search.db"))
+
+
+def make_ticket(ticket_id, subject, description=None, updated_day=1):
+    """Build a FreshService-shaped ticket"""
+    ticket = {
+        "id": ticket_id,
+        "subject": subject,
+        "status": 2,
+        "priority": 1,
+        "group_id": 1,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": f"2024-02-{updated_day:02d}T00:00:00Z"
+    }
+    if description is not None:
+        ticket["description"] = description
+    return ticket
+
+
+def test_build_match_query_quotes_words_and_prefixes_last():
+    """Test operators are neutralised and the last word is a prefix"""
+    assert build_match_query('vpn "access" OR') == '"vpn" "access" "or"*'
+    assert build_match_query("printer x") == '"printer" "x"'
+    assert build_match_query("  *  ") is None
+
+
+def test_search_ranks_subject_matches_first(index):
+    """Test prefix matching and subject weighting"""
+    index.index_tickets([
+        make_ticket(1, "Laptop slow", "<p>Password reset needed for <b>VPN</b></p>"),
+        make_ticket(2, "Password reset", "User cannot log in"),
+        make_ticket(3, "Printer jam", "Paper stuck")
+    ])
+
+    result = index.search("passw")
+
+    assert [r["id"] for r in result["results"]] == [2, 1]
+    assert result["total"] == 2
+    assert "<mark>" in result["results"][0]["snippet"]
+    assert index.search("vpn")["results"][0]["id"] == 1
+
+
+def test_search_paginates(index):
+    """Test pages, totals and has_more"""
+    index.index_tickets([make_ticket(i, f"Network outage {i}") for i in range(1, 6)])
+
+    first = index.search("network", page=1, per_page=2)
+    last = index.search("network", page=3, per_page=2)
+
+    assert first["total"] == 5 and first["has_more"]
+    assert len(last["results"]) == 1 and not last["has_more"]
+    assert {r["id"] for r in first["results"]}.isdisjoint({r["id"] for r in last["results"]})
+
+
+def test_reindex_keeps_description_and_adds_conversations(index):
+    """Test list-page upserts don't erase text from full details"""
+    index.index_ticket(make_ticket(1, "Email issue", "Mailbox quota exceeded"), [{"body": "<div>Archived old mail</div>"}])
+    index.index_tickets([make_ticket(1, "Email issue", updated_day=2)])
+
+    assert index.search("quota")["total"] == 1
+    assert index.search("archived")["total"] == 1
+
+    index.delete_tickets([1])
+    assert index.count() == 0
+    assert index.search("email")["total"] == 0
+
+
+def test_sync_indexes_batches(index, tmp_path):
+    """Test the sync service feeds the index"""
+    repository = Mock()
+    repository.get_state.return_value = None
+    repository.upsert_tickets.side_effect = lambda batch, state=None: len(batch)
+    client = Mock()
+    client.iter_tickets.return_value = iter([make_ticket(1, "Wifi down"), make_ticket(2, "Monitor flicker")])
+
+    with patch('services.ticket_sync.get_freshservice_client', return_value=client):
+        TicketSyncService(repository, search_index=index).sync_once()
+
+    assert index.count() == 2
+    assert index.search("wifi")["results"][0]["id"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_use_case_falls_back_to_freshservice(index):
+    """Test an empty index defers to the FreshService search API"""
+    client = Mock()
+    client.search_tickets = AsyncMock(return_value=[{"id": 7}, {"id": 8}, {"id": 9}])
+
+    result = await SearchTicketsUseCase(client, index).execute("wifi", page=2, per_page=2)
+
+    assert result["source"] == "freshservice"
+    assert result["results"] == [{"id": 9}]
+    assert result["total"] == 3
+
+    index.index_tickets([make_ticket(1, "Wifi down")])
+    result = await SearchTicketsUseCase(client, index).execute("wifi")
+
+    assert result["source"] == "index"
+    assert client.search_tickets.await_count == 1
@@ -0,0 +1,113 @@
+"""
+Tests for incremental ticket sync into tickets_cache
+"""
+import threading
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+from infrastructure.shared import TicketCacheRepository
+from services.ticket_sync import TicketSyncService, WATERMARK_KEY
+
+
+@pytest.fixture
+def repository(session_factory):
+    """Create repository on an in-memory database"""
+    return TicketCacheRepository(session_factory)
+
+
+def make_ticket(ticket_id, updated_day, group_id=1):
+    """Build a FreshService-shaped ticket"""
+    return {
+        "id": ticket_id,
+        "subject": f"Ticket {ticket_id}",
+        "status": 2,
+        "priority": 1,
+        "group_id": group_id,
+        "created_at": f"2024-01-{ticket_id:02d}T00:00:00Z",
+        "updated_at": f"2024-02-{updated_day:02d}T00:00:00Z"
+    }
+
+
+def test_incremental_sync_uses_and_advances_watermark(repository):
+    """Test sync pulls only changes since the watermark and persists the newest"""
+    client = Mock()
+    client.iter_tickets.side_effect = [
+        iter([make_ticket(1, 1), make_ticket(2, 2)]),
+        iter([make_ticket(2, 5)])
+    ]
+    service = TicketSyncService(repository)
+
+    with patch('services.ticket_sync.get_freshservice_client', return_value=client):
+        service.sync_once()
+        service.sync_once()
+
+    assert client.iter_tickets.call_args[1]["updated_since"] == "2024-02-02T00:00:00Z"
+    assert repository.get_state(WATERMARK_KEY) == "2024-02-05T00:00:00Z"
+    page = repository.get_tickets(per_page=10)
+    assert page["total"] == 2
+    assert [t["id"] for t in page["tickets"]] == [2, 1]
+    assert repository.get_ticket("2")["updated_at"] == "2024-02-05T00:00:00Z"
+
+
+def test_full_sync_reconciles_deletions(repository):
+    """Test a full rescan removes tickets that disappeared upstream"""
+    repository.upsert_tickets([make_ticket(1, 1), make_ticket(2, 2), make_ticket(3, 3)])
+    client = Mock()
+    client.iter_tickets.return_value = iter([make_ticket(1, 1), make_ticket(3, 3)])
+
+    with patch('services.ticket_sync.get_freshservice_client', return_value=client):
+        result = TicketSyncService(repository).sync_once(full=True)
+
+    assert result["deleted"] == 1
+    assert repository.get_ticket("2") is None
+    assert repository.get_tickets(group_id=1)["total"] == 2
+
+
+def test_watermark_stays_behind_run_start_so_mid_run_updates_are_refetched(repository):
+    """Test a ticket updated while paging (and skipped by offset paging) is picked up next run"""
+    now = datetime.utcnow()
+    stamp = lambda seconds: (now + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    client = Mock()
+    # Ticket 2 was updated mid-run: it moved past the page boundary and only ticket 3 (updated later) was seen
+    client.iter_tickets.side_effect = [
+        iter([{**make_ticket(1, 1), "updated_at": stamp(-3600)}, {**make_ticket(3, 1), "updated_at": stamp(5)}]),
+        iter([{**make_ticket(2, 1), "updated_at": stamp(1)}, {**make_ticket(3, 1), "updated_at": stamp(5)}])
+    ]
+    service = TicketSyncService(repository)
+
+    with patch('services.ticket_sync.get_freshservice_client', return_value=client), \
+            patch('services.ticket_sync.config.TICKET_SYNC_OVERLAP_SECONDS', 300):
+        first = service.sync_once()
+        service.sync_once()
+
+    assert first["watermark"] <= stamp(-299)
+    assert client.iter_tickets.call_args[1]["updated_since"] == first["watermark"]
+    assert repository.get_ticket("2") is not None
+
+
+def test_concurrent_sync_is_skipped(repository):
+    """Test a sync requested while one is running doesn't start a second one"""
+    started = threading.Event()
+    release = threading.Event()
+    client = Mock()
+
+    def iter_tickets(**kwargs):
+        started.set()
+        release.wait(timeout=5)
+        return iter([make_ticket(1, 1)])
+
+    client.iter_tickets.side_effect = iter_tickets
+    service = TicketSyncService(repository)
+
+    with patch('services.ticket_sync.get_freshservice_client', return_value=client):
+        running = threading.Thread(target=service.sync_once)
+        running.start()
+        started.wait(timeout=5)
+        skipped = service.sync_once(full=True)
+        assert service.is_syncing()
+        release.set()
+        running.join()
+
+    assert skipped == {"mode": "full", "skipped": True}
+    assert client.iter_tickets.call_count == 1
+    assert not service.is_syncing()
@@ -43,31 +43,33 @@ const confidenceColors: Record<string, string> = {
 };
 
 const AIAnalysisPanel: React.FC<AIAnalysisPanelProps> = ({ ticketId, onClose }) => {
-  const [analysis, setAnalysis] = useState<AnalysisData | null>(null);
+  const [analysis, setAnalysis] = useState<Partial<AnalysisData> | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    const fetchAnalysis = async () => {
-      try {
-        setLoading(true);
-        setError(null);
-        const response = await apiClient.analyzeTicket(Number(ticketId));
+    setAnalysis(null);
+    setLoading(true);
+    setError(null);
 
-        if (response.status === 'success' && response.analysis.status === 'success') {
-          setAnalysis(response.analysis.analysis);
-        } else {
-          setError(response.analysis.message || 'Failed to analyze ticket');
-        }
-      } catch (err: any) {
-        console.error('Front Error analyzing ticket:', err);
-        setError(err.message || 'Failed to analyze ticket');
-      } finally {
+    // Render each section as soon as the model has written it
+    const closeStream = apiClient.streamTicketAnalysis(Number(ticketId), {
+      onField: (field, value) => {
+        setAnalysis((current) => ({ ...current, [field]: value }));
         setLoading(false);
-      }
-    };
+      },
+      onComplete: (result) => {
+        setAnalysis(result.analysis);
+        setLoading(false);
+      },
+      onError: (message) => {
+        console.error('Front Error analyzing ticket:', message);
+        setError(message || 'Failed to analyze ticket');
+        setLoading(false);
+      },
+    });
 
-    fetchAnalysis();
+    return closeStream;
   }, [ticketId]);
 
   return (
@@ -97,12 +99,14 @@ const AIAnalysisPanel: React.FC<AIAnalysisPanelProps> = ({ ticketId, onClose })
           ) : analysis ? (
             <>
               {/* Summary */}
-              <GlassCard>
-                <div className={styles.section}>
-                  <h3 className={styles.sectionTitle}>📝 Summary</h3>
-                  <p className={styles.summary}>{analysis.summary}</p>
-                </div>
-              </GlassCard>
+              {analysis.summary && (
+                <GlassCard>
+                  <div className={styles.section}>
+                    <h3 className={styles.sectionTitle}>📝 Summary</h3>
+                    <p className={styles.summary}>{analysis.summary}</p>
+                  </div>
+                </GlassCard>
+              )}
 
               {/* Categories */}
               {analysis.possible_categories && analysis.possible_categories.length > 0 && (
@@ -15,6 +15,12 @@ interface ListTicketsResponse {
   pagination: PaginationData;
 }
 
+export interface AnalysisStreamHandlers {
+  onField: (field: string, value: any) => void;
+  onComplete?: (result: any) => void;
+  onError?: (message: string) => void;
+}
+
 class APIClient {
   private client: AxiosInstance;
 
@@ -89,11 +95,40 @@ class APIClient {
     return response.data;
   }
 
-  async analyzeTicket(ticket_id: number) {
-    const response = await this.client.post(`/tickets/${ticket_id}/analyze`);
+  // force re-runs the model instead of returning a cached analysis
+  async analyzeTicket(ticket_id: number, force: boolean = false) {
+    const response = await this.client.post(`/tickets/${ticket_id}/analyze`, null, {
+      params: force ? { force } : undefined,
+    });
     return response.data;
   }
 
+  // Streams analysis fields as the model writes them; returns a function that closes the stream
+  streamTicketAnalysis(
+    ticket_id: number,
+    handlers: AnalysisStreamHandlers,
+    force: boolean = false
+  ): () => void {
+    const query = force ? '?force=true' : '';
+    const source = new EventSource(`${API_BASE_URL}/analysis/${ticket_id}/analyze/stream${query}`);
+
+    source.addEventListener('field', (event) => {
+      const { field, value } = JSON.parse((event as MessageEvent).data);
+      handlers.onField(field, value);
+    });
+    source.addEventListener('complete', (event) => {
+      source.close();
+      handlers.onComplete?.(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener('error', (event) => {
+      source.close();
+      const data = (event as MessageEvent).data;
+      handlers.onError?.(data ? JSON.parse(data).message : 'Connection to analysis stream lost');
+    });
+
+    return () => source.close();
+  }
+
   async getTicketConversations(ticket_id: number) {
     const response = await this.client.get(`/tickets/${ticket_id}`, {
       params: { include_conversations: true },